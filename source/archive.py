@@ -0,0 +1,209 @@
+"""
+Archive module.
+
+Moves reservations that ended before a cutoff date into monthly
+gzip JSON Lines segments and prunes the matching calendar days, so
+the live files only hold current and future data. Archived
+reservations stay readable through load_archived_reservations.
+
+Segments are written before the live files, so a run interrupted in
+between is simply run again: records already in their segment are
+not appended twice.
+"""
+
+# pylint: disable=duplicate-code
+
+
+import argparse
+import gzip
+import json
+import os
+from datetime import date
+from typing import Dict, List, Optional, Set
+
+from source.hotel import (
+    Hotel,
+    load_hotels_from_file,
+    parse_date,
+    save_hotels_to_file,
+)
+from source.reservation import (
+    Reservation,
+    load_reservations_from_file,
+    save_reservations_to_file,
+)
+
+SEGMENT_PREFIX = "reservations-"
+SEGMENT_SUFFIX = ".jsonl.gz"
+
+
+def segment_path(archive_dir: str, month: str) -> str:
+    """Return the segment file of a YYYY-MM month."""
+    return os.path.join(
+        archive_dir, f"{SEGMENT_PREFIX}{month}{SEGMENT_SUFFIX}"
+    )
+
+
+def archived_months(archive_dir: str) -> List[str]:
+    """Return the YYYY-MM months that have an archive segment."""
+    if not os.path.isdir(archive_dir):
+        return []
+    return sorted(
+        name[len(SEGMENT_PREFIX):-len(SEGMENT_SUFFIX)]
+        for name in os.listdir(archive_dir)
+        if name.startswith(SEGMENT_PREFIX) and name.endswith(SEGMENT_SUFFIX)
+    )
+
+
+def archive_past_stays(
+        hotels: List[Hotel],
+        reservations: List[Reservation],
+        cutoff: str,
+        archive_dir: str
+        ) -> dict:
+    """
+    Archive reservations whose end date is before `cutoff`.
+
+    Archived reservations are appended to the segment of the month
+    they ended in and removed from `reservations`. Each hotel then
+    drops the calendar days before the cutoff, or before its earliest
+    remaining reservation if that starts earlier.
+    """
+    cutoff_day = parse_date(cutoff)
+
+    by_month: Dict[str, List[Reservation]] = {}
+    live: List[Reservation] = []
+    for reservation in reservations:
+        end = date.fromordinal(reservation.end_ordinal)
+        if end < cutoff_day:
+            by_month.setdefault(end.strftime("%Y-%m"), []).append(
+                reservation
+            )
+        else:
+            live.append(reservation)
+
+    segments = _append_segments(by_month, archive_dir)
+
+    # Rewrite the list in place only after every segment is on disk.
+    reservations[:] = live
+
+    return {
+        "archived": sum(len(items) for items in by_month.values()),
+        "pruned_days": _prune_calendars(hotels, live, cutoff_day),
+        "segments": segments,
+    }
+
+
+def _segment_records(path: str) -> Set[str]:
+    """Return the records of a segment as canonical JSON strings."""
+    try:
+        with gzip.open(path, "rt", encoding="utf-8") as file:
+            return {
+                json.dumps(json.loads(line), sort_keys=True)
+                for line in file if line.strip()
+            }
+    except FileNotFoundError:
+        return set()
+
+
+def _append_segments(
+        by_month: Dict[str, List[Reservation]],
+        archive_dir: str
+        ) -> List[str]:
+    """
+    Append reservations to their monthly segments, skipping records
+    a previous, interrupted run already appended; return the paths.
+    """
+    os.makedirs(archive_dir, exist_ok=True)
+    segments = []
+    for month, archived in sorted(by_month.items()):
+        path = segment_path(archive_dir, month)
+        existing = _segment_records(path)
+        records = [
+            reservation.to_dict() for reservation in archived
+            if json.dumps(reservation.to_dict(), sort_keys=True)
+            not in existing
+        ]
+        if records:
+            with gzip.open(path, "at", encoding="utf-8") as file:
+                for record in records:
+                    file.write(json.dumps(record) + "\n")
+        segments.append(path)
+    return segments
+
+
+def _prune_calendars(
+        hotels: List[Hotel],
+        live: List[Reservation],
+        cutoff_day: date
+        ) -> int:
+    """
+    Drop calendar days before the cutoff or before the earliest live
+    reservation of each hotel; return the number of removed days.
+    """
+    earliest: Dict[int, date] = {}
+    for reservation in live:
+        start = date.fromordinal(reservation.start_ordinal)
+        if reservation.hotel_id not in earliest \
+                or start < earliest[reservation.hotel_id]:
+            earliest[reservation.hotel_id] = start
+
+    pruned = 0
+    for hotel in hotels:
+        limit = min(cutoff_day, earliest.get(hotel.hotel_id, cutoff_day))
+        pruned += hotel.prune_calendar_before(limit)
+    return pruned
+
+
+def load_archived_reservations(
+        archive_dir: str,
+        hotel_id: Optional[int] = None,
+        customer_id: Optional[int] = None,
+        months: Optional[tuple] = None
+        ) -> List[Reservation]:
+    """
+    Return archived reservations, optionally filtered by hotel,
+    customer and an inclusive (first, last) range of YYYY-MM months.
+    Only the segments inside the month range are opened.
+    """
+    result = []
+    for month in archived_months(archive_dir):
+        if months is not None and not months[0] <= month <= months[1]:
+            continue
+        with gzip.open(segment_path(archive_dir, month), "rt",
+                       encoding="utf-8") as file:
+            for line in file:
+                reservation = Reservation.from_dict(json.loads(line))
+                if hotel_id is not None \
+                        and reservation.hotel_id != hotel_id:
+                    continue
+                if customer_id is not None \
+                        and reservation.customer_id != customer_id:
+                    continue
+                result.append(reservation)
+    return result
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """Command line entry point: archive stays ended before a cutoff."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "cutoff", help="Archive stays that ended before YYYY-MM-DD."
+    )
+    parser.add_argument("--archive-dir", default="archive")
+    parser.add_argument("--hotels", default="hotels.json")
+    parser.add_argument("--reservations", default="reservations.json")
+    args = parser.parse_args(argv)
+
+    hotels = load_hotels_from_file(args.hotels)
+    reservations = load_reservations_from_file(args.reservations)
+    summary = archive_past_stays(
+        hotels, reservations, args.cutoff, args.archive_dir
+    )
+    save_reservations_to_file(reservations, args.reservations)
+    save_hotels_to_file(hotels, args.hotels)
+    print(json.dumps(summary, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,141 @@
+"""
+Availability cache module.
+
+Bounded LRU cache of peak occupancy per hotel and date range.
+Entries are dropped as soon as a calendar change touches one of
+their days, so cached availability answers are never stale. An
+entry also records the Hotel object it was computed from, so
+another Hotel with the same ID (e.g. after a reload) is never
+served it.
+"""
+
+# pylint: disable=duplicate-code
+
+
+from collections import OrderedDict
+from typing import Dict, Optional, Set, Tuple
+
+from source.dates import ordinal_range
+from source.hotel import (
+    Hotel,
+    add_calendar_listener,
+    remove_calendar_listener,
+)
+
+
+class AvailabilityCache:
+    """LRU cache of peak occupancy keyed by hotel and date range."""
+
+    def __init__(self, max_entries: int = 4096):
+        """Initialize an empty cache and start listening to calendars."""
+        if max_entries <= 0:
+            raise ValueError("Cache size must be at least 1.")
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Tuple[int, str, str], tuple]" = \
+            OrderedDict()
+        self._by_hotel: Dict[int, Set[Tuple[int, str, str]]] = {}
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+        add_calendar_listener(self._on_calendar_change)
+
+    def close(self) -> None:
+        """Stop listening to calendar changes and drop all entries."""
+        remove_calendar_listener(self._on_calendar_change)
+        self.clear()
+
+    def __enter__(self) -> "AvailabilityCache":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def clear(self) -> None:
+        """Drop every cached entry."""
+        self._entries.clear()
+        self._by_hotel.clear()
+
+    def peak_occupancy(
+            self,
+            hotel: Hotel,
+            start_date: str,
+            end_date: str
+            ) -> int:
+        """Return the cached or computed peak occupancy of the range."""
+        key = (hotel.hotel_id, start_date, end_date)
+        entry = self._entries.get(key)
+        if entry is not None and entry[3] is hotel:
+            self.hits += 1
+            self._entries.move_to_end(key)
+            return entry[2]
+
+        self.misses += 1
+        first, last = ordinal_range(start_date, end_date)
+        peak = hotel.peak_occupancy(first, last)
+        self._entries[key] = (first, last, peak, hotel)
+        self._entries.move_to_end(key)
+        self._by_hotel.setdefault(hotel.hotel_id, set()).add(key)
+        if len(self._entries) > self.max_entries:
+            old_key, _ = self._entries.popitem(last=False)
+            self._discard_index(old_key)
+            self.evictions += 1
+        return peak
+
+    def available_rooms_for_dates(
+            self,
+            hotel: Hotel,
+            start_date: str,
+            end_date: str,
+            rooms_requested: int = 1
+            ) -> bool:
+        """
+        Cached equivalent of Hotel.available_rooms_for_dates.
+        """
+        if rooms_requested <= 0:
+            raise ValueError("Rooms requested must be at least 1.")
+        peak = self.peak_occupancy(hotel, start_date, end_date)
+        return peak + rooms_requested <= hotel.total_rooms
+
+    def stats(self) -> dict:
+        """Return the hit, miss, eviction and invalidation counters."""
+        return {
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "invalidations": self.invalidations,
+        }
+
+    def _discard_index(self, key: Tuple[int, str, str]) -> None:
+        """Remove a key from the per-hotel index."""
+        keys = self._by_hotel.get(key[0])
+        if keys is not None:
+            keys.discard(key)
+            if not keys:
+                del self._by_hotel[key[0]]
+
+    def _on_calendar_change(
+            self,
+            hotel: Hotel,
+            first: Optional[int],
+            last: Optional[int],
+            _delta: int
+            ) -> None:
+        """Drop the entries of the hotel that overlap the changed days."""
+        keys = self._by_hotel.get(hotel.hotel_id)
+        if not keys:
+            return
+        stale = [
+            key for key in keys
+            if first is None
+            or (self._entries[key][0] <= last
+                and self._entries[key][1] >= first)
+        ]
+        for key in stale:
+            del self._entries[key]
+            self._discard_index(key)
+        self.invalidations += len(stale)
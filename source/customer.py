@@ -1,15 +1,18 @@
 """
 Customer module.
 
-Provides the Customer class and helper functions
-to persist customers in JSON files.
+Provides the Customer class, a CustomerIndex for email and name
+lookups, and helper functions to persist customers in JSON files.
 """
 
 # pylint: disable=duplicate-code
 
 
-import json
-from typing import List
+from bisect import bisect_left, insort
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from source.metrics import instrument
+from source.storage import read_records, write_records
 
 
 class Customer:
@@ -43,22 +46,189 @@ class Customer:
             email=str(data["email"]),
         )
 
+    @classmethod
+    def from_trusted_dict(cls, data: dict) -> "Customer":
+        """
+        Create a Customer from a dictionary read from a verified
+        snapshot, skipping conversions and constructor validation.
+        """
+        customer = cls.__new__(cls)
+        # Snapshot keys are exactly the instance attributes.
+        customer.__dict__ = data
+        return customer
+
+
+def normalize_email(email: str) -> str:
+    """Return the form of an email address used for uniqueness checks."""
+    return email.strip().lower()
+
+
+class CustomerIndex:
+    """
+    Secondary indexes over a customers list: a unique hash index on
+    the normalized email and a sorted index on the casefolded name for
+    prefix search. Callers keep it in sync through add, update and
+    remove whenever they change the list.
+
+    Data saved before emails were unique may repeat an email. Such
+    customers are still indexed: the email stays with its first owner
+    and the other IDs are listed in `duplicates`. Uniqueness is only
+    enforced when customers are added or their email changes.
+    """
+
+    def __init__(self, customers: Iterable[Customer] = ()):
+        """Build the indexes, recording repeated emails in duplicates."""
+        self._by_id: Dict[int, Customer] = {}
+        self._by_email: Dict[str, int] = {}
+        self._names: List[Tuple[str, int]] = []
+        self.duplicates: Dict[str, List[int]] = {}
+        for customer in customers:
+            if customer.customer_id in self._by_id:
+                raise ValueError("Customer ID already exists.")
+            email = normalize_email(customer.email)
+            if email in self._by_email:
+                self.duplicates.setdefault(email, []).append(
+                    customer.customer_id
+                )
+                self._index(customer, email_owner=False)
+            else:
+                self._index(customer)
+
+    def __len__(self) -> int:
+        return len(self._by_id)
+
+    def check_email(
+            self,
+            email: str,
+            customer_id: Optional[int] = None
+            ) -> None:
+        """
+        Raise ValueError if the email belongs to a customer other than
+        `customer_id`.
+        """
+        owner = self._by_email.get(normalize_email(email))
+        if owner is not None and owner != customer_id:
+            raise ValueError("Customer email already exists.")
+
+    def add(self, customer: Customer) -> None:
+        """Index a new customer."""
+        if customer.customer_id in self._by_id:
+            raise ValueError("Customer ID already exists.")
+        self.check_email(customer.email)
+        self._index(customer)
 
-def save_customers_to_file(customers: List[Customer], file_path: str) -> None:
-    """Save a list of customers to a JSON file."""
-    data = [customer.to_dict() for customer in customers]
-    with open(file_path, "w", encoding="utf-8") as file:
-        json.dump(data, file, indent=2)
+    def remove(self, customer: Customer) -> None:
+        """Drop a customer from the indexes."""
+        if self._by_id.pop(customer.customer_id, None) is None:
+            raise ValueError("Customer not found.")
+        email = normalize_email(customer.email)
+        others = self.duplicates.get(email, [])
+        if customer.customer_id in others:
+            others.remove(customer.customer_id)
+        elif others:
+            # The next customer sharing the email becomes its owner.
+            self._by_email[email] = others.pop(0)
+        else:
+            del self._by_email[email]
+        if not others:
+            self.duplicates.pop(email, None)
+        entry = (customer.name.casefold(), customer.customer_id)
+        del self._names[bisect_left(self._names, entry)]
+
+    def update(
+            self,
+            customer: Customer,
+            name: Optional[str] = None,
+            email: Optional[str] = None
+            ) -> None:
+        """
+        Change a customer's name and/or email and reindex it. Nothing
+        changes if the new values are empty or the email is taken.
+        """
+        new_name = customer.name if name is None else name
+        new_email = customer.email if email is None else email
+        if not new_name:
+            raise ValueError("Customer name cannot be empty.")
+        if not new_email:
+            raise ValueError("Customer email cannot be empty.")
+        if normalize_email(new_email) != normalize_email(customer.email):
+            self.check_email(new_email, customer.customer_id)
+            self.remove(customer)
+            customer.name = new_name
+            customer.email = new_email
+            self.add(customer)
+            return
+
+        # The email keeps its owner (and any legacy duplicates); only
+        # the name index changes.
+        self._names.remove((customer.name.casefold(), customer.customer_id))
+        customer.name = new_name
+        customer.email = new_email
+        insort(self._names, (customer.name.casefold(), customer.customer_id))
+
+    def _index(self, customer: Customer, email_owner: bool = True) -> None:
+        """Add a customer to the ID, name and (as owner) email indexes."""
+        self._by_id[customer.customer_id] = customer
+        if email_owner:
+            self._by_email[normalize_email(customer.email)] = \
+                customer.customer_id
+        insort(self._names, (customer.name.casefold(), customer.customer_id))
+
+    def find_by_email(self, email: str) -> Optional[Customer]:
+        """Return the customer with this email, ignoring case."""
+        customer_id = self._by_email.get(normalize_email(email))
+        return None if customer_id is None else self._by_id[customer_id]
+
+    def search_name(self, prefix: str, limit: int = 10) -> List[Customer]:
+        """Return up to `limit` customers whose name starts with `prefix`."""
+        key = prefix.casefold()
+        result = []
+        position = bisect_left(self._names, (key,))
+        while position < len(self._names) and len(result) < limit:
+            name, customer_id = self._names[position]
+            if not name.startswith(key):
+                break
+            result.append(self._by_id[customer_id])
+            position += 1
+        return result
 
 
-def load_customers_from_file(file_path: str) -> List[Customer]:
+@instrument("customer.save_customers_to_file")
+def save_customers_to_file(
+        customers: List[Customer],
+        file_path: str,
+        compression: Optional[str] = None
+        ) -> None:
     """
-    Load customers from a JSON file.
-    Returns an empty list if the file is missing.
+    Atomically save a list of customers to a checksummed snapshot file,
+    optionally gzip or lzma compressed.
+    """
+    write_records(
+        file_path, "customers",
+        (customer.to_dict() for customer in customers), compression,
+    )
+
+
+@instrument("customer.load_customers_from_file")
+def load_customers_from_file(
+        file_path: str,
+        trusted: bool = False
+        ) -> List[Customer]:
+    """
+    Load customers from a snapshot or JSON file.
+    Returns an empty list if the file is missing and raises
+    CorruptSnapshotError if it cannot be read back intact.
+
+    With trusted=True the file must be a snapshot that matches its
+    checksum, and customers are built without per-field validation.
     """
     try:
-        with open(file_path, "r", encoding="utf-8") as file:
-            data = json.load(file)
+        data, verified = read_records(file_path, "customers")
     except FileNotFoundError:
         return []
+
+    if trusted:
+        if not verified:
+            raise ValueError("Trusted load requires a checksummed snapshot.")
+        return [Customer.from_trusted_dict(item) for item in data]
     return [Customer.from_dict(item) for item in data]
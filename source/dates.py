@@ -0,0 +1,83 @@
+"""
+Dates module.
+
+Shared date layer for hotels and reservations. Dates are kept as
+"YYYY-MM-DD" strings in files and at the menu, and as integer day
+ordinals (date.toordinal) everywhere else. Conversions in both
+directions are memoized, so a date string is parsed once however
+many availability checks and cancellations use it.
+"""
+
+# pylint: disable=duplicate-code
+
+
+from datetime import date, datetime
+from functools import lru_cache
+from typing import Tuple, Union
+
+DATE_FORMAT_ERROR = "Invalid date format. Use YYYY-MM-DD."
+DATE_ORDER_ERROR = "End date must be greater than or equal to start date."
+
+_CACHE_SIZE = 1 << 16
+
+
+@lru_cache(maxsize=_CACHE_SIZE)
+def to_ordinal(value: str) -> int:
+    """Return the day ordinal of a YYYY-MM-DD string."""
+    if not isinstance(value, str):
+        raise ValueError(DATE_FORMAT_ERROR)
+    try:
+        if len(value) == 10 and value[4] == value[7] == "-" \
+                and (value[:4] + value[5:7] + value[8:]).isdigit():
+            return date(
+                int(value[:4]), int(value[5:7]), int(value[8:])
+            ).toordinal()
+        # Unpadded forms such as 2026-1-5 were accepted by earlier
+        # versions and may still be found in data files.
+        return datetime.strptime(value, "%Y-%m-%d").toordinal()
+    except ValueError as exc:
+        raise ValueError(DATE_FORMAT_ERROR) from exc
+
+
+@lru_cache(maxsize=_CACHE_SIZE)
+def to_iso(ordinal: int) -> str:
+    """Return the YYYY-MM-DD string of a day ordinal."""
+    return date.fromordinal(ordinal).isoformat()
+
+
+@lru_cache(maxsize=_CACHE_SIZE)
+def calendar_key_for(ordinal: int) -> str:
+    """Return the YYYY-DOY calendar key of a day ordinal."""
+    year = date.fromordinal(ordinal).year
+    return f"{year}-{ordinal - date(year, 1, 1).toordinal() + 1:03d}"
+
+
+@lru_cache(maxsize=_CACHE_SIZE)
+def key_to_ordinal(key: str) -> int:
+    """Return the day ordinal of a YYYY-DOY calendar key."""
+    year, doy = key.split("-")
+    return date(int(year), 1, 1).toordinal() + int(doy) - 1
+
+
+def as_ordinal(value: Union[str, int, date]) -> int:
+    """Return the day ordinal of a date string, date or ordinal."""
+    if isinstance(value, int) and not isinstance(value, bool):
+        return value
+    if isinstance(value, date):
+        return value.toordinal()
+    return to_ordinal(value)
+
+
+def ordinal_range(
+        start: Union[str, int, date],
+        end: Union[str, int, date]
+        ) -> Tuple[int, int]:
+    """
+    Return the (first, last) ordinals of an inclusive date range,
+    raising ValueError if the end is before the start.
+    """
+    first = as_ordinal(start)
+    last = as_ordinal(end)
+    if first > last:
+        raise ValueError(DATE_ORDER_ERROR)
+    return first, last
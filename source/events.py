@@ -0,0 +1,288 @@
+"""
+Events module.
+
+Change-data-capture stream for downstream consumers. Every mutation
+is published as a typed event with a sequence number to a local sink:
+an in-process queue, an append-only JSON Lines file or a Unix socket.
+Events are sent in batches; a slow sink blocks the publisher
+(back-pressure). A sink that is full or failing never fails the
+mutation that published the event: the batch stays pending for the
+next flush and the error is kept in `last_error`.
+"""
+
+# pylint: disable=duplicate-code
+
+
+import json
+import os
+import queue
+import socket
+import time
+from datetime import date
+from typing import List, Optional
+
+from source.hotel import add_calendar_listener, remove_calendar_listener
+
+EVENT_LOG_ENV = "A62_EVENT_LOG"
+
+EVENT_TYPES = (
+    "hotel.created",
+    "hotel.modified",
+    "hotel.deleted",
+    "customer.created",
+    "customer.modified",
+    "customer.deleted",
+    "calendar.changed",
+    "reservation.created",
+    "reservation.modified",
+    "reservation.cancelled",
+)
+
+
+class Event:  # pylint: disable=too-few-public-methods
+    """A single change published to the event stream."""
+
+    def __init__(
+            self,
+            sequence: int,
+            event_type: str,
+            payload: dict,
+            timestamp: Optional[float] = None
+            ):
+        """Initialize an event."""
+        if event_type not in EVENT_TYPES:
+            raise ValueError(f"Unknown event type: {event_type}.")
+        self.sequence = sequence
+        self.event_type = event_type
+        self.payload = payload
+        self.timestamp = time.time() if timestamp is None else timestamp
+
+    def to_dict(self) -> dict:
+        """Return a JSON-serializable representation of the event."""
+        return {
+            "sequence": self.sequence,
+            "type": self.event_type,
+            "timestamp": self.timestamp,
+            "payload": self.payload,
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "Event":
+        """Create an Event instance from a dictionary."""
+        return cls(
+            sequence=int(data["sequence"]),
+            event_type=str(data["type"]),
+            payload=dict(data["payload"]),
+            timestamp=float(data["timestamp"]),
+        )
+
+
+class QueueSink:
+    """
+    Delivers batches to an in-process queue. With a bounded queue
+    the publisher waits for consumers when the queue is full.
+    """
+
+    def __init__(self, maxsize: int = 0, timeout: Optional[float] = None):
+        """Initialize the sink with an optional queue bound."""
+        self.queue: "queue.Queue[List[Event]]" = queue.Queue(maxsize)
+        self.timeout = timeout
+
+    def write(self, batch: List[Event]) -> None:
+        """Put a batch in the queue, blocking while it is full."""
+        try:
+            self.queue.put(batch, timeout=self.timeout)
+        except queue.Full as exc:
+            raise ValueError("Event queue is full.") from exc
+
+    def last_sequence(self) -> int:
+        """Return the sequence to resume from (always 0 in memory)."""
+        return 0
+
+    def close(self) -> None:
+        """Nothing to release for an in-process queue."""
+
+
+class FileSink:
+    """Appends events to a JSON Lines file, one event per line."""
+
+    def __init__(self, file_path: str, sync: bool = False):
+        """Initialize the sink; sync=True fsyncs every batch."""
+        self.file_path = file_path
+        self.sync = sync
+
+    def write(self, batch: List[Event]) -> None:
+        """Append a batch to the file."""
+        with open(self.file_path, "a", encoding="utf-8") as file:
+            file.write(
+                "".join(json.dumps(event.to_dict()) + "\n" for event in batch)
+            )
+            if self.sync:
+                file.flush()
+                os.fsync(file.fileno())
+
+    def last_sequence(self) -> int:
+        """Return the sequence number of the last event in the file."""
+        events = read_events(self.file_path)
+        return events[-1].sequence if events else 0
+
+    def close(self) -> None:
+        """Nothing to release; the file is opened per batch."""
+
+
+class UnixSocketSink:
+    """Streams events as JSON Lines over a Unix domain socket."""
+
+    def __init__(self, socket_path: str):
+        """Connect to a listening Unix socket."""
+        self.socket_path = socket_path
+        self._socket = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self._socket.connect(socket_path)
+
+    def write(self, batch: List[Event]) -> None:
+        """Send a batch; blocks while the consumer is not reading."""
+        data = "".join(
+            json.dumps(event.to_dict()) + "\n" for event in batch
+        )
+        self._socket.sendall(data.encode("utf-8"))
+
+    def last_sequence(self) -> int:
+        """Return the sequence to resume from (unknown for sockets)."""
+        return 0
+
+    def close(self) -> None:
+        """Close the socket."""
+        self._socket.close()
+
+
+class EventPublisher:
+    """Numbers events and sends them to a sink in batches."""
+
+    def __init__(
+            self,
+            sink,
+            batch_size: int = 100,
+            start_sequence: Optional[int] = None
+            ):
+        """
+        Initialize the publisher. Sequence numbers continue after
+        `start_sequence`, or after the last event already in the sink.
+        """
+        if batch_size <= 0:
+            raise ValueError("Batch size must be at least 1.")
+        self.sink = sink
+        self.batch_size = batch_size
+        self.sequence = (
+            sink.last_sequence() if start_sequence is None
+            else start_sequence
+        )
+        self._pending: List[Event] = []
+        self.last_error: Optional[Exception] = None
+
+    @property
+    def backlog(self) -> int:
+        """Return the number of events not yet delivered to the sink."""
+        return len(self._pending)
+
+    def publish(self, event_type: str, payload: dict) -> Event:
+        """Queue an event and flush when a full batch is pending."""
+        event = Event(self.sequence + 1, event_type, payload)
+        self.sequence = event.sequence
+        self._pending.append(event)
+        if len(self._pending) >= self.batch_size:
+            self.flush()
+        return event
+
+    def flush(self) -> bool:
+        """
+        Send the pending events to the sink. If the sink is full or
+        fails, keep them for the next flush and return False; a batch
+        the sink partly wrote may then be delivered twice, so
+        consumers skip sequence numbers they have already seen.
+        """
+        if not self._pending:
+            return True
+        try:
+            self.sink.write(list(self._pending))
+        except (ValueError, OSError) as exc:
+            self.last_error = exc
+            return False
+        self._pending = []
+        self.last_error = None
+        return True
+
+    def close(self) -> bool:
+        """
+        Flush pending events and close the sink. Returns False if
+        some events could not be delivered.
+        """
+        delivered = self.flush()
+        self.sink.close()
+        return delivered
+
+
+_STATE = {"publisher": None}
+
+
+def _on_calendar_change(hotel, first, last, delta) -> None:
+    """Publish a calendar.changed event for a calendar listener call."""
+    publish("calendar.changed", {
+        "hotel_id": hotel.hotel_id,
+        "start_date": None if first is None
+        else date.fromordinal(first).isoformat(),
+        "end_date": None if last is None
+        else date.fromordinal(last).isoformat(),
+        "delta": delta,
+    })
+
+
+def set_publisher(publisher: Optional[EventPublisher]) -> None:
+    """
+    Install the process-wide publisher, or remove it with None.
+    The previous publisher is flushed and closed.
+    """
+    previous = _STATE["publisher"]
+    if previous is not None:
+        previous.close()
+        remove_calendar_listener(_on_calendar_change)
+    _STATE["publisher"] = publisher
+    if publisher is not None:
+        add_calendar_listener(_on_calendar_change)
+
+
+def publish(event_type: str, payload: dict) -> None:
+    """Publish an event if a publisher is installed."""
+    publisher = _STATE["publisher"]
+    if publisher is not None:
+        publisher.publish(event_type, payload)
+
+
+def flush_events() -> bool:
+    """
+    Flush the installed publisher, if any. Returns False if some
+    events are still waiting for the sink.
+    """
+    publisher = _STATE["publisher"]
+    return publisher is None or publisher.flush()
+
+
+def read_events(file_path: str, after_sequence: int = 0) -> List[Event]:
+    """
+    Read the events of a FileSink log with a sequence greater than
+    `after_sequence`, so consumers can resume where they stopped.
+    """
+    try:
+        with open(file_path, "r", encoding="utf-8") as file:
+            events = [Event.from_dict(json.loads(line))
+                      for line in file if line.strip()]
+    except FileNotFoundError:
+        return []
+    return [event for event in events if event.sequence > after_sequence]
+
+
+def publisher_from_env() -> Optional[EventPublisher]:
+    """Return a FileSink publisher for A62_EVENT_LOG, if it is set."""
+    file_path = os.environ.get(EVENT_LOG_ENV)
+    if not file_path:
+        return None
+    return EventPublisher(FileSink(file_path))
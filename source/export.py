@@ -0,0 +1,329 @@
+"""
+Export module.
+
+Analytics export of reservations and per-hotel daily occupancy as
+CSV files, one column per field, partitioned by month (reservations)
+and by month and hotel (occupancy), and split into chunks of at most
+`chunk_rows` rows. Rows are streamed to disk: at most one chunk per
+month (reservations) or per month of one hotel (occupancy) is held
+in memory. A manifest.json lists every file
+with its partition values and row count, plus the column types, so
+downstream tools can open only the partitions and columns they need
+(read_table does exactly that).
+
+Occupancy rows exist only for days with booked rooms; missing days
+have none booked.
+
+Re-exporting into the same directory is safe to interrupt: the new
+files get the next generation number in their names, the manifest is
+swapped only once they are all written, and the files of the
+previous export are deleted last.
+
+Usage: python -m source.export --out export
+"""
+
+# pylint: disable=duplicate-code
+
+
+import argparse
+import csv
+import json
+import os
+import tempfile
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from source.dates import key_to_ordinal, to_iso
+from source.hotel import Hotel, load_hotels_from_file
+from source.reservation import Reservation, load_reservations_from_file
+
+EXPORT_FORMAT = "a62-export"
+EXPORT_VERSION = 1
+MANIFEST_FILE = "manifest.json"
+
+RESERVATION_COLUMNS = (
+    ("reservation_id", "int"),
+    ("hotel_id", "int"),
+    ("customer_id", "int"),
+    ("start_date", "date"),
+    ("end_date", "date"),
+    ("days", "int"),
+    ("rooms_reserved", "int"),
+    ("room_counts", "str"),
+)
+OCCUPANCY_COLUMNS = (
+    ("date", "date"),
+    ("hotel_id", "int"),
+    ("booked", "int"),
+    ("capacity", "int"),
+)
+
+
+class _PartitionWriter:  # pylint: disable=too-many-instance-attributes
+    """Buffers rows per partition and writes them as CSV chunks."""
+
+    def __init__(  # pylint: disable=too-many-arguments
+            self,
+            export_dir: str,
+            table: str,
+            columns: Tuple[Tuple[str, str], ...],
+            partition_by: Tuple[str, ...],
+            chunk_rows: int,
+            *,
+            generation: int = 1
+            ):
+        """Prepare a writer for one table of an export."""
+        self.export_dir = export_dir
+        self.generation = generation
+        self.table = table
+        self.columns = columns
+        self.partition_by = partition_by
+        self.chunk_rows = chunk_rows
+        self.partitions: List[dict] = []
+        self._buffers: Dict[tuple, List[list]] = {}
+        self._chunks: Dict[tuple, int] = {}
+
+    def add(self, partition: tuple, row: list) -> None:
+        """
+        Queue a row under its partition values (in partition_by
+        order); write the partition's chunk once it is full.
+        """
+        buffer = self._buffers.setdefault(partition, [])
+        buffer.append(row)
+        if len(buffer) >= self.chunk_rows:
+            self._flush(partition)
+
+    def flush(self) -> None:
+        """Write the buffered rows of every partition."""
+        for partition in list(self._buffers):
+            self._flush(partition)
+
+    def close(self) -> dict:
+        """Write the remaining rows and return the table's manifest."""
+        self.flush()
+        self.partitions.sort(key=lambda item: item["path"])
+        return {
+            "columns": [
+                {"name": name, "type": kind} for name, kind in self.columns
+            ],
+            "partition_by": list(self.partition_by),
+            "rows": sum(item["rows"] for item in self.partitions),
+            "partitions": self.partitions,
+        }
+
+    def _flush(self, partition: tuple) -> None:
+        """Write the buffered rows of a partition as its next chunk."""
+        rows = self._buffers.pop(partition, [])
+        if not rows:
+            return
+        chunk = self._chunks.get(partition, 0)
+        self._chunks[partition] = chunk + 1
+        relative = os.path.join(
+            self.table,
+            *(f"{name}={value}"
+              for name, value in zip(self.partition_by, partition)),
+            f"part-{self.generation}-{chunk:05d}.csv",
+        )
+        path = os.path.join(self.export_dir, relative)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "w", encoding="utf-8", newline="") as file:
+            writer = csv.writer(file)
+            writer.writerow(name for name, _ in self.columns)
+            writer.writerows(rows)
+        entry = {"path": relative.replace(os.sep, "/"), "rows": len(rows)}
+        entry.update(zip(self.partition_by, partition))
+        self.partitions.append(entry)
+
+
+def _room_counts_text(reservation: Reservation) -> str:
+    """Return room counts as 'single=2,double=1', or '' if untyped."""
+    if not reservation.room_counts:
+        return ""
+    return ",".join(
+        f"{room_type}={count}"
+        for room_type, count in sorted(reservation.room_counts.items())
+    )
+
+
+def _manifest_paths(manifest: dict) -> set:
+    """Return the relative paths of the files listed by a manifest."""
+    return {
+        partition["path"]
+        for table in manifest.get("tables", {}).values()
+        for partition in table.get("partitions", [])
+    }
+
+
+def _remove_unreferenced(
+        export_dir: str,
+        previous: dict,
+        manifest: dict
+        ) -> None:
+    """Delete the files of the previous manifest the new one dropped."""
+    for relative in _manifest_paths(previous) - _manifest_paths(manifest):
+        path = os.path.join(export_dir, relative)
+        if os.path.exists(path):
+            os.remove(path)
+
+
+def _write_manifest(export_dir: str, manifest: dict) -> None:
+    """Atomically write the manifest, after every data file."""
+    fd, temp_path = tempfile.mkstemp(
+        dir=export_dir, prefix=f".{MANIFEST_FILE}.", suffix=".tmp"
+    )
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as file:
+            json.dump(manifest, file, indent=2)
+        os.replace(temp_path, os.path.join(export_dir, MANIFEST_FILE))
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+
+
+def export_analytics(
+        hotels: Iterable[Hotel],
+        reservations: Iterable[Reservation],
+        export_dir: str,
+        chunk_rows: int = 100000
+        ) -> dict:
+    """
+    Write the reservations and daily occupancy of the hotels under
+    export_dir and return the manifest. Reservations are partitioned
+    by the month they start in; occupancy by month and hotel. Files
+    of an earlier export in the same directory are replaced once the
+    new manifest is in place.
+    """
+    if chunk_rows <= 0:
+        raise ValueError("Chunk rows must be at least 1.")
+    os.makedirs(export_dir, exist_ok=True)
+    try:
+        previous = read_manifest(export_dir)
+    except FileNotFoundError:
+        previous = {}
+    generation = previous.get("generation", 0) + 1
+
+    booked = _PartitionWriter(
+        export_dir, "reservations", RESERVATION_COLUMNS, ("month",),
+        chunk_rows, generation=generation,
+    )
+    for reservation in reservations:
+        booked.add((reservation.start_date[:7],), [
+            reservation.reservation_id,
+            reservation.hotel_id,
+            reservation.customer_id,
+            reservation.start_date,
+            reservation.end_date,
+            reservation.end_ordinal - reservation.start_ordinal + 1,
+            reservation.rooms_reserved,
+            _room_counts_text(reservation),
+        ])
+
+    occupancy = _PartitionWriter(
+        export_dir, "occupancy", OCCUPANCY_COLUMNS, ("month", "hotel_id"),
+        chunk_rows, generation=generation,
+    )
+    for hotel in hotels:
+        days = sorted(
+            (key_to_ordinal(key), count)
+            for key, count in hotel.calendar().items() if count
+        )
+        for day, count in days:
+            iso = to_iso(day)
+            occupancy.add(
+                (iso[:7], hotel.hotel_id),
+                [iso, hotel.hotel_id, count, hotel.total_rooms],
+            )
+        # The partitions of a hotel are complete once its days are out.
+        occupancy.flush()
+
+    manifest = {
+        "format": EXPORT_FORMAT,
+        "version": EXPORT_VERSION,
+        "generation": generation,
+        "tables": {
+            "reservations": booked.close(),
+            "occupancy": occupancy.close(),
+        },
+    }
+    _write_manifest(export_dir, manifest)
+    _remove_unreferenced(export_dir, previous, manifest)
+    return manifest
+
+
+def read_manifest(export_dir: str) -> dict:
+    """Return the manifest of an export directory."""
+    with open(os.path.join(export_dir, MANIFEST_FILE),
+              encoding="utf-8") as file:
+        manifest = json.load(file)
+    if manifest.get("format") != EXPORT_FORMAT \
+            or manifest.get("version") != EXPORT_VERSION:
+        raise ValueError("Not a supported export manifest.")
+    return manifest
+
+
+def read_table(
+        export_dir: str,
+        table: str,
+        columns: Optional[List[str]] = None,
+        months: Optional[tuple] = None,
+        hotel_id: Optional[int] = None
+        ) -> Dict[str, list]:
+    """
+    Return the selected columns of a table as lists keyed by column
+    name. Only the partitions inside the inclusive (first, last)
+    range of YYYY-MM months and, for occupancy, of the given hotel
+    are opened. Integer columns are converted back to int.
+    """
+    manifest = read_manifest(export_dir)
+    if table not in manifest["tables"]:
+        raise ValueError(f"Unknown table: {table}.")
+    spec = manifest["tables"][table]
+    types = {item["name"]: item["type"] for item in spec["columns"]}
+    names = list(columns) if columns is not None else list(types)
+    for name in names:
+        if name not in types:
+            raise ValueError(f"Unknown column: {name}.")
+
+    result: Dict[str, list] = {name: [] for name in names}
+    for partition in spec["partitions"]:
+        if months is not None \
+                and not months[0] <= partition["month"] <= months[1]:
+            continue
+        if hotel_id is not None \
+                and partition.get("hotel_id", hotel_id) != hotel_id:
+            continue
+        with open(os.path.join(export_dir, partition["path"]),
+                  encoding="utf-8", newline="") as file:
+            for row in csv.DictReader(file):
+                for name in names:
+                    value = row[name]
+                    result[name].append(
+                        int(value) if types[name] == "int" else value
+                    )
+    return result
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """Command line entry point: export reservations and occupancy."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--out", default="export")
+    parser.add_argument("--hotels", default="hotels.json")
+    parser.add_argument("--reservations", default="reservations.json")
+    parser.add_argument("--chunk-rows", type=int, default=100000)
+    parser.add_argument("--trusted-load", action="store_true")
+    args = parser.parse_args(argv)
+
+    manifest = export_analytics(
+        load_hotels_from_file(args.hotels, args.trusted_load),
+        load_reservations_from_file(args.reservations, args.trusted_load),
+        args.out,
+        args.chunk_rows,
+    )
+    print(json.dumps({
+        name: {"rows": table["rows"], "files": len(table["partitions"])}
+        for name, table in manifest["tables"].items()
+    }, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,459 @@
+"""
+Fuzz module.
+
+Seeded differential testing of the optimized availability engines
+against the reference dict-based Hotel. Each generated sequence sets
+up one hotel and runs mixed reserve, cancel, query, quote and
+set_rate operations, with malformed and unpadded dates, day
+ordinals, reversed ranges, bad room counts and over-cancellations
+mixed in. Every engine runs the same sequence; an operation outcome
+is its return value, or the fact that it raised ValueError, and the
+booked rooms per day are compared once the sequence ends.
+
+When an engine disagrees with the reference, its sequence is shrunk
+to a minimal reproducer by removing operations while the mismatch
+persists. The report also holds the time each engine spent on the
+operations and its speedup over the reference.
+
+Engines:
+    cache      Hotel answering queries through AvailabilityCache
+    inventory  single room type RoomInventory matrix
+    shared     Hotel mirrored into a shared-memory OccupancyReader
+    rates      Hotel quoting with RateCalendar prefix sums (the
+               reference prices every day from its own rate dict)
+
+Usage: python -m source.fuzz --seed 0 --operations 100000
+"""
+
+# pylint: disable=duplicate-code
+
+
+import argparse
+import json
+import random
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+
+from source.availability_cache import AvailabilityCache
+from source.dates import ordinal_range, to_iso, to_ordinal
+from source.hotel import Hotel
+from source.inventory import RoomInventory
+from source.rates import RateCalendar
+from source.shared_occupancy import OccupancyReader, OccupancyWriter
+
+FIRST_DAY = "2026-01-01"
+WINDOW_DAYS = 90
+MAX_STAY = 10
+OPERATIONS = ("reserve", "cancel", "query", "quote", "set_rate")
+
+_INVALID_DATES = (
+    "2026-02-30", "2026-13-01", "2026/01/05", "20260105", "", "day", None,
+)
+
+Outcome = Tuple[str, object]
+UNSUPPORTED: Outcome = ("unsupported", None)
+
+
+class ReferenceEngine:
+    """
+    The reference implementation: a plain Hotel whose calendar is
+    the day dict. Stay prices are summed day by day from a plain
+    {day: rate} dict, without RateCalendar.
+    """
+
+    def __init__(self, setup: dict):
+        """Create the hotel described by a sequence setup."""
+        self.hotel = Hotel(1, "Fuzz", "Fuzz", setup["capacity"])
+        self.default_rate = setup["default_rate"]
+        self.tiers = sorted(tuple(tier) for tier in setup["tiers"])
+        self.day_rates: Dict[int, int] = {}
+
+    def close(self) -> None:
+        """Release the resources of the engine."""
+
+    def available(self, start, end, rooms) -> bool:
+        """Return True if the rooms are free on every day."""
+        return self.hotel.available_rooms_for_dates(start, end, rooms)
+
+    def reserve(self, start, end, rooms) -> bool:
+        """Book the rooms if they are free; return whether it did."""
+        if not self.available(start, end, rooms):
+            return False
+        self.hotel.apply_calendar_change(start, end, rooms, 1)
+        return True
+
+    def cancel(self, start, end, rooms) -> bool:
+        """Release booked rooms."""
+        self.hotel.apply_calendar_change(start, end, rooms, -1)
+        return True
+
+    def query(self, start, end, rooms) -> bool:
+        """Answer an availability query."""
+        return self.available(start, end, rooms)
+
+    def quote(self, start, end, rooms) -> int:
+        """Return the price of a stay."""
+        if rooms <= 0:
+            raise ValueError("Rooms requested must be at least 1.")
+        first, last = ordinal_range(start, end)
+        total = 0
+        for day in range(first, last + 1):
+            share = self.hotel.booked_on(day) / self.hotel.total_rooms
+            percents = [percent for threshold, percent in self.tiers
+                        if share >= threshold]
+            rate = self.day_rates.get(day, self.default_rate)
+            total += (rate * (percents[-1] if percents else 100) + 50) // 100
+        return rooms * total
+
+    def set_rate(self, start, end, rate) -> bool:
+        """Set the rate of a date range; None restores the default."""
+        if rate is not None and rate < 0:
+            raise ValueError("Rate cannot be negative.")
+        first, last = ordinal_range(start, end)
+        for day in range(first, last + 1):
+            if rate is None:
+                self.day_rates.pop(day, None)
+            else:
+                self.day_rates[day] = rate
+        return True
+
+    def booked(self, first: int, last: int) -> List[int]:
+        """Return the booked rooms for each day first..last."""
+        return [self.hotel.booked_on(day) for day in range(first, last + 1)]
+
+
+class CacheEngine(ReferenceEngine):
+    """Availability answered by an AvailabilityCache."""
+
+    def __init__(self, setup: dict):
+        """Create the hotel and the cache."""
+        super().__init__(setup)
+        self.cache = AvailabilityCache(max_entries=64)
+
+    def close(self) -> None:
+        """Stop the cache listening to calendars."""
+        self.cache.close()
+
+    def available(self, start, end, rooms) -> bool:
+        """Return True if the rooms are free on every day."""
+        return self.cache.available_rooms_for_dates(
+            self.hotel, start, end, rooms
+        )
+
+
+class SharedEngine(ReferenceEngine):
+    """Availability answered by a shared-memory occupancy reader."""
+
+    def __init__(self, setup: dict):
+        """Create the hotel, its shared block and a reader."""
+        super().__init__(setup)
+        self.writer = OccupancyWriter([self.hotel], FIRST_DAY, WINDOW_DAYS)
+        self.reader = OccupancyReader(self.writer.name)
+
+    def close(self) -> None:
+        """Detach the reader and remove the block."""
+        self.reader.close()
+        self.writer.close()
+
+    def available(self, start, end, rooms) -> bool:
+        """Return True if the rooms are free on every day."""
+        return self.reader.available(self.hotel.hotel_id, start, end, rooms)
+
+
+class RateEngine(ReferenceEngine):
+    """Stay prices from the rate calendar's prefix sums."""
+
+    def __init__(self, setup: dict):
+        """Create the hotel and its rate calendar."""
+        super().__init__(setup)
+        self.hotel.set_rates(RateCalendar(self.default_rate, self.tiers))
+
+    def quote(self, start, end, rooms) -> int:
+        """Return the price of a stay."""
+        return self.hotel.quote(start, end, rooms)
+
+    def set_rate(self, start, end, rate) -> bool:
+        """Set the rate of a date range."""
+        self.hotel.rates.set_rate(start, end, rate)
+        return True
+
+
+class InventoryEngine:
+    """Occupancy kept in a RoomInventory with a single room type."""
+
+    def __init__(self, setup: dict):
+        """Create an inventory with the capacity of the setup."""
+        self.inventory = RoomInventory({"room": setup["capacity"]})
+
+    def close(self) -> None:
+        """Release the resources of the engine."""
+
+    def reserve(self, start, end, rooms) -> bool:
+        """Book the rooms if they are free; return whether it did."""
+        if not self.query(start, end, rooms):
+            return False
+        first, last = ordinal_range(start, end)
+        self.inventory.apply([(first, last, "room", rooms)])
+        return True
+
+    def cancel(self, start, end, rooms) -> bool:
+        """Release booked rooms."""
+        if rooms <= 0:
+            raise ValueError("Rooms must be at least 1.")
+        first, last = ordinal_range(start, end)
+        self.inventory.apply([(first, last, "room", -rooms)])
+        return True
+
+    def query(self, start, end, rooms) -> bool:
+        """Answer an availability query."""
+        first, last = ordinal_range(start, end)
+        return self.inventory.available(first, last, {"room": rooms})
+
+    def booked(self, first: int, last: int) -> List[int]:
+        """Return the booked rooms for each day first..last."""
+        return self.inventory.booked("room", first, last)
+
+
+ENGINES: Dict[str, Callable[[dict], object]] = {
+    "cache": CacheEngine,
+    "inventory": InventoryEngine,
+    "shared": SharedEngine,
+    "rates": RateEngine,
+}
+
+
+def _random_date(rng: random.Random, day: int):
+    """Return a day as an ISO, unpadded or ordinal date, or garbage."""
+    roll = rng.random()
+    if roll < 0.03:
+        return rng.choice(_INVALID_DATES)
+    if roll < 0.13:
+        return day
+    if roll < 0.2:
+        iso = to_iso(day)
+        return f"{int(iso[:4])}-{int(iso[5:7])}-{int(iso[8:])}"
+    return to_iso(day)
+
+
+def generate_sequence(rng: random.Random, length: int) -> dict:
+    """Return a random hotel setup and a list of operations."""
+    capacity = rng.randint(1, 6)
+    setup = {
+        "capacity": capacity,
+        "default_rate": rng.randrange(5000, 20001, 500),
+        "tiers": sorted(
+            [round(rng.uniform(0.3, 1.0), 2), rng.randrange(80, 200, 5)]
+            for _ in range(rng.randint(0, 2))
+        ),
+    }
+    first_day = to_ordinal(FIRST_DAY)
+    booked: List[list] = []
+    operations = []
+    for _ in range(length):
+        name = rng.choices(OPERATIONS, (35, 20, 30, 10, 5))[0]
+        if name == "cancel" and booked and rng.random() < 0.7:
+            operations.append(["cancel"] + rng.choice(booked))
+            continue
+
+        start = first_day + rng.randrange(WINDOW_DAYS - MAX_STAY)
+        end = start + rng.randrange(MAX_STAY)
+        if rng.random() < 0.05:
+            start, end = end + 1, start
+        if name == "set_rate":
+            value = rng.choice(
+                [rng.randrange(5000, 30001, 500), None, -100]
+            )
+        elif rng.random() < 0.05:
+            value = rng.choice([0, -1, capacity + 1])
+        else:
+            value = rng.randint(1, capacity)
+        operation = [name, _random_date(rng, start), _random_date(rng, end),
+                     value]
+        if name == "reserve":
+            booked.append(operation[1:])
+        operations.append(operation)
+    return {"setup": setup, "operations": operations}
+
+
+def _outcome(method: Callable, operation: list) -> Outcome:
+    """Run one operation and describe its result."""
+    try:
+        return ("ok", method(*operation[1:]))
+    except ValueError as exc:
+        return ("error", str(exc))
+    except Exception as exc:  # pylint: disable=broad-exception-caught
+        return ("crash", f"{type(exc).__name__}: {exc}")
+
+
+def run_sequence(
+        factory: Callable[[dict], object],
+        sequence: dict
+        ) -> Tuple[List[Outcome], float]:
+    """
+    Run a sequence on a new engine. Returns one outcome per operation,
+    plus the final booked rooms per day, and the seconds spent.
+    """
+    engine = factory(sequence["setup"])
+    try:
+        outcomes = []
+        started = time.perf_counter()
+        for operation in sequence["operations"]:
+            method = getattr(engine, operation[0], None)
+            outcomes.append(
+                UNSUPPORTED if method is None else _outcome(method, operation)
+            )
+        elapsed = time.perf_counter() - started
+        first = to_ordinal(FIRST_DAY)
+        outcomes.append(_outcome(
+            lambda: engine.booked(first, first + WINDOW_DAYS - 1), ["booked"]
+        ))
+    finally:
+        engine.close()
+    return outcomes, elapsed
+
+
+def _same(expected: Outcome, actual: Outcome) -> bool:
+    """Return True if two outcomes agree; error messages may differ."""
+    if actual == UNSUPPORTED:
+        return True
+    if expected[0] != actual[0]:
+        return False
+    return expected[0] == "error" or expected == actual
+
+
+def first_mismatch(
+        factory: Callable[[dict], object],
+        sequence: dict
+        ) -> Optional[dict]:
+    """
+    Return the first disagreement of an engine with the reference, as
+    its operation index (len(operations) for the final occupancy) and
+    both outcomes, or None if they agree.
+    """
+    expected, _ = run_sequence(ReferenceEngine, sequence)
+    actual, _ = run_sequence(factory, sequence)
+    for index, (want, got) in enumerate(zip(expected, actual)):
+        if not _same(want, got):
+            return {"index": index, "expected": want, "actual": got}
+    return None
+
+
+def shrink(
+        factory: Callable[[dict], object],
+        sequence: dict
+        ) -> dict:
+    """
+    Return a smaller sequence that still makes the engine disagree
+    with the reference: drop the operations after the first mismatch,
+    then remove ever smaller chunks of operations while it persists.
+    """
+    mismatch = first_mismatch(factory, sequence)
+    if mismatch is None:
+        raise ValueError("Sequence does not fail.")
+    operations = sequence["operations"][:mismatch["index"] + 1]
+
+    def fails(candidate: List[list]) -> bool:
+        return first_mismatch(
+            factory, {"setup": sequence["setup"], "operations": candidate}
+        ) is not None
+
+    chunk = max(len(operations) // 2, 1)
+    while True:
+        start = 0
+        while start < len(operations):
+            candidate = operations[:start] + operations[start + chunk:]
+            if fails(candidate):
+                operations = candidate
+            else:
+                start += chunk
+        if chunk == 1:
+            break
+        chunk //= 2
+    return {"setup": sequence["setup"], "operations": operations}
+
+
+def _check(
+        factory: Callable[[dict], object],
+        sequence: dict,
+        expected: List[Outcome],
+        result: dict
+        ) -> None:
+    """Run a sequence on an engine and record its time and failures."""
+    actual, elapsed = run_sequence(factory, sequence)
+    result["elapsed_s"] += elapsed
+    if all(map(_same, expected, actual)):
+        return
+    result["failures"] += 1
+    if result["reproducer"] is None:
+        reproducer = shrink(factory, sequence)
+        reproducer["mismatch"] = first_mismatch(factory, reproducer)
+        result["reproducer"] = reproducer
+
+
+def run_fuzz(
+        seed: int,
+        operations: int,
+        length: int = 200,
+        engines: Optional[Dict[str, Callable[[dict], object]]] = None
+        ) -> dict:
+    """
+    Run about `operations` operations, in sequences of `length`, on
+    the reference and every engine. Returns per engine the time spent,
+    the speedup over the reference, the number of failing sequences
+    and a shrunk reproducer of the first one.
+    """
+    if operations <= 0 or length <= 0:
+        raise ValueError("Operations and length must be at least 1.")
+    engines = ENGINES if engines is None else engines
+    rng = random.Random(seed)
+    reference_time = 0.0
+    results = {
+        name: {"elapsed_s": 0.0, "failures": 0, "reproducer": None}
+        for name in engines
+    }
+
+    sequences = -(-operations // length)
+    for _ in range(sequences):
+        sequence = generate_sequence(rng, length)
+        expected, elapsed = run_sequence(ReferenceEngine, sequence)
+        reference_time += elapsed
+        for name, factory in engines.items():
+            _check(factory, sequence, expected, results[name])
+
+    for result in results.values():
+        result["speedup"] = (
+            reference_time / result["elapsed_s"] if result["elapsed_s"]
+            else 0.0
+        )
+    return {
+        "seed": seed,
+        "sequences": sequences,
+        "operations": sequences * length,
+        "reference_elapsed_s": reference_time,
+        "engines": results,
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """Command line entry point: fuzz the engines against the reference."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--operations", type=int, default=100000)
+    parser.add_argument("--length", type=int, default=200)
+    parser.add_argument(
+        "--engines", nargs="+", choices=sorted(ENGINES),
+        default=sorted(ENGINES),
+    )
+    args = parser.parse_args(argv)
+
+    report = run_fuzz(
+        args.seed, args.operations, args.length,
+        {name: ENGINES[name] for name in args.engines},
+    )
+    print(json.dumps(report, indent=2))
+    if any(result["failures"] for result in report["engines"].values()):
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -7,11 +7,89 @@ for the Reservation System A6.2 project.
 
 # pylint: disable=duplicate-code
 
-import json
-from datetime import date, datetime, timedelta
-from typing import Dict, List
+from datetime import date
+from types import MappingProxyType
+from typing import Callable, Dict, List, Mapping, Optional, Union
+
+from source.dates import (
+    as_ordinal,
+    calendar_key_for,
+    key_to_ordinal,
+    ordinal_range,
+    to_ordinal,
+)
+from source.inventory import RoomInventory, validate_room_counts
+from source.metrics import instrument
+from source.profiling import profiled
+from source.rates import RateCalendar
+from source.storage import read_records, write_records
+
+
+_CALENDAR_LISTENERS: List[Callable] = []
+_BATCH_LISTENERS: List[Callable] = []
+_INFO_LISTENERS: List[Callable] = []
+
+
+def add_calendar_listener(listener: Callable) -> None:
+    """
+    Register a callable notified after every calendar change as
+    listener(hotel, first_ordinal, last_ordinal, delta). When the
+    whole calendar is replaced, both ordinals are None and delta is 0.
+    """
+    _CALENDAR_LISTENERS.append(listener)
+
+
+def remove_calendar_listener(listener: Callable) -> None:
+    """Unregister a calendar listener."""
+    if listener in _CALENDAR_LISTENERS:
+        _CALENDAR_LISTENERS.remove(listener)
+
+
+def add_calendar_batch_listener(listener: Callable) -> None:
+    """
+    Register a callable notified once per calendar change as
+    listener(hotel, segments), with every (first_ordinal,
+    last_ordinal, delta) segment the change applied, so a
+    multi-segment change can be mirrored as a unit. When the whole
+    calendar is replaced, segments is [(None, None, 0)].
+    """
+    _BATCH_LISTENERS.append(listener)
+
 
+def remove_calendar_batch_listener(listener: Callable) -> None:
+    """Unregister a calendar batch listener."""
+    if listener in _BATCH_LISTENERS:
+        _BATCH_LISTENERS.remove(listener)
 
+
+def add_info_listener(listener: Callable) -> None:
+    """
+    Register a callable notified as listener(hotel) after the name or
+    location of a hotel is changed by modify_information.
+    """
+    _INFO_LISTENERS.append(listener)
+
+
+def remove_info_listener(listener: Callable) -> None:
+    """Unregister a hotel information listener."""
+    if listener in _INFO_LISTENERS:
+        _INFO_LISTENERS.remove(listener)
+
+
+DateLike = Union[str, int, date]
+
+
+def parse_date(value: str) -> date:
+    """Parse a date string in YYYY-MM-DD format."""
+    return date.fromordinal(to_ordinal(value))
+
+
+def calendar_key(day: date) -> str:
+    """Return YYYY-DOY key for a given date."""
+    return calendar_key_for(day.toordinal())
+
+
+# pylint: disable-next=too-many-instance-attributes,too-many-public-methods
 class Hotel:
     """Represents a hotel entity."""
 
@@ -20,15 +98,27 @@ class Hotel:
             hotel_id: int,
             name: str,
             location: str,
-            total_rooms: int
+            total_rooms: int,
+            room_types: Optional[Dict[str, int]] = None
             ):
-        """Initialize a hotel."""
+        """
+        Initialize a hotel. `room_types` optionally splits the rooms
+        into types with their own capacities, which must add up to
+        total_rooms.
+        """
         if not name:
             raise ValueError("Hotel name cannot be empty.")
         if not location:
             raise ValueError("Hotel location cannot be empty.")
         if total_rooms <= 0:
             raise ValueError("No rooms available.")
+        inventory = None
+        if room_types is not None:
+            inventory = RoomInventory(room_types)
+            if sum(room_types.values()) != total_rooms:
+                raise ValueError(
+                    "Room type capacities must add up to total rooms."
+                    )
 
         self.hotel_id = hotel_id
         self.name = name
@@ -36,42 +126,81 @@ class Hotel:
         self.total_rooms = total_rooms
         self.available_rooms = total_rooms
         self._calendar: Dict[str, int] = {}
-
+        self._calendar_shared = False
+        self.calendar_version = 0
+        self.inventory: Optional[RoomInventory] = inventory
+        self.rates: Optional[RateCalendar] = None
+
+    @property
+    def room_types(self) -> Dict[str, int]:
+        """Return the capacity of each room type (empty if untyped)."""
+        if self.inventory is None:
+            return {}
+        return dict(self.inventory.capacities)
+
+    def booked_on(self, day: int) -> int:
+        """Return the booked rooms on a day ordinal."""
+        return self._calendar.get(calendar_key_for(day), 0)
+
+    def set_rates(self, rates: Optional[RateCalendar]) -> None:
+        """Attach a rate calendar priced by this hotel's occupancy."""
+        self.rates = rates
+        if rates is not None:
+            rates.bind(self.booked_on, self.total_rooms)
+            self._reprice_calendar()
+
+    @instrument("hotel.quote")
+    def quote(
+        self,
+        start_date: DateLike,
+        end_date: DateLike,
+        rooms: int = 1,
+    ) -> int:
+        """Return the price of a stay from the hotel's rate calendar."""
+        if self.rates is None:
+            raise ValueError("Hotel has no rates.")
+        return self.rates.quote(start_date, end_date, rooms)
+
+    @instrument("hotel.available_rooms_for_dates")
     def available_rooms_for_dates(
         self,
-        start_date: str,
-        end_date: str,
+        start_date: DateLike,
+        end_date: DateLike,
         rooms_requested: int = 1,
     ) -> bool:
         """
         Return True if there is availability
         for all days in the inclusive date range.
+        Dates may be YYYY-MM-DD strings or day ordinals.
         """
         if rooms_requested <= 0:
             raise ValueError("Rooms requested must be at least 1.")
 
-        start = self._parse_date(start_date)
-        end = self._parse_date(end_date)
-
-        if start > end:
-            raise ValueError(
-                "End date must be greater than or equal to start date."
-                )
-
-        current = start
-        while current <= end:
-            key = self._calendar_key(current)
-            booked = self._calendar.get(key, 0)
-            if booked + rooms_requested > self.total_rooms:
+        first, last = ordinal_range(start_date, end_date)
+        limit = self.total_rooms - rooms_requested
+        calendar = self._calendar
+        for day in range(first, last + 1):
+            if calendar.get(calendar_key_for(day), 0) > limit:
                 return False
-            current += timedelta(days=1)
 
         return True
 
+    @instrument("hotel.peak_occupancy")
+    def peak_occupancy(self, start_date: DateLike, end_date: DateLike) -> int:
+        """Return the highest number of booked rooms in the date range."""
+        first, last = ordinal_range(start_date, end_date)
+        calendar = self._calendar
+        return max(
+            calendar.get(calendar_key_for(day), 0)
+            for day in range(first, last + 1)
+        )
+
+    @profiled("hotel.apply_calendar_change")
+    @instrument("hotel.apply_calendar_change")
     def apply_calendar_change(
         self,
-        start_date: str,
-        end_date: str,
+        start_date: DateLike,
+        end_date: DateLike,
         rooms: int,
         sign: int,
     ) -> None:
@@ -84,31 +213,185 @@ class Hotel:
         if sign not in (1, -1):
             raise ValueError("Sign must be 1 (reserve) or -1 (cancel).")
 
-        start = self._parse_date(start_date)
-        end = self._parse_date(end_date)
+        first, last = ordinal_range(start_date, end_date)
+        self._apply_segments([(first, last, rooms * sign)])
 
-        if start > end:
-            raise ValueError(
-                "End date must be greater than or equal to start date."
-                )
+    @instrument("hotel.available_room_mix")
+    def available_room_mix(
+        self,
+        start_date: DateLike,
+        end_date: DateLike,
+        room_counts: Dict[str, int],
+    ) -> bool:
+        """
+        Return True if every room type in room_counts has the
+        requested number of rooms free on every day of the range.
+        """
+        first, last = ordinal_range(start_date, end_date)
+        return self._require_inventory().available(first, last, room_counts)
 
-        current = start
-        while current <= end:
-            key = self._calendar_key(current)
-            booked = self._calendar.get(key, 0)
-            new_value = booked + (rooms * sign)
+    @profiled("hotel.apply_room_mix_change")
+    @instrument("hotel.apply_room_mix_change")
+    def apply_room_mix_change(
+        self,
+        start_date: DateLike,
+        end_date: DateLike,
+        room_counts: Dict[str, int],
+        sign: int,
+    ) -> None:
+        """
+        Apply a reservation (+1) or cancellation (-1) of rooms per
+        type to the room-type matrix and the hotel calendar.
+        """
+        if sign not in (1, -1):
+            raise ValueError("Sign must be 1 (reserve) or -1 (cancel).")
+        validate_room_counts(room_counts)
+        first, last = ordinal_range(start_date, end_date)
+
+        plan = self._require_inventory().prepare([
+            (first, last, room_type, count * sign)
+            for room_type, count in room_counts.items()
+        ])
+        self._apply_segments(
+            [(first, last, sum(room_counts.values()) * sign)], plan=plan
+        )
 
-            if new_value < 0:
-                raise ValueError(
-                    "Cancellation exceeds booked rooms for selected dates."
-                    )
+    @profiled("hotel.change_room_mix")
+    @instrument("hotel.change_room_mix")
+    def change_room_mix(  # pylint: disable=too-many-arguments
+        self,
+        old_range: tuple,
+        old_counts: Dict[str, int],
+        new_range: tuple,
+        new_counts: Dict[str, int],
+        *,
+        check_capacity: bool = True,
+    ) -> None:
+        """
+        Move a typed booking from (old_range, old_counts) to
+        (new_range, new_counts). Capacity is checked per room type on
+        the days that gain rooms; nothing changes if any day fails.
+        """
+        validate_room_counts(old_counts)
+        validate_room_counts(new_counts)
+        old_first, old_last = ordinal_range(*old_range)
+        new_first, new_last = ordinal_range(*new_range)
+
+        changes = [
+            (old_first, old_last, room_type, -count)
+            for room_type, count in old_counts.items()
+        ] + [
+            (new_first, new_last, room_type, count)
+            for room_type, count in new_counts.items()
+        ]
+        plan = self._require_inventory().prepare(changes, check_capacity)
+        segments = self._delta_segments(
+            (old_first, old_last), sum(old_counts.values()),
+            (new_first, new_last), sum(new_counts.values()),
+        )
+        self._apply_segments(segments, plan=plan)
+
+    @profiled("hotel.change_calendar_range")
+    @instrument("hotel.change_calendar_range")
+    def change_calendar_range(  # pylint: disable=too-many-arguments
+        self,
+        old_range: tuple,
+        old_rooms: int,
+        new_range: tuple,
+        new_rooms: int,
+        *,
+        check_capacity: bool = True,
+    ) -> None:
+        """
+        Move a booking from (old_range, old_rooms) to
+        (new_range, new_rooms), where each range is a
+        (start_date, end_date) pair of strings or day ordinals.
+
+        Only the days whose booked count changes are visited.
+        Capacity is checked on the days that gain rooms, and the
+        calendar is left untouched if any day fails.
+        """
+        if old_rooms <= 0 or new_rooms <= 0:
+            raise ValueError("Rooms must be at least 1.")
 
+        segments = self._delta_segments(
+            ordinal_range(*old_range), old_rooms,
+            ordinal_range(*new_range), new_rooms,
+        )
+        self._apply_segments(segments, check_capacity=check_capacity)
+
+    @staticmethod
+    def _delta_segments(
+        old_range: tuple,
+        old_rooms: int,
+        new_range: tuple,
+        new_rooms: int,
+    ) -> list:
+        """
+        Return the (first_day, last_day, delta) ordinal segments that
+        turn old_rooms over old_range into new_rooms over new_range.
+        """
+        bounds = sorted({
+            old_range[0], old_range[1] + 1,
+            new_range[0], new_range[1] + 1,
+        })
+        segments = []
+        for first, after in zip(bounds, bounds[1:]):
+            last = after - 1
+            delta = 0
+            if old_range[0] <= first and last <= old_range[1]:
+                delta -= old_rooms
+            if new_range[0] <= first and last <= new_range[1]:
+                delta += new_rooms
+            if delta:
+                segments.append((first, last, delta))
+        return segments
+
+    def _apply_segments(
+        self,
+        segments: list,
+        check_capacity: bool = False,
+        plan: Optional[dict] = None,
+    ) -> None:
+        """
+        Add each (first_day, last_day, delta) ordinal segment to the
+        calendar. All days are validated before any of them is written.
+        A room-type plan from RoomInventory.prepare is committed with
+        the calendar, before listeners are notified.
+        """
+        updates = {}
+        for first, last, delta in segments:
+            for day in range(first, last + 1):
+                key = calendar_key_for(day)
+                new_value = self._calendar.get(key, 0) + delta
+                if new_value < 0:
+                    raise ValueError(
+                        "Cancellation exceeds booked rooms for selected dates."
+                        )
+                if check_capacity and delta > 0 \
+                        and new_value > self.total_rooms:
+                    raise ValueError(
+                        "No rooms available for the selected dates."
+                        )
+                updates[key] = new_value
+
+        self._own_calendar()
+        for key, new_value in updates.items():
             if new_value == 0:
                 self._calendar.pop(key, None)
             else:
                 self._calendar[key] = new_value
-
-            current += timedelta(days=1)
+        if plan is not None:
+            self.inventory.commit(plan)
+        if self.rates is not None:
+            for first, last, _ in segments:
+                self.rates.occupancy_changed(first, last)
+
+        for listener in _CALENDAR_LISTENERS:
+            for first, last, delta in segments:
+                listener(self, first, last, delta)
+        for listener in _BATCH_LISTENERS:
+            listener(self, segments)
 
     def display_information(self) -> dict:
         """Return hotel information as a dictionary."""
@@ -118,6 +401,7 @@ class Hotel:
             "location": self.location,
             "total_rooms": self.total_rooms,
             "available_rooms": self.available_rooms,
+            **({"room_types": self.room_types} if self.inventory else {}),
         }
 
     def modify_information(
@@ -126,14 +410,17 @@ class Hotel:
             location: str = None
             ) -> None:
         """Modify hotel basic information."""
+        if name is not None and not name:
+            raise ValueError("Hotel name cannot be empty.")
+        if location is not None and not location:
+            raise ValueError("Hotel location cannot be empty.")
+
         if name is not None:
-            if not name:
-                raise ValueError("Hotel name cannot be empty.")
             self.name = name
         if location is not None:
-            if not location:
-                raise ValueError("Hotel location cannot be empty.")
             self.location = location
+        for listener in _INFO_LISTENERS:
+            listener(self)
 
     def reserve_room(self) -> None:
         """Reserve one room (simple counter)."""
@@ -156,6 +443,9 @@ class Hotel:
             "total_rooms": self.total_rooms,
             "available_rooms": self.available_rooms,
             "calendar": self._calendar,
+            **({"room_inventory": self.inventory.to_dict()}
+               if self.inventory else {}),
+            **({"rates": self.rates.to_dict()} if self.rates else {}),
         }
 
     @classmethod
@@ -171,41 +461,154 @@ class Hotel:
             data.get("available_rooms", hotel.total_rooms)
             )
         hotel._calendar = dict(data.get("calendar", {}))
+        if "room_inventory" in data:
+            hotel.inventory = RoomInventory.from_dict(data["room_inventory"])
+            if sum(hotel.inventory.capacities.values()) != hotel.total_rooms:
+                raise ValueError(
+                    "Room type capacities must add up to total rooms."
+                    )
+        if "rates" in data:
+            hotel.set_rates(RateCalendar.from_dict(data["rates"]))
         return hotel
 
+    @classmethod
+    def from_trusted_dict(cls, data: dict) -> "Hotel":
+        """
+        Create a Hotel from a dictionary read from a verified snapshot,
+        skipping conversions and constructor validation.
+        """
+        hotel = cls.__new__(cls)
+        hotel.hotel_id = data["hotel_id"]
+        hotel.name = data["name"]
+        hotel.location = data["location"]
+        hotel.total_rooms = data["total_rooms"]
+        hotel.available_rooms = data["available_rooms"]
+        hotel._calendar = data["calendar"]
+        hotel._calendar_shared = False
+        hotel.calendar_version = 0
+        hotel.inventory = (
+            RoomInventory.from_dict(data["room_inventory"])
+            if "room_inventory" in data else None
+        )
+        hotel.rates = None
+        if "rates" in data:
+            hotel.set_rates(RateCalendar.from_dict(data["rates"]))
+        return hotel
+
+    def calendar(self) -> Dict[str, int]:
+        """Return a copy of the booked rooms per YYYY-DOY day."""
+        return dict(self._calendar)
+
+    def freeze_calendar(self) -> Mapping[str, int]:
+        """
+        Return a read-only view of the current calendar that later
+        changes will not affect. The dict is shared until the next
+        write, which copies it first (copy-on-write).
+        """
+        self._calendar_shared = True
+        return MappingProxyType(self._calendar)
+
+    def replace_calendar(self, calendar: Dict[str, int]) -> None:
+        """Replace the booked rooms per day, dropping empty days."""
+        self._calendar = {
+            key: int(value) for key, value in calendar.items() if value
+        }
+        self._calendar_shared = False
+        self.calendar_version += 1
+        self._reprice_calendar()
+        for listener in _CALENDAR_LISTENERS:
+            listener(self, None, None, 0)
+        for listener in _BATCH_LISTENERS:
+            listener(self, [(None, None, 0)])
+
+    def prune_calendar_before(self, day: DateLike) -> int:
+        """
+        Remove the calendar days before the given date and return
+        how many were removed.
+        """
+        first = as_ordinal(day)
+        if self.inventory is not None:
+            self.inventory.trim_before(first)
+        limit = calendar_key_for(first)
+        stale = [key for key in self._calendar if key < limit]
+        if stale:
+            self._own_calendar()
+            for key in stale:
+                del self._calendar[key]
+            self._reprice_calendar()
+            for listener in _CALENDAR_LISTENERS:
+                listener(self, None, None, 0)
+        return len(stale)
+
+    def _reprice_calendar(self) -> None:
+        """Reprice every day of the rate calendar and the booked days."""
+        if self.rates is None:
+            return
+        if self._calendar:
+            days = [key_to_ordinal(key) for key in self._calendar]
+            self.rates.occupancy_changed(min(days), max(days))
+        self.rates.refresh()
+
+    def _require_inventory(self) -> RoomInventory:
+        """Return the room-type inventory or raise if there is none."""
+        if self.inventory is None:
+            raise ValueError("Hotel has no room types.")
+        return self.inventory
+
+    def _own_calendar(self) -> None:
+        """Copy the calendar before a write if a snapshot shares it."""
+        if self._calendar_shared:
+            self._calendar = dict(self._calendar)
+            self._calendar_shared = False
+        self.calendar_version += 1
+
     @staticmethod
     def _parse_date(value: str) -> date:
         """Parse a date string in YYYY-MM-DD format."""
-        try:
-            return datetime.strptime(value, "%Y-%m-%d").date()
-        except ValueError as exc:
-            raise ValueError("Invalid date format. Use YYYY-MM-DD.") from exc
+        return parse_date(value)
 
     @staticmethod
     def _calendar_key(day: date) -> str:
         """Return YYYY-DOY key for a given date."""
-        doy = day.timetuple().tm_yday
-        return f"{day.year}-{doy:03d}"
+        return calendar_key(day)
 
 
-def save_hotels_to_file(hotels: List[Hotel], file_path: str) -> None:
-    """Save a list of hotels to a JSON file."""
-    data = [hotel.to_dict() for hotel in hotels]
-    with open(file_path, "w", encoding="utf-8") as file:
-        json.dump(data, file, indent=2)
+@instrument("hotel.save_hotels_to_file")
+def save_hotels_to_file(
+        hotels: List[Hotel],
+        file_path: str,
+        compression: Optional[str] = None
+        ) -> None:
+    """
+    Atomically save a list of hotels to a checksummed snapshot file,
+    optionally gzip or lzma compressed.
+    """
+    write_records(
+        file_path, "hotels", (hotel.to_dict() for hotel in hotels),
+        compression,
+    )
 
 
-def load_hotels_from_file(file_path: str) -> List[Hotel]:
+@instrument("hotel.load_hotels_from_file")
+def load_hotels_from_file(
+        file_path: str,
+        trusted: bool = False
+        ) -> List[Hotel]:
     """
-    Load hotels from a JSON file.
-    Returns an empty list if the file is missing.
+    Load hotels from a snapshot or JSON file.
+    Returns an empty list if the file is missing and raises
+    CorruptSnapshotError if it cannot be read back intact.
+
+    With trusted=True the file must be a snapshot that matches its
+    checksum, and hotels are built without per-field validation.
     """
     try:
-        with open(file_path, "r", encoding="utf-8") as file:
-            data = json.load(file)
+        data, verified = read_records(file_path, "hotels")
     except FileNotFoundError:
         return []
-    except json.JSONDecodeError:
-        return []
 
+    if trusted:
+        if not verified:
+            raise ValueError("Trusted load requires a checksummed snapshot.")
+        return [Hotel.from_trusted_dict(item) for item in data]
     return [Hotel.from_dict(item) for item in data]
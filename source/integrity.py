@@ -0,0 +1,254 @@
+"""
+Integrity module.
+
+Rebuilds hotel calendars from the reservation list in one pass
+(difference arrays and prefix sums per hotel) and compares them
+with the calendars stored in each hotel. Hotels with room types
+also get their room type x day matrix rebuilt and compared.
+"""
+
+# pylint: disable=duplicate-code
+
+
+import os
+from calendar import isleap
+from datetime import date
+from typing import Dict, List
+
+from source.dates import calendar_key_for
+from source.hotel import Hotel
+from source.inventory import RoomInventory
+from source.reservation import Reservation
+
+VERIFY_ENV = "A62_VERIFY_ON_LOAD"
+
+
+def _prefix_calendar(
+        first: int,
+        diff: List[int]
+        ) -> Dict[str, int]:
+    """
+    Turn a difference array starting at ordinal `first` into a
+    YYYY-DOY calendar with only the days that have bookings.
+    """
+    calendar: Dict[str, int] = {}
+    day = date.fromordinal(first)
+    year = day.year
+    doy = day.timetuple().tm_yday
+    year_length = 366 if isleap(year) else 365
+    booked = 0
+    for delta in diff[:-1]:
+        booked += delta
+        if booked:
+            calendar[f"{year}-{doy:03d}"] = booked
+        doy += 1
+        if doy > year_length:
+            year += 1
+            doy = 1
+            year_length = 366 if isleap(year) else 365
+    return calendar
+
+
+def rebuild_calendars(
+        hotels: List[Hotel],
+        reservations: List[Reservation]
+        ) -> Dict[int, Dict[str, int]]:
+    """
+    Recompute every hotel's booked rooms per day from the reservations.
+
+    Each reservation adds two entries to its hotel's difference array,
+    and a single prefix sum per hotel yields the daily occupancy.
+    Reservations for unknown hotels are ignored.
+    """
+    ranges: Dict[int, List[tuple]] = {hotel.hotel_id: [] for hotel in hotels}
+    for reservation in reservations:
+        bucket = ranges.get(reservation.hotel_id)
+        if bucket is None:
+            continue
+        start = reservation.start_ordinal
+        end = reservation.end_ordinal
+        if start > end:
+            raise ValueError(
+                "End date must be greater than or equal to start date."
+                )
+        bucket.append((start, end, reservation.rooms_reserved))
+
+    calendars: Dict[int, Dict[str, int]] = {}
+    for hotel_id, bucket in ranges.items():
+        if not bucket:
+            calendars[hotel_id] = {}
+            continue
+        first = min(item[0] for item in bucket)
+        last = max(item[1] for item in bucket)
+        diff = [0] * (last - first + 2)
+        for start, end, rooms in bucket:
+            diff[start - first] += rooms
+            diff[end - first + 1] -= rooms
+        calendars[hotel_id] = _prefix_calendar(first, diff)
+    return calendars
+
+
+def _valid_room_counts(hotel: Hotel, reservation: Reservation) -> bool:
+    """Return True if a typed reservation fits the hotel's room types."""
+    return hotel.inventory is not None and all(
+        room_type in hotel.inventory.capacities
+        for room_type in reservation.room_counts
+    )
+
+
+def rebuild_room_types(
+        hotels: List[Hotel],
+        reservations: List[Reservation]
+        ) -> Dict[int, RoomInventory]:
+    """
+    Recompute the room type x day matrix of every hotel with room
+    types from the room counts of its reservations. Untyped
+    reservations and room types the hotel does not have are ignored.
+    """
+    by_id = {hotel.hotel_id: hotel for hotel in hotels}
+    changes: Dict[int, List[tuple]] = {
+        hotel.hotel_id: [] for hotel in hotels if hotel.inventory is not None
+    }
+    for reservation in reservations:
+        hotel = by_id.get(reservation.hotel_id)
+        if reservation.room_counts is None or hotel is None \
+                or not _valid_room_counts(hotel, reservation):
+            continue
+        changes[hotel.hotel_id].extend(
+            (reservation.start_ordinal, reservation.end_ordinal,
+             room_type, count)
+            for room_type, count in reservation.room_counts.items()
+        )
+
+    inventories = {}
+    for hotel_id, hotel_changes in changes.items():
+        inventory = RoomInventory(by_id[hotel_id].inventory.capacities)
+        inventory.apply(hotel_changes)
+        inventories[hotel_id] = inventory
+    return inventories
+
+
+def _room_type_report(
+        stored: RoomInventory,
+        expected: RoomInventory
+        ) -> tuple:
+    """
+    Return the per-type drift and overbooked days of a stored matrix
+    against the rebuilt one, keyed by room type.
+    """
+    windows = [(inventory.base, inventory.base + inventory.days - 1)
+               for inventory in (stored, expected) if inventory.days]
+    if not windows:
+        return {}, {}
+    first = min(window[0] for window in windows)
+    last = max(window[1] for window in windows)
+
+    drift: Dict[str, List[dict]] = {}
+    overbooked: Dict[str, List[str]] = {}
+    for room_type, capacity in expected.capacities.items():
+        days = zip(range(first, last + 1),
+                   stored.booked(room_type, first, last),
+                   expected.booked(room_type, first, last))
+        for day, have, want in days:
+            if have != want:
+                drift.setdefault(room_type, []).append({
+                    "day": calendar_key_for(day),
+                    "stored": have,
+                    "expected": want,
+                })
+            if want > capacity:
+                overbooked.setdefault(room_type, []).append(
+                    calendar_key_for(day)
+                )
+    return drift, overbooked
+
+
+def verify_calendars(
+        hotels: List[Hotel],
+        reservations: List[Reservation],
+        repair: bool = False
+        ) -> dict:
+    """
+    Compare stored calendars with the ones rebuilt from reservations.
+
+    Returns a report with the differing days per hotel, the days where
+    reservations exceed the hotel capacity and the reservations that
+    reference unknown hotels. For hotels with room types the same
+    drift and overbooking are reported per room type, along with the
+    typed reservations whose room types the hotel does not have. With
+    repair=True the stored calendars and matrices are replaced by the
+    rebuilt ones.
+    """
+    rebuilt = rebuild_calendars(hotels, reservations)
+    rebuilt_types = rebuild_room_types(hotels, reservations)
+    by_id = {hotel.hotel_id: hotel for hotel in hotels}
+    known = set(rebuilt)
+    report = {
+        "consistent": True,
+        "drift": {},
+        "overbooked": {},
+        "orphan_reservations": [
+            reservation.reservation_id for reservation in reservations
+            if reservation.hotel_id not in known
+        ],
+        "room_type_drift": {},
+        "room_type_overbooked": {},
+        "invalid_room_counts": [
+            reservation.reservation_id for reservation in reservations
+            if reservation.room_counts is not None
+            and reservation.hotel_id in known
+            and not _valid_room_counts(
+                by_id[reservation.hotel_id], reservation
+            )
+        ],
+        "repaired": False,
+    }
+
+    for hotel in hotels:
+        stored = hotel.calendar()
+        expected = rebuilt[hotel.hotel_id]
+        drift = [
+            {
+                "day": key,
+                "stored": stored.get(key, 0),
+                "expected": expected.get(key, 0),
+            }
+            for key in sorted(set(stored) | set(expected))
+            if stored.get(key, 0) != expected.get(key, 0)
+        ]
+        overbooked = sorted(
+            key for key, value in expected.items()
+            if value > hotel.total_rooms
+        )
+        if drift:
+            report["drift"][hotel.hotel_id] = drift
+        if overbooked:
+            report["overbooked"][hotel.hotel_id] = overbooked
+        if repair and drift:
+            hotel.replace_calendar(expected)
+            report["repaired"] = True
+
+        if hotel.inventory is None:
+            continue
+        type_drift, type_overbooked = _room_type_report(
+            hotel.inventory, rebuilt_types[hotel.hotel_id]
+        )
+        if type_drift:
+            report["room_type_drift"][hotel.hotel_id] = type_drift
+        if type_overbooked:
+            report["room_type_overbooked"][hotel.hotel_id] = type_overbooked
+        if repair and type_drift:
+            hotel.inventory = rebuilt_types[hotel.hotel_id]
+            report["repaired"] = True
+
+    report["consistent"] = not (
+        report["drift"] or report["overbooked"]
+        or report["orphan_reservations"] or report["room_type_drift"]
+        or report["room_type_overbooked"] or report["invalid_room_counts"]
+    )
+    return report
+
+
+def verify_on_load_enabled() -> bool:
+    """Return True if the A62_VERIFY_ON_LOAD variable asks for checks."""
+    return os.environ.get(VERIFY_ENV, "") not in ("", "0")
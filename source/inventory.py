@@ -0,0 +1,217 @@
+"""
+Inventory module.
+
+Room-type inventory of a hotel, stored as a room type x day
+occupancy matrix: one array of booked rooms per room type over a
+shared window of day ordinals that grows as bookings need it.
+Availability for a mix of room types takes the maximum of each
+row slice, so a check costs one C-level scan per requested type
+instead of a dictionary lookup per day.
+"""
+
+# pylint: disable=duplicate-code
+
+
+from array import array
+from typing import Dict, List, Optional, Tuple
+
+from source.dates import to_iso, to_ordinal
+
+_TYPECODE = "l"
+
+
+def parse_room_counts(text: str) -> Dict[str, int]:
+    """Parse 'single=2, double=1' into a room type to count mapping."""
+    counts: Dict[str, int] = {}
+    for part in text.split(","):
+        if not part.strip():
+            continue
+        room_type, _, count = part.partition("=")
+        room_type = room_type.strip()
+        if not room_type or not count.strip():
+            raise ValueError("Use room_type=count pairs separated by commas.")
+        counts[room_type] = counts.get(room_type, 0) + int(count)
+    return counts
+
+
+def validate_room_counts(room_counts: Dict[str, int]) -> None:
+    """Raise ValueError unless every room type has a positive count."""
+    if not room_counts:
+        raise ValueError("At least one room type is required.")
+    for room_type, count in room_counts.items():
+        if not room_type:
+            raise ValueError("Room type cannot be empty.")
+        if count <= 0:
+            raise ValueError("Rooms per type must be at least 1.")
+
+
+class RoomInventory:
+    """Booked rooms per room type and day, with per-type capacities."""
+
+    def __init__(self, capacities: Dict[str, int]):
+        """Initialize an empty matrix for the given room capacities."""
+        validate_room_counts(capacities)
+        self.capacities = dict(capacities)
+        self.base = 0
+        self.rows: Dict[str, array] = {
+            room_type: array(_TYPECODE) for room_type in capacities
+        }
+
+    @property
+    def days(self) -> int:
+        """Number of days covered by the matrix window."""
+        return len(next(iter(self.rows.values())))
+
+    def booked(self, room_type: str, first: int, last: int) -> List[int]:
+        """Return the booked rooms of a type for each day first..last."""
+        row = self._row(room_type)
+        return [
+            row[day - self.base] if 0 <= day - self.base < len(row) else 0
+            for day in range(first, last + 1)
+        ]
+
+    def peak(self, room_type: str, first: int, last: int) -> int:
+        """Return the highest booked count of a type in first..last."""
+        row = self._row(room_type)
+        start = max(first - self.base, 0)
+        stop = min(last - self.base + 1, len(row))
+        return max(row[start:stop]) if start < stop else 0
+
+    def available(
+            self,
+            first: int,
+            last: int,
+            room_counts: Dict[str, int]
+            ) -> bool:
+        """Return True if every requested type fits on every day."""
+        validate_room_counts(room_counts)
+        for room_type, count in room_counts.items():
+            if self.peak(room_type, first, last) + count \
+                    > self.capacities[room_type]:
+                return False
+        return True
+
+    def prepare(
+            self,
+            changes: List[Tuple[int, int, str, int]],
+            check_capacity: bool = False
+            ) -> Dict[str, Tuple[int, array]]:
+        """
+        Validate (first, last, room_type, delta) changes without
+        applying them. Returns the new row slices to pass to commit.
+
+        Raises ValueError if a day would drop below zero or, with
+        check_capacity, if a day that gains rooms would exceed the
+        capacity of its type.
+        """
+        plan = {}
+        for room_type, (first, last) in self._spans(changes).items():
+            values = array(_TYPECODE, self.booked(room_type, first, last))
+            gained = [False] * len(values)
+            for c_first, c_last, c_type, delta in changes:
+                if c_type != room_type:
+                    continue
+                for index in range(c_first - first, c_last - first + 1):
+                    values[index] += delta
+                    gained[index] = gained[index] or delta > 0
+            if values and min(values) < 0:
+                raise ValueError(
+                    "Cancellation exceeds booked rooms for selected dates."
+                    )
+            if check_capacity and any(
+                    gain and value > self.capacities[room_type]
+                    for gain, value in zip(gained, values)):
+                raise ValueError("No rooms available for the selected dates.")
+            plan[room_type] = (first, values)
+        return plan
+
+    def commit(self, plan: Dict[str, Tuple[int, array]]) -> None:
+        """Write the row slices returned by prepare."""
+        for room_type, (first, values) in plan.items():
+            self._cover(first, first + len(values) - 1)
+            start = first - self.base
+            self.rows[room_type][start:start + len(values)] = values
+
+    def apply(
+            self,
+            changes: List[Tuple[int, int, str, int]],
+            check_capacity: bool = False
+            ) -> None:
+        """Validate and apply changes; nothing is written on error."""
+        self.commit(self.prepare(changes, check_capacity))
+
+    def trim_before(self, first: int) -> None:
+        """Drop the days before the given ordinal from the window."""
+        drop = min(max(first - self.base, 0), self.days)
+        if drop:
+            for room_type, row in self.rows.items():
+                self.rows[room_type] = row[drop:]
+            self.base += drop
+
+    def to_dict(self) -> dict:
+        """Return a JSON-serializable representation of the inventory."""
+        return {
+            "capacities": dict(self.capacities),
+            "start_date": to_iso(self.base) if self.days else None,
+            "rows": {
+                room_type: row.tolist()
+                for room_type, row in self.rows.items()
+            },
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "RoomInventory":
+        """Create a RoomInventory instance from a dictionary."""
+        inventory = cls({
+            str(room_type): int(capacity)
+            for room_type, capacity in data["capacities"].items()
+        })
+        start_date: Optional[str] = data.get("start_date")
+        rows = data.get("rows", {})
+        if start_date is not None:
+            inventory.base = to_ordinal(start_date)
+            lengths = {len(rows.get(room_type, ())) for room_type in
+                       inventory.rows}
+            if len(lengths) != 1:
+                raise ValueError("Room type rows must have the same length.")
+            for room_type in inventory.rows:
+                inventory.rows[room_type] = array(
+                    _TYPECODE, (int(value) for value in rows[room_type])
+                )
+        return inventory
+
+    def _row(self, room_type: str) -> array:
+        """Return the row of a room type."""
+        row = self.rows.get(room_type)
+        if row is None:
+            raise ValueError(f"Unknown room type: {room_type}.")
+        return row
+
+    def _spans(
+            self,
+            changes: List[Tuple[int, int, str, int]]
+            ) -> Dict[str, List[int]]:
+        """Return the first and last day touched per room type."""
+        spans: Dict[str, List[int]] = {}
+        for first, last, room_type, _ in changes:
+            self._row(room_type)
+            span = spans.setdefault(room_type, [first, last])
+            span[0] = min(span[0], first)
+            span[1] = max(span[1], last)
+        return spans
+
+    def _cover(self, first: int, last: int) -> None:
+        """Grow the window with empty days so it covers first..last."""
+        if not self.days:
+            self.base = first
+        before = max(self.base - first, 0)
+        after = max(last - (self.base + self.days - 1), 0)
+        if not before and not after:
+            return
+        for room_type, row in self.rows.items():
+            self.rows[room_type] = (
+                array(_TYPECODE, bytes(before * row.itemsize))
+                + row
+                + array(_TYPECODE, bytes(after * row.itemsize))
+            )
+        self.base -= before
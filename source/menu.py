@@ -4,36 +4,60 @@ CLI menu for the A6.2 Reservation System.
 Provides a console interface to manage hotels, customers, and reservations.
 """
 
-# pylint: disable=duplicate-code
+# pylint: disable=duplicate-code,too-many-lines
 
 
-from typing import List, Optional
+import argparse
+from typing import List, Optional, Tuple
 
 from source.customer import (
     Customer,
+    CustomerIndex,
     load_customers_from_file,
     save_customers_to_file,
 )
+from source.events import (
+    flush_events,
+    publish,
+    publisher_from_env,
+    set_publisher,
+)
 from source.hotel import (
     Hotel,
     load_hotels_from_file,
     save_hotels_to_file,
 )
+from source.integrity import verify_calendars, verify_on_load_enabled
+from source.inventory import parse_room_counts
+from source.metrics import export_on_exit, instrument
+from source.profiling import enable_profiling, profiled
+from source.rates import RateCalendar, quote_hotels
 from source.reservation import (
     Reservation,
     load_reservations_from_file,
     save_reservations_to_file,
 )
+from source.search import HotelSearchIndex
+from source.waitlist import (
+    Waitlist,
+    load_waitlist_from_file,
+    save_waitlist_to_file,
+)
 
 HOTELS_FILE = "hotels.json"
 CUSTOMERS_FILE = "customers.json"
 RESERVATIONS_FILE = "reservations.json"
+WAITLIST_FILE = "waitlist.json"
 
 
 class CancelOperation(Exception):
     """Raised when the user cancels the current operation."""
 
 
+class NoAvailability(ValueError):
+    """Raised when a hotel has no rooms left for the requested dates."""
+
+
 def prompt_input(message: str) -> str:
     """Prompt a string input. Typing 'cancel' raises CancelOperation."""
     value = input(message).strip()
@@ -87,21 +111,36 @@ def find_reservation(
     return None
 
 
-def create_hotel(hotels: List[Hotel]) -> None:
+@instrument("menu.create_hotel")
+def create_hotel(
+        hotels: List[Hotel],
+        index: Optional[HotelSearchIndex] = None
+        ) -> None:
     """Create a new hotel and add it to the hotels list."""
     show_cancel_legend()
     hotel_id = prompt_int("Hotel ID: ")
     name = prompt_input("Name: ")
     location = prompt_input("Location: ")
     total_rooms = prompt_int("Total rooms: ")
+    room_types = prompt_input(
+        "Room types, e.g. single=10,double=5 (empty for none): "
+    )
 
     if find_hotel(hotels, hotel_id) is not None:
         raise ValueError("Hotel ID already exists.")
 
-    hotels.append(Hotel(hotel_id, name, location, total_rooms))
+    hotel = Hotel(
+        hotel_id, name, location, total_rooms,
+        parse_room_counts(room_types) if room_types else None,
+    )
+    hotels.append(hotel)
+    if index is not None:
+        index.add(hotel)
+    publish("hotel.created", hotel.display_information())
     print("Hotel created.")
 
 
+@instrument("menu.list_hotels")
 def list_hotels(hotels: List[Hotel]) -> None:
     """Print all hotels with basic information."""
     if not hotels:
@@ -119,6 +158,7 @@ def list_hotels(hotels: List[Hotel]) -> None:
         )
 
 
+@instrument("menu.display_hotel_information")
 def display_hotel_information(hotels: List[Hotel]) -> None:
     """Display a single hotel information by ID."""
     show_cancel_legend()
@@ -137,6 +177,7 @@ def display_hotel_information(hotels: List[Hotel]) -> None:
     )
 
 
+@instrument("menu.modify_hotel")
 def modify_hotel(hotels: List[Hotel]) -> None:
     """Modify hotel information."""
     show_cancel_legend()
@@ -155,11 +196,21 @@ def modify_hotel(hotels: List[Hotel]) -> None:
         location = None
 
     hotel.modify_information(name=name, location=location)
+    publish("hotel.modified", hotel.display_information())
     print("Hotel updated.")
 
 
-def delete_hotel(hotels: List[Hotel], reservations: List[Reservation]) -> None:
-    """Delete a hotel if it has no existing reservations."""
+@instrument("menu.delete_hotel")
+def delete_hotel(
+        hotels: List[Hotel],
+        reservations: List[Reservation],
+        index: Optional[HotelSearchIndex] = None,
+        waitlist: Optional[Waitlist] = None
+        ) -> None:
+    """
+    Delete a hotel if it has no existing reservations, together with
+    its waitlisted requests.
+    """
     show_cancel_legend()
     hotel_id = prompt_int("Hotel ID to delete: ")
 
@@ -170,14 +221,84 @@ def delete_hotel(hotels: List[Hotel], reservations: List[Reservation]) -> None:
     for idx, hotel in enumerate(hotels):
         if hotel.hotel_id == hotel_id:
             hotels.pop(idx)
+            if index is not None:
+                index.remove(hotel_id)
+            publish("hotel.deleted", {"hotel_id": hotel_id})
             print("Hotel deleted.")
+            if waitlist is not None:
+                for purged in waitlist.purge(hotel_id=hotel_id):
+                    print(f"Removed from waitlist: reservation "
+                          f"{purged.reservation_id}")
             return
 
     raise ValueError("Hotel not found.")
 
 
-def create_customer(customers: List[Customer]) -> None:
+@instrument("menu.search_hotels")
+def search_hotels(index: HotelSearchIndex) -> None:
+    """Find hotels by name or location, optionally with free rooms."""
+    show_cancel_legend()
+    query = prompt_input("Name or location: ")
+    print("Leave dates empty to skip the availability check.")
+    start_date = prompt_input("Start date (YYYY-MM-DD): ")
+    end_date = prompt_input("End date (YYYY-MM-DD): ") if start_date else ""
+
+    quotes = {}
+    if start_date:
+        rooms = prompt_int("Rooms: ")
+        matches = index.search_available(query, start_date, end_date, rooms)
+        quotes = quote_hotels(matches, start_date, end_date, rooms,
+                              available_only=False)
+    else:
+        matches = index.search(query)
+
+    if not matches:
+        print("No hotels found.")
+    for hotel in matches:
+        info = hotel.display_information()
+        if hotel.hotel_id in quotes:
+            info["quote"] = quotes[hotel.hotel_id]
+        print(info)
+
+
+@instrument("menu.set_hotel_rates")
+def set_hotel_rates(hotels: List[Hotel]) -> None:
+    """
+    Set the default rate of a hotel or its rate for a date range. A
+    hotel without rates is asked for its default rate first.
+    """
+    show_cancel_legend()
+    hotel = find_hotel(hotels, prompt_int("Hotel ID: "))
+    if hotel is None:
+        raise ValueError("Hotel not found.")
+    print("Rates are in cents. Leave dates empty to set the default rate.")
+    start_date = prompt_input("Start date (YYYY-MM-DD): ")
+    end_date = prompt_input("End date (YYYY-MM-DD): ") if start_date else ""
+    rate = prompt_int("Rate per room and night: ")
+
+    rates = hotel.rates
+    if rates is None:
+        rates = RateCalendar(
+            prompt_int("Default rate for the other nights: ")
+            if start_date else rate
+        )
+    if start_date:
+        rates.set_rate(start_date, end_date, rate)
+    else:
+        rates.set_default_rate(rate)
+    if hotel.rates is None:
+        hotel.set_rates(rates)
+    print("Rates updated.")
+
+
+@instrument("menu.create_customer")
+def create_customer(
+        customers: List[Customer],
+        index: Optional[CustomerIndex] = None
+        ) -> None:
     """Create a new customer and add it to the customers list."""
+    if index is None:
+        index = CustomerIndex(customers)
     show_cancel_legend()
     customer_id = prompt_int("Customer ID: ")
     name = prompt_input("Name: ")
@@ -186,10 +307,14 @@ def create_customer(customers: List[Customer]) -> None:
     if find_customer(customers, customer_id) is not None:
         raise ValueError("Customer ID already exists.")
 
-    customers.append(Customer(customer_id, name, email))
+    customer = Customer(customer_id, name, email)
+    index.add(customer)
+    customers.append(customer)
+    publish("customer.created", customer.to_dict())
     print("Customer created.")
 
 
+@instrument("menu.list_customers")
 def list_customers(customers: List[Customer]) -> None:
     """Print all customers."""
     if not customers:
@@ -200,6 +325,7 @@ def list_customers(customers: List[Customer]) -> None:
         print(customer.to_dict())
 
 
+@instrument("menu.display_customer_information")
 def display_customer_information(customers: List[Customer]) -> None:
     """Display a single customer information by ID."""
     show_cancel_legend()
@@ -210,8 +336,14 @@ def display_customer_information(customers: List[Customer]) -> None:
     print(customer.to_dict())
 
 
-def modify_customer(customers: List[Customer]) -> None:
+@instrument("menu.modify_customer")
+def modify_customer(
+        customers: List[Customer],
+        index: Optional[CustomerIndex] = None
+        ) -> None:
     """Modify customer information."""
+    if index is None:
+        index = CustomerIndex(customers)
     show_cancel_legend()
     customer_id = prompt_int("Customer ID: ")
     customer = find_customer(customers, customer_id)
@@ -222,24 +354,45 @@ def modify_customer(customers: List[Customer]) -> None:
     name = input("New name: ").strip()
     email = input("New email: ").strip()
 
-    if name != "":
-        customer.name = name
-    if email != "":
-        customer.email = email
+    index.update(customer, name or None, email or None)
+    publish("customer.modified", customer.to_dict())
+    print("Customer updated.")
 
-    if not customer.name:
-        raise ValueError("Customer name cannot be empty.")
-    if not customer.email:
-        raise ValueError("Customer email cannot be empty.")
 
-    print("Customer updated.")
+@instrument("menu.search_customers")
+def search_customers(
+        customers: List[Customer],
+        index: Optional[CustomerIndex] = None
+        ) -> None:
+    """Find a customer by email, or customers by name prefix."""
+    if index is None:
+        index = CustomerIndex(customers)
+    show_cancel_legend()
+    query = prompt_input("Email or name prefix: ")
+
+    if "@" in query:
+        customer = index.find_by_email(query)
+        matches = [] if customer is None else [customer]
+    else:
+        matches = index.search_name(query)
+
+    if not matches:
+        print("No customers found.")
+    for customer in matches:
+        print(customer.to_dict())
 
 
+@instrument("menu.delete_customer")
 def delete_customer(
         customers: List[Customer],
-        reservations: List[Reservation]
+        reservations: List[Reservation],
+        index: Optional[CustomerIndex] = None,
+        waitlist: Optional[Waitlist] = None
         ) -> None:
-    """Delete a customer if it has no existing reservations."""
+    """
+    Delete a customer if it has no existing reservations, together
+    with its waitlisted requests.
+    """
     show_cancel_legend()
     customer_id = prompt_int("Customer ID to delete: ")
 
@@ -252,83 +405,365 @@ def delete_customer(
     for idx, customer in enumerate(customers):
         if customer.customer_id == customer_id:
             customers.pop(idx)
+            if index is not None:
+                index.remove(customer)
+            publish("customer.deleted", {"customer_id": customer_id})
             print("Customer deleted.")
+            if waitlist is not None:
+                for purged in waitlist.purge(customer_id=customer_id):
+                    print(f"Removed from waitlist: reservation "
+                          f"{purged.reservation_id}")
             return
 
     raise ValueError("Customer not found.")
 
 
+@profiled("menu.book_reservation")
+@instrument("menu.book_reservation")
+def book_reservation(
+    hotels: List[Hotel],
+    customers: List[Customer],
+    reservations: List[Reservation],
+    reservation: Reservation,
+) -> None:
+    """
+    Validate a reservation, apply it to the hotel calendar
+    and add it to the reservations list.
+    """
+    if find_reservation(reservations, reservation.reservation_id) is not None:
+        raise ValueError("Reservation ID already exists.")
+
+    hotel = find_hotel(hotels, reservation.hotel_id)
+    if hotel is None:
+        raise ValueError("Hotel not found.")
+
+    if find_customer(customers, reservation.customer_id) is None:
+        raise ValueError("Customer not found.")
+
+    if reservation.room_counts is None:
+        if hotel.inventory is not None:
+            raise ValueError("Choose the rooms per type for this hotel.")
+        if not hotel.available_rooms_for_dates(
+            reservation.start_ordinal,
+            reservation.end_ordinal,
+            reservation.rooms_reserved,
+        ):
+            raise NoAvailability("No rooms available for the selected dates.")
+        hotel.apply_calendar_change(
+            reservation.start_ordinal,
+            reservation.end_ordinal,
+            reservation.rooms_reserved,
+            sign=1,
+        )
+    else:
+        if not hotel.available_room_mix(
+            reservation.start_ordinal,
+            reservation.end_ordinal,
+            reservation.room_counts,
+        ):
+            raise NoAvailability("No rooms available for the selected dates.")
+        hotel.apply_room_mix_change(
+            reservation.start_ordinal,
+            reservation.end_ordinal,
+            reservation.room_counts,
+            sign=1,
+        )
+    reservations.append(reservation)
+    publish("reservation.created", reservation.to_dict())
+
+
+@profiled("menu.release_reservation")
+@instrument("menu.release_reservation")
+def release_reservation(
+        hotels: List[Hotel],
+        reservations: List[Reservation],
+        reservation_id: int
+        ) -> Reservation:
+    """
+    Revert a reservation from the hotel calendar, remove it
+    from the reservations list and return it.
+    """
+    reservation = find_reservation(reservations, reservation_id)
+    if reservation is None:
+        raise ValueError("Reservation not found.")
+
+    hotel = find_hotel(hotels, reservation.hotel_id)
+    if hotel is None:
+        raise ValueError("Hotel not found.")
+
+    if reservation.room_counts is None:
+        hotel.apply_calendar_change(
+            reservation.start_ordinal,
+            reservation.end_ordinal,
+            reservation.rooms_reserved,
+            sign=-1,
+        )
+    else:
+        hotel.apply_room_mix_change(
+            reservation.start_ordinal,
+            reservation.end_ordinal,
+            reservation.room_counts,
+            sign=-1,
+        )
+
+    reservations.remove(reservation)
+    publish("reservation.cancelled", reservation.to_dict())
+    return reservation
+
+
+@instrument("menu.book_or_waitlist")
+def book_or_waitlist(
+    hotels: List[Hotel],
+    customers: List[Customer],
+    reservations: List[Reservation],
+    waitlist: Waitlist,
+    reservation: Reservation,
+) -> bool:
+    """
+    Book a reservation, or queue it in the waitlist if the hotel
+    is full. Returns True if it was booked.
+    """
+    if waitlist.contains(reservation.reservation_id):
+        raise ValueError("Reservation ID already in waitlist.")
+    try:
+        book_reservation(hotels, customers, reservations, reservation)
+    except NoAvailability:
+        waitlist.add(reservation)
+        return False
+    return True
+
+
+@instrument("menu.promote_waitlist")
+def promote_waitlist(  # pylint: disable=too-many-arguments
+    # pylint: disable=too-many-positional-arguments
+    hotels: List[Hotel],
+    customers: List[Customer],
+    reservations: List[Reservation],
+    waitlist: Waitlist,
+    freed: Reservation,
+    dropped: Optional[List[Tuple[Reservation, str]]] = None,
+) -> List[Reservation]:
+    """
+    Book the waiting requests that fit after `freed` released its
+    rooms. Only requests overlapping the freed dates are examined,
+    oldest first; requests that still do not fit keep their place.
+    Requests that can never be booked (e.g. their customer was
+    deleted or their ID is taken) leave the waitlist and are added
+    to `dropped` with the reason.
+    """
+    promoted = []
+    for candidate in waitlist.candidates(
+            freed.hotel_id, freed.start_ordinal, freed.end_ordinal):
+        try:
+            book_reservation(hotels, customers, reservations, candidate)
+        except NoAvailability:
+            continue
+        except ValueError as exc:
+            waitlist.remove(candidate.reservation_id)
+            if dropped is not None:
+                dropped.append((candidate, str(exc)))
+            continue
+        waitlist.remove(candidate.reservation_id)
+        promoted.append(candidate)
+    return promoted
+
+
+@profiled("menu.change_reservation")
+@instrument("menu.change_reservation")
+def change_reservation(
+    hotels: List[Hotel],
+    reservations: List[Reservation],
+    reservation_id: int,
+    updated: dict,
+) -> Reservation:
+    """
+    Change the dates and/or rooms of a reservation in place.
+
+    `updated` may hold start_date, end_date and rooms_reserved, or
+    room_counts for typed bookings; missing keys keep their current
+    value. A booking cannot switch between typed and untyped rooms,
+    and its shape must match the hotel's. Only the days that change are
+    checked and applied to the hotel calendar, and the reservation
+    keeps its ID and position in the reservations list.
+    """
+    reservation = find_reservation(reservations, reservation_id)
+    if reservation is None:
+        raise ValueError("Reservation not found.")
+
+    hotel = find_hotel(hotels, reservation.hotel_id)
+    if hotel is None:
+        raise ValueError("Hotel not found.")
+
+    room_counts = updated.get("room_counts", reservation.room_counts)
+    if (room_counts is None) != (reservation.room_counts is None):
+        raise ValueError(
+            "Cannot switch a booking between typed and untyped rooms."
+        )
+    if room_counts is not None and hotel.inventory is None:
+        raise ValueError("Hotel has no room types.")
+    if room_counts is None and hotel.inventory is not None:
+        raise ValueError("Choose the rooms per type for this hotel.")
+    if room_counts is not None and "rooms_reserved" in updated \
+            and updated["rooms_reserved"] != sum(room_counts.values()):
+        raise ValueError("Rooms reserved must equal the rooms per type.")
+    modified = Reservation(
+        reservation_id=reservation.reservation_id,
+        hotel_id=reservation.hotel_id,
+        customer_id=reservation.customer_id,
+        start_date=updated.get("start_date", reservation.start_date),
+        end_date=updated.get("end_date", reservation.end_date),
+        rooms_reserved=updated.get(
+            "rooms_reserved",
+            reservation.rooms_reserved if room_counts is None
+            else sum(room_counts.values()),
+        ),
+        room_counts=room_counts,
+    )
+
+    if reservation.room_counts is None:
+        hotel.change_calendar_range(
+            (reservation.start_ordinal, reservation.end_ordinal),
+            reservation.rooms_reserved,
+            (modified.start_ordinal, modified.end_ordinal),
+            modified.rooms_reserved,
+        )
+    else:
+        hotel.change_room_mix(
+            (reservation.start_ordinal, reservation.end_ordinal),
+            reservation.room_counts,
+            (modified.start_ordinal, modified.end_ordinal),
+            modified.room_counts,
+        )
+
+    reservations[reservations.index(reservation)] = modified
+    publish("reservation.modified", modified.to_dict())
+    return modified
+
+
+@instrument("menu.create_reservation")
 def create_reservation(
     hotels: List[Hotel],
     customers: List[Customer],
     reservations: List[Reservation],
+    waitlist: Optional[Waitlist] = None,
 ) -> None:
     """Create a reservation and apply it to the hotel calendar."""
     show_cancel_legend()
     reservation_id = prompt_int("Reservation ID: ")
     if find_reservation(reservations, reservation_id) is not None:
         raise ValueError("Reservation ID already exists.")
+    if waitlist is not None and waitlist.contains(reservation_id):
+        raise ValueError("Reservation ID already in waitlist.")
 
     hotel_id = prompt_int("Hotel ID: ")
     customer_id = prompt_int("Customer ID: ")
 
-    hotel = find_hotel(hotels, hotel_id)
-    if hotel is None:
+    if find_hotel(hotels, hotel_id) is None:
         raise ValueError("Hotel not found.")
 
-    customer = find_customer(customers, customer_id)
-    if customer is None:
+    if find_customer(customers, customer_id) is None:
         raise ValueError("Customer not found.")
 
     start_date = prompt_input("Start date YYYY-MM-DD: ")
     end_date = prompt_input("End date YYYY-MM-DD: ")
-    rooms = prompt_int("Rooms to reserve: ")
-
-    if not hotel.available_rooms_for_dates(start_date, end_date, rooms):
-        raise ValueError("No rooms available for the selected dates.")
-
-    hotel.apply_calendar_change(start_date, end_date, rooms, sign=1)
-
-    reservations.append(
-        Reservation(
-            reservation_id=reservation_id,
-            hotel_id=hotel_id,
-            customer_id=customer_id,
-            start_date=start_date,
-            end_date=end_date,
-            rooms_reserved=rooms,
+    room_counts = None
+    if find_hotel(hotels, hotel_id).inventory is not None:
+        room_counts = parse_room_counts(
+            prompt_input("Rooms per type, e.g. single=1,double=2: ")
         )
+        rooms = sum(room_counts.values())
+    else:
+        rooms = prompt_int("Rooms to reserve: ")
+
+    reservation = Reservation(
+        reservation_id=reservation_id,
+        hotel_id=hotel_id,
+        customer_id=customer_id,
+        start_date=start_date,
+        end_date=end_date,
+        rooms_reserved=rooms,
+        room_counts=room_counts,
     )
 
+    try:
+        book_reservation(hotels, customers, reservations, reservation)
+    except NoAvailability:
+        if waitlist is None:
+            raise
+        answer = prompt_input("No rooms available. Join the waitlist? (y/n): ")
+        if answer.lower() != "y":
+            raise
+        if waitlist.contains(reservation_id):
+            raise ValueError("Reservation ID already in waitlist.") from None
+        waitlist.add(reservation)
+        print("Reservation added to the waitlist.")
+        return
+
     print("Reservation created.")
 
 
+@instrument("menu.cancel_reservation")
 def cancel_reservation(
         hotels: List[Hotel],
-        reservations: List[Reservation]
+        reservations: List[Reservation],
+        customers: Optional[List[Customer]] = None,
+        waitlist: Optional[Waitlist] = None
         ) -> None:
-    """Cancel a reservation and revert the hotel calendar."""
+    """
+    Cancel a reservation, revert the hotel calendar and
+    promote the waiting requests that now fit.
+    """
     show_cancel_legend()
     reservation_id = prompt_int("Reservation ID to cancel: ")
-    reservation = find_reservation(reservations, reservation_id)
-    if reservation is None:
-        raise ValueError("Reservation not found.")
-
-    hotel = find_hotel(hotels, reservation.hotel_id)
-    if hotel is None:
-        raise ValueError("Hotel not found.")
+    freed = release_reservation(hotels, reservations, reservation_id)
+    print("Reservation cancelled.")
 
-    hotel.apply_calendar_change(
-        reservation.start_date,
-        reservation.end_date,
-        reservation.rooms_reserved,
-        sign=-1,
-    )
+    if waitlist is not None and customers is not None:
+        dropped: List[Tuple[Reservation, str]] = []
+        for promoted in promote_waitlist(
+            hotels, customers, reservations, waitlist, freed, dropped
+        ):
+            print(f"Promoted from waitlist: {promoted.to_dict()}")
+        for reservation, reason in dropped:
+            print(f"Dropped from waitlist: reservation "
+                  f"{reservation.reservation_id} ({reason})")
 
-    reservations.remove(reservation)
-    print("Reservation cancelled.")
 
+@instrument("menu.modify_reservation")
+def modify_reservation(
+        hotels: List[Hotel],
+        reservations: List[Reservation]
+        ) -> None:
+    """Modify the dates or rooms of a reservation."""
+    show_cancel_legend()
+    reservation_id = prompt_int("Reservation ID to modify: ")
+    reservation = find_reservation(reservations, reservation_id)
+    if reservation is None:
+        raise ValueError("Reservation not found.")
 
+    print("Leave empty to keep current value.")
+    updated = {}
+    start_date = prompt_input("New start date YYYY-MM-DD: ")
+    end_date = prompt_input("New end date YYYY-MM-DD: ")
+    if reservation.room_counts is None:
+        rooms = prompt_input("New rooms to reserve: ")
+    else:
+        rooms = prompt_input("New rooms per type, e.g. single=1,double=2: ")
+
+    if start_date != "":
+        updated["start_date"] = start_date
+    if end_date != "":
+        updated["end_date"] = end_date
+    if rooms != "" and reservation.room_counts is None:
+        updated["rooms_reserved"] = int(rooms)
+    elif rooms != "":
+        updated["room_counts"] = parse_room_counts(rooms)
+
+    change_reservation(hotels, reservations, reservation_id, updated)
+    print("Reservation updated.")
+
+
+@instrument("menu.list_reservations")
 def list_reservations(reservations: List[Reservation]) -> None:
     """Print all reservations."""
     if not reservations:
@@ -339,23 +774,45 @@ def list_reservations(reservations: List[Reservation]) -> None:
         print(reservation.to_dict())
 
 
+@instrument("menu.list_waitlist")
+def list_waitlist(waitlist: Waitlist) -> None:
+    """Print all waiting reservation requests, oldest first."""
+    if not waitlist:
+        print("Waitlist is empty.")
+        return
+
+    for entry in waitlist.entries():
+        print(entry.to_dict())
+
+
+@profiled("menu.save_all")
+@instrument("menu.save_all")
 def save_all(
     hotels: List[Hotel],
     customers: List[Customer],
     reservations: List[Reservation],
+    waitlist: Optional[Waitlist] = None,
 ) -> None:
     """Save hotels, customers, and reservations to their JSON files."""
     save_hotels_to_file(hotels, HOTELS_FILE)
     save_customers_to_file(customers, CUSTOMERS_FILE)
     save_reservations_to_file(reservations, RESERVATIONS_FILE)
+    if waitlist is not None:
+        save_waitlist_to_file(waitlist, WAITLIST_FILE)
     print("Data saved.")
 
 
-def hotels_menu(
+def hotels_menu(  # pylint: disable=too-many-branches
         hotels: List[Hotel],
-        reservations: List[Reservation]
+        reservations: List[Reservation],
+        index: Optional[HotelSearchIndex] = None,
+        waitlist: Optional[Waitlist] = None
         ) -> None:
     """Show the hotels submenu."""
+    if index is None:
+        with HotelSearchIndex(hotels) as own_index:
+            hotels_menu(hotels, reservations, own_index, waitlist)
+        return
     while True:
         print("\nHotels Menu")
         print("1. Create Hotel")
@@ -363,13 +820,15 @@ def hotels_menu(
         print("3. Display Hotel information")
         print("4. Modify Hotel Information")
         print("5. Delete Hotel")
-        print("6. Back")
+        print("6. Search Hotels")
+        print("7. Set Hotel Rates")
+        print("8. Back")
 
         choice = input("Choose an option: ").strip()
 
         try:
             if choice == "1":
-                create_hotel(hotels)
+                create_hotel(hotels, index)
                 pause()
             elif choice == "2":
                 list_hotels(hotels)
@@ -381,9 +840,15 @@ def hotels_menu(
                 modify_hotel(hotels)
                 pause()
             elif choice == "5":
-                delete_hotel(hotels, reservations)
+                delete_hotel(hotels, reservations, index, waitlist)
                 pause()
             elif choice == "6":
+                search_hotels(index)
+                pause()
+            elif choice == "7":
+                set_hotel_rates(hotels)
+                pause()
+            elif choice == "8":
                 return
             else:
                 print("Invalid option.")
@@ -398,9 +863,13 @@ def hotels_menu(
 
 def customers_menu(
         customers: List[Customer],
-        reservations: List[Reservation]
+        reservations: List[Reservation],
+        index: Optional[CustomerIndex] = None,
+        waitlist: Optional[Waitlist] = None
         ) -> None:
     """Show the customers submenu."""
+    if index is None:
+        index = CustomerIndex(customers)
     while True:
         print("\nCustomers Menu")
         print("1. Create Customer")
@@ -408,13 +877,14 @@ def customers_menu(
         print("3. Display Customer Information")
         print("4. Modify Customer Information")
         print("5. Delete Customer")
-        print("6. Back")
+        print("6. Search Customers")
+        print("7. Back")
 
         choice = input("Choose an option: ").strip()
 
         try:
             if choice == "1":
-                create_customer(customers)
+                create_customer(customers, index)
                 pause()
             elif choice == "2":
                 list_customers(customers)
@@ -423,12 +893,15 @@ def customers_menu(
                 display_customer_information(customers)
                 pause()
             elif choice == "4":
-                modify_customer(customers)
+                modify_customer(customers, index)
                 pause()
             elif choice == "5":
-                delete_customer(customers, reservations)
+                delete_customer(customers, reservations, index, waitlist)
                 pause()
             elif choice == "6":
+                search_customers(customers, index)
+                pause()
+            elif choice == "7":
                 return
             else:
                 print("Invalid option.")
@@ -445,28 +918,39 @@ def reservations_menu(
     hotels: List[Hotel],
     customers: List[Customer],
     reservations: List[Reservation],
+    waitlist: Optional[Waitlist] = None,
 ) -> None:
     """Show the reservations submenu."""
     while True:
         print("\nReservations Menu")
         print("1. Create a Reservation")
         print("2. Cancel a Reservation")
-        print("3. List Reservations")
-        print("4. Back")
+        print("3. Modify a Reservation")
+        print("4. List Reservations")
+        print("5. List Waitlist")
+        print("6. Back")
 
         choice = input("Choose an option: ").strip()
 
         try:
             if choice == "1":
-                create_reservation(hotels, customers, reservations)
+                create_reservation(hotels, customers, reservations, waitlist)
                 pause()
             elif choice == "2":
-                cancel_reservation(hotels, reservations)
+                cancel_reservation(hotels, reservations, customers, waitlist)
                 pause()
             elif choice == "3":
-                list_reservations(reservations)
+                modify_reservation(hotels, reservations)
                 pause()
             elif choice == "4":
+                list_reservations(reservations)
+                pause()
+            elif choice == "5":
+                list_waitlist(
+                    waitlist if waitlist is not None else Waitlist()
+                )
+                pause()
+            elif choice == "6":
                 return
             else:
                 print("Invalid option.")
@@ -479,34 +963,126 @@ def reservations_menu(
             pause()
 
 
-def main() -> None:
-    """Program entry point."""
-    hotels = load_hotels_from_file(HOTELS_FILE)
-    customers = load_customers_from_file(CUSTOMERS_FILE)
-    reservations = load_reservations_from_file(RESERVATIONS_FILE)
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    """Parse the command line options of the menu."""
+    parser = argparse.ArgumentParser(description="A6.2 Reservation System")
+    parser.add_argument(
+        "--profile",
+        action="store_true",
+        help="Profile slow operations (same as A62_PROFILE=1).",
+    )
+    parser.add_argument("--profile-dir", help="Directory for profiles.")
+    parser.add_argument(
+        "--profile-ms", type=float, help="Latency threshold in ms."
+    )
+    parser.add_argument(
+        "--profile-kb", type=float, help="Memory threshold in KiB."
+    )
+    parser.add_argument(
+        "--trusted-load",
+        action="store_true",
+        help="Load the data files through the checksummed fast path.",
+    )
+    parser.add_argument(
+        "--verify",
+        action="store_true",
+        help="Check calendars against reservations on load "
+        "(same as A62_VERIFY_ON_LOAD=1).",
+    )
+    parser.add_argument(
+        "--repair",
+        action="store_true",
+        help="Rebuild drifted calendars from reservations on load.",
+    )
+    return parser.parse_args(argv)
 
-    while True:
-        print("\nMain Menu")
-        print("1. Hotels")
-        print("2. Customers")
-        print("3. Reservations")
-        print("4. Save and Exit")
 
-        choice = input("Choose an option: ").strip()
+def check_calendars(
+        hotels: List[Hotel],
+        reservations: List[Reservation],
+        repair: bool = False
+        ) -> bool:
+    """Verify hotel calendars against reservations and print problems."""
+    report = verify_calendars(hotels, reservations, repair=repair)
+    for hotel_id, drift in report["drift"].items():
+        print(f"Hotel {hotel_id}: {len(drift)} day(s) out of sync.")
+    for hotel_id, days in report["overbooked"].items():
+        print(f"Hotel {hotel_id}: overbooked on {', '.join(days)}.")
+    for hotel_id, drift in report["room_type_drift"].items():
+        print(f"Hotel {hotel_id}: room types out of sync: "
+              f"{', '.join(sorted(drift))}.")
+    for hotel_id, by_type in report["room_type_overbooked"].items():
+        for room_type, days in sorted(by_type.items()):
+            print(f"Hotel {hotel_id}: {room_type} rooms overbooked on "
+                  f"{', '.join(days)}.")
+    if report["orphan_reservations"]:
+        print(
+            "Reservations with unknown hotels: "
+            f"{report['orphan_reservations']}"
+        )
+    if report["invalid_room_counts"]:
+        print(
+            "Reservations with unknown room types: "
+            f"{report['invalid_room_counts']}"
+        )
+    if report["repaired"]:
+        print("Calendars rebuilt from reservations.")
+    return report["consistent"]
 
-        if choice == "1":
-            hotels_menu(hotels, reservations)
-        elif choice == "2":
-            customers_menu(customers, reservations)
-        elif choice == "3":
-            reservations_menu(hotels, customers, reservations)
-        elif choice == "4":
-            save_all(hotels, customers, reservations)
-            print("Bye.")
-            break
-        else:
-            print("Invalid option.")
-            pause()
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """Program entry point."""
+    args = parse_args(argv)
+    if args.profile:
+        enable_profiling(args.profile_dir, args.profile_ms, args.profile_kb)
+    set_publisher(publisher_from_env())
+
+    hotels = load_hotels_from_file(HOTELS_FILE, args.trusted_load)
+    customers = load_customers_from_file(CUSTOMERS_FILE, args.trusted_load)
+    reservations = load_reservations_from_file(
+        RESERVATIONS_FILE, args.trusted_load
+    )
+    waitlist = load_waitlist_from_file(WAITLIST_FILE)
+    customer_index = CustomerIndex(customers)
+    for email, others in customer_index.duplicates.items():
+        owner = customer_index.find_by_email(email).customer_id
+        print(f"Warning: customers {[owner] + others} share the email "
+              f"{email}; only customer {owner} is found by it.")
+    hotel_index = HotelSearchIndex(hotels)
+    if args.verify or args.repair or verify_on_load_enabled():
+        check_calendars(hotels, reservations, repair=args.repair)
+
+    try:
+        while True:
+            print("\nMain Menu")
+            print("1. Hotels")
+            print("2. Customers")
+            print("3. Reservations")
+            print("4. Save and Exit")
+
+            choice = input("Choose an option: ").strip()
+
+            if choice == "1":
+                hotels_menu(hotels, reservations, hotel_index, waitlist)
+            elif choice == "2":
+                customers_menu(customers, reservations, customer_index,
+                               waitlist)
+            elif choice == "3":
+                reservations_menu(hotels, customers, reservations, waitlist)
+            elif choice == "4":
+                save_all(hotels, customers, reservations, waitlist)
+                export_on_exit()
+                hotel_index.close()
+                print("Bye.")
+                break
+            else:
+                print("Invalid option.")
+                pause()
+    finally:
+        if not flush_events():
+            print("Warning: some events could not be delivered to the "
+                  "event sink.")
+        set_publisher(None)
 
 
 if __name__ == "__main__":
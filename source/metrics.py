@@ -0,0 +1,187 @@
+"""
+Metrics module.
+
+Records operation counts, errors and latency histograms for the
+reservation system and exports them as Prometheus text or JSON.
+Recording is disabled unless the A62_METRICS environment variable
+is set or the registry is enabled explicitly.
+"""
+
+# pylint: disable=duplicate-code
+
+
+import functools
+import json
+import os
+import time
+from typing import Callable, Dict, Optional, Tuple
+
+METRICS_ENV = "A62_METRICS"
+METRICS_FILE_ENV = "A62_METRICS_FILE"
+
+LATENCY_BUCKETS: Tuple[float, ...] = (
+    0.00001, 0.000025, 0.00005, 0.0001, 0.00025, 0.0005,
+    0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0,
+)
+
+
+class OperationStats:
+    """Counters and latency histogram for a single operation."""
+
+    def __init__(self):
+        """Initialize empty statistics."""
+        self.count = 0
+        self.errors = 0
+        self.total_seconds = 0.0
+        self.buckets = [0] * (len(LATENCY_BUCKETS) + 1)
+
+    def observe(self, seconds: float, failed: bool) -> None:
+        """Record one call that took the given number of seconds."""
+        self.count += 1
+        if failed:
+            self.errors += 1
+        self.total_seconds += seconds
+        for idx, bound in enumerate(LATENCY_BUCKETS):
+            if seconds <= bound:
+                self.buckets[idx] += 1
+                return
+        self.buckets[-1] += 1
+
+    def to_dict(self) -> dict:
+        """Return a JSON-serializable representation of the stats."""
+        return {
+            "count": self.count,
+            "errors": self.errors,
+            "total_seconds": self.total_seconds,
+            "buckets": {
+                **{str(bound): hits
+                   for bound, hits in zip(LATENCY_BUCKETS, self.buckets)},
+                "+Inf": self.buckets[-1],
+            },
+        }
+
+
+class MetricsRegistry:
+    """Holds the statistics of every instrumented operation."""
+
+    def __init__(self, enabled: bool = False):
+        """Initialize an empty registry."""
+        self.enabled = enabled
+        self._stats: Dict[str, OperationStats] = {}
+
+    def record(self, name: str, seconds: float, failed: bool) -> None:
+        """Record one call of the named operation."""
+        stats = self._stats.get(name)
+        if stats is None:
+            stats = self._stats[name] = OperationStats()
+        stats.observe(seconds, failed)
+
+    def reset(self) -> None:
+        """Discard all recorded statistics."""
+        self._stats.clear()
+
+    def snapshot(self) -> dict:
+        """Return a JSON-serializable snapshot of all statistics."""
+        return {
+            "timestamp": time.time(),
+            "operations": {
+                name: stats.to_dict()
+                for name, stats in sorted(self._stats.items())
+            },
+        }
+
+    def to_prometheus(self) -> str:
+        """Return all statistics in the Prometheus text format."""
+        lines = [
+            "# HELP a62_operation_total Calls per operation.",
+            "# TYPE a62_operation_total counter",
+        ]
+        for name, stats in sorted(self._stats.items()):
+            lines.append(
+                f'a62_operation_total{{operation="{name}"}} {stats.count}'
+            )
+        lines += [
+            "# HELP a62_operation_errors_total Failed calls per operation.",
+            "# TYPE a62_operation_errors_total counter",
+        ]
+        for name, stats in sorted(self._stats.items()):
+            lines.append(
+                f'a62_operation_errors_total{{operation="{name}"}} '
+                f"{stats.errors}"
+            )
+        lines += [
+            "# HELP a62_operation_duration_seconds Operation latency.",
+            "# TYPE a62_operation_duration_seconds histogram",
+        ]
+        for name, stats in sorted(self._stats.items()):
+            cumulative = 0
+            for bound, hits in zip(LATENCY_BUCKETS, stats.buckets):
+                cumulative += hits
+                lines.append(
+                    "a62_operation_duration_seconds_bucket"
+                    f'{{operation="{name}",le="{bound}"}} {cumulative}'
+                )
+            lines.append(
+                "a62_operation_duration_seconds_bucket"
+                f'{{operation="{name}",le="+Inf"}} {stats.count}'
+            )
+            lines.append(
+                "a62_operation_duration_seconds_sum"
+                f'{{operation="{name}"}} {stats.total_seconds}'
+            )
+            lines.append(
+                "a62_operation_duration_seconds_count"
+                f'{{operation="{name}"}} {stats.count}'
+            )
+        return "\n".join(lines) + "\n"
+
+    def export(self, file_path: str) -> None:
+        """
+        Write the metrics to a file: a JSON snapshot when the path
+        ends in .json, the Prometheus text format otherwise.
+        """
+        with open(file_path, "w", encoding="utf-8") as file:
+            if file_path.endswith(".json"):
+                json.dump(self.snapshot(), file, indent=2)
+            else:
+                file.write(self.to_prometheus())
+
+
+REGISTRY = MetricsRegistry(
+    enabled=os.environ.get(METRICS_ENV, "") not in ("", "0")
+)
+
+
+def instrument(name: str) -> Callable:
+    """
+    Decorate a function so each call is counted and timed under
+    the given name. When the registry is disabled the only cost
+    is a flag check before calling the wrapped function.
+    """
+    def decorator(func: Callable) -> Callable:
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not REGISTRY.enabled:
+                return func(*args, **kwargs)
+            failed = True
+            started = time.perf_counter()
+            try:
+                result = func(*args, **kwargs)
+                failed = False
+                return result
+            finally:
+                REGISTRY.record(
+                    name, time.perf_counter() - started, failed
+                )
+        return wrapper
+    return decorator
+
+
+def export_on_exit(file_path: Optional[str] = None) -> None:
+    """
+    Export the metrics to the given path or to the path in the
+    A62_METRICS_FILE environment variable, if metrics are enabled.
+    """
+    file_path = file_path or os.environ.get(METRICS_FILE_ENV)
+    if REGISTRY.enabled and file_path:
+        REGISTRY.export(file_path)
@@ -0,0 +1,156 @@
+"""
+Profiling module.
+
+Opt-in per-operation profiling with cProfile and tracemalloc.
+When enabled (A62_PROFILE environment variable or the menu
+--profile flag), every profiled operation that exceeds the latency
+or memory threshold leaves a .prof dump and an allocation report.
+"""
+
+# pylint: disable=duplicate-code
+
+
+import cProfile
+import functools
+import io
+import os
+import pstats
+import time
+import tracemalloc
+from typing import Callable, Optional
+
+PROFILE_ENV = "A62_PROFILE"
+PROFILE_DIR_ENV = "A62_PROFILE_DIR"
+PROFILE_MS_ENV = "A62_PROFILE_MS"
+PROFILE_KB_ENV = "A62_PROFILE_KB"
+PROFILE_TOP_ENV = "A62_PROFILE_TOP"
+
+
+class ProfilerConfig:  # pylint: disable=too-few-public-methods
+    """Settings of the on-demand profiler."""
+
+    def __init__(
+            self,
+            enabled: bool = False,
+            output_dir: str = "profiles",
+            latency_ms: float = 50.0,
+            memory_kb: float = 1024.0
+            ):
+        """Initialize the profiler settings."""
+        if latency_ms < 0 or memory_kb < 0:
+            raise ValueError("Profiling thresholds cannot be negative.")
+        self.enabled = enabled
+        self.output_dir = output_dir
+        self.latency_ms = latency_ms
+        self.memory_kb = memory_kb
+        self.top_n = 10
+
+    @classmethod
+    def from_env(cls) -> "ProfilerConfig":
+        """Create a configuration from the A62_PROFILE* variables."""
+        config = cls(
+            enabled=os.environ.get(PROFILE_ENV, "") not in ("", "0"),
+            output_dir=os.environ.get(PROFILE_DIR_ENV, "profiles"),
+            latency_ms=float(os.environ.get(PROFILE_MS_ENV, "50")),
+            memory_kb=float(os.environ.get(PROFILE_KB_ENV, "1024")),
+        )
+        config.top_n = int(os.environ.get(PROFILE_TOP_ENV, "10"))
+        return config
+
+
+CONFIG = ProfilerConfig.from_env()
+
+_STATE = {"active": False, "sequence": 0}
+
+
+def _write_report(
+        name: str,
+        profiler: cProfile.Profile,
+        elapsed_ms: float,
+        peak_kb: float,
+        allocations: list
+        ) -> str:
+    """Write the profile dump and report; return the report path."""
+    os.makedirs(CONFIG.output_dir, exist_ok=True)
+    _STATE["sequence"] += 1
+    stem = os.path.join(
+        CONFIG.output_dir,
+        f"{name}-{time.strftime('%Y%m%d-%H%M%S')}-{_STATE['sequence']:04d}",
+    )
+    profiler.dump_stats(stem + ".prof")
+
+    buffer = io.StringIO()
+    stats = pstats.Stats(profiler, stream=buffer)
+    stats.sort_stats("cumulative").print_stats(CONFIG.top_n)
+
+    with open(stem + ".txt", "w", encoding="utf-8") as file:
+        file.write(f"operation: {name}\n")
+        file.write(f"elapsed_ms: {elapsed_ms:.3f}\n")
+        file.write(f"peak_kb: {peak_kb:.1f}\n\n")
+        file.write(f"Top {CONFIG.top_n} allocations:\n")
+        for stat in allocations[:CONFIG.top_n]:
+            file.write(f"{stat}\n")
+        file.write("\n")
+        file.write(buffer.getvalue())
+    return stem + ".txt"
+
+
+def profiled(name: str) -> Callable:
+    """
+    Decorate an operation so it runs under cProfile and tracemalloc
+    while profiling is enabled. Nested profiled calls are measured
+    as part of the outermost one.
+    """
+    def decorator(func: Callable) -> Callable:
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not CONFIG.enabled or _STATE["active"]:
+                return func(*args, **kwargs)
+
+            _STATE["active"] = True
+            owns_tracing = not tracemalloc.is_tracing()
+            if owns_tracing:
+                tracemalloc.start()
+            tracemalloc.reset_peak()
+            before = tracemalloc.take_snapshot()
+            baseline, _ = tracemalloc.get_traced_memory()
+            profiler = cProfile.Profile()
+            started = time.perf_counter()
+            try:
+                profiler.enable()
+                try:
+                    return func(*args, **kwargs)
+                finally:
+                    profiler.disable()
+            finally:
+                elapsed_ms = (time.perf_counter() - started) * 1000
+                _, peak = tracemalloc.get_traced_memory()
+                peak_kb = max(0, peak - baseline) / 1024
+                if (elapsed_ms >= CONFIG.latency_ms
+                        or peak_kb >= CONFIG.memory_kb):
+                    allocations = tracemalloc.take_snapshot().compare_to(
+                        before, "lineno"
+                    )
+                    _write_report(
+                        name, profiler, elapsed_ms, peak_kb, allocations
+                    )
+                if owns_tracing:
+                    tracemalloc.stop()
+                _STATE["active"] = False
+        return wrapper
+    return decorator
+
+
+def enable_profiling(
+        output_dir: Optional[str] = None,
+        latency_ms: Optional[float] = None,
+        memory_kb: Optional[float] = None
+        ) -> None:
+    """Turn profiling on, optionally overriding the thresholds."""
+    if output_dir is not None:
+        CONFIG.output_dir = output_dir
+    if latency_ms is not None:
+        CONFIG.latency_ms = latency_ms
+    if memory_kb is not None:
+        CONFIG.memory_kb = memory_kb
+    CONFIG.enabled = True
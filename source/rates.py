@@ -0,0 +1,236 @@
+"""
+Rates module.
+
+Per-day rate calendar of a hotel with optional occupancy tiers.
+Rates are integers in the smallest currency unit (e.g. cents), so
+totals are exact. The effective price of each day (rate adjusted by
+the tier of the day's occupancy) is kept in an array together with
+its prefix sums, which makes the price of any stay two lookups. The
+hotel reports calendar changes, and only the changed days are
+repriced; prefix sums are rebuilt lazily from the first changed day.
+"""
+
+# pylint: disable=duplicate-code
+
+
+from array import array
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+from source.dates import as_ordinal, ordinal_range, to_iso, to_ordinal
+
+_TYPECODE = "q"
+_DEFAULT = -1
+
+
+def _no_bookings(_day: int) -> int:
+    """Occupancy source of a rate calendar not bound to a hotel."""
+    return 0
+
+
+class RateCalendar:  # pylint: disable=too-many-instance-attributes
+    """
+    Daily rates with occupancy tiers and O(1) stay quotes.
+
+    `tiers` is a list of (occupancy, percent) pairs: on a day whose
+    booked share of the rooms is at least `occupancy` (0 < occupancy
+    <= 1), the rate is multiplied by percent / 100. The highest
+    matching tier wins.
+    """
+
+    def __init__(
+            self,
+            default_rate: int,
+            tiers: Optional[Sequence[Tuple[float, int]]] = None
+            ):
+        """Initialize a calendar charging default_rate every day."""
+        if default_rate < 0:
+            raise ValueError("Rate cannot be negative.")
+        tiers = sorted((float(share), int(percent))
+                       for share, percent in tiers or [])
+        for share, percent in tiers:
+            if not 0 < share <= 1:
+                raise ValueError("Tier occupancy must be in (0, 1].")
+            if percent <= 0:
+                raise ValueError("Tier percent must be positive.")
+        self.default_rate = default_rate
+        self.tiers = tiers
+        self.base = 0
+        self._rates = array(_TYPECODE)
+        self._prices = array(_TYPECODE)
+        self._prefix = array(_TYPECODE, [0])
+        self._dirty_from: Optional[int] = None
+        self._booked: Callable[[int], int] = _no_bookings
+        self._capacity = 1
+
+    def bind(self, booked: Callable[[int], int], capacity: int) -> None:
+        """Use a hotel's booked rooms per day ordinal and its capacity."""
+        self._booked = booked
+        self._capacity = capacity
+        self.refresh()
+
+    @property
+    def days(self) -> int:
+        """Number of days covered by the rate window."""
+        return len(self._rates)
+
+    def set_default_rate(self, rate: int) -> None:
+        """Change the rate of the days without a rate of their own."""
+        if rate < 0:
+            raise ValueError("Rate cannot be negative.")
+        self.default_rate = rate
+        self.refresh()
+
+    def set_rate(
+            self,
+            start_date,
+            end_date,
+            rate: Optional[int]
+            ) -> None:
+        """
+        Set the rate of every day in the inclusive range; None
+        returns the days to the default rate.
+        """
+        if rate is not None and rate < 0:
+            raise ValueError("Rate cannot be negative.")
+        first, last = ordinal_range(start_date, end_date)
+        self._cover(first, last)
+        for day in range(first, last + 1):
+            self._rates[day - self.base] = _DEFAULT if rate is None else rate
+        self.occupancy_changed(first, last)
+
+    def rate(self, day) -> int:
+        """Return the base rate of a day."""
+        index = as_ordinal(day) - self.base
+        if 0 <= index < self.days and self._rates[index] != _DEFAULT:
+            return self._rates[index]
+        return self.default_rate
+
+    def price(self, day) -> int:
+        """Return the tier-adjusted price of one room on a day."""
+        ordinal = as_ordinal(day)
+        return self._price_of(self.rate(ordinal), self._booked(ordinal))
+
+    def occupancy_changed(self, first: int, last: int) -> None:
+        """Reprice the days first..last after their occupancy changed."""
+        self._cover(first, last)
+        for day in range(first, last + 1):
+            self._prices[day - self.base] = self._price_of(
+                self.rate(day), self._booked(day)
+            )
+        self._mark_dirty(first - self.base)
+
+    def refresh(self) -> None:
+        """Reprice every day of the window."""
+        if self.days:
+            self.occupancy_changed(self.base, self.base + self.days - 1)
+
+    def quote(self, start_date, end_date, rooms: int = 1) -> int:
+        """Return the total price of `rooms` rooms for the stay."""
+        if rooms <= 0:
+            raise ValueError("Rooms requested must be at least 1.")
+        first, last = ordinal_range(start_date, end_date)
+        self._rebuild_prefix()
+
+        start = min(max(first - self.base, 0), self.days)
+        stop = min(max(last - self.base + 1, 0), self.days)
+        inside = self._prefix[stop] - self._prefix[start]
+        outside = (last - first + 1) - (stop - start)
+        return rooms * (inside + outside * self.default_rate)
+
+    def to_dict(self) -> dict:
+        """Return a JSON-serializable representation of the rates."""
+        return {
+            "default_rate": self.default_rate,
+            "tiers": [list(tier) for tier in self.tiers],
+            "start_date": to_iso(self.base) if self.days else None,
+            "rates": [
+                None if rate == _DEFAULT else rate for rate in self._rates
+            ],
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "RateCalendar":
+        """Create a RateCalendar instance from a dictionary."""
+        rates = cls(
+            int(data["default_rate"]),
+            [(float(share), int(percent))
+             for share, percent in data.get("tiers", [])],
+        )
+        if data.get("start_date") is not None and data.get("rates"):
+            rates.base = to_ordinal(data["start_date"])
+            rates._rates = array(_TYPECODE, (
+                _DEFAULT if rate is None else int(rate)
+                for rate in data["rates"]
+            ))
+            rates._prices = array(_TYPECODE, rates._rates)
+            rates.refresh()
+        return rates
+
+    def _price_of(self, rate: int, booked: int) -> int:
+        """Apply the tier of an occupancy to a rate."""
+        percent = 100
+        share = booked / self._capacity
+        for threshold, tier_percent in self.tiers:
+            if share >= threshold:
+                percent = tier_percent
+        return (rate * percent + 50) // 100
+
+    def _mark_dirty(self, index: int) -> None:
+        """Remember the first prefix sum that must be recomputed."""
+        if self._dirty_from is None or index < self._dirty_from:
+            self._dirty_from = index
+
+    def _rebuild_prefix(self) -> None:
+        """Recompute the prefix sums from the first changed day on."""
+        if self._dirty_from is None:
+            return
+        prefix, prices = self._prefix, self._prices
+        del prefix[self._dirty_from + 1:]
+        total = prefix[self._dirty_from]
+        for index in range(self._dirty_from, len(prices)):
+            total += prices[index]
+            prefix.append(total)
+        self._dirty_from = None
+
+    def _cover(self, first: int, last: int) -> None:
+        """Grow the window with default-rate days to cover first..last."""
+        if not self.days:
+            self.base = first
+        before = max(self.base - first, 0)
+        after = max(last - (self.base + self.days - 1), 0)
+        if before:
+            self._rates = array(_TYPECODE, [_DEFAULT]) * before + self._rates
+            self._prices = \
+                array(_TYPECODE, [self.default_rate]) * before + self._prices
+            self._prefix = array(_TYPECODE, [0])
+            self.base -= before
+            self._dirty_from = 0
+        if after:
+            self._mark_dirty(self.days)
+            self._rates.extend(array(_TYPECODE, [_DEFAULT]) * after)
+            self._prices.extend(
+                array(_TYPECODE, [self.default_rate]) * after
+            )
+
+
+def quote_hotels(
+        hotels: List,
+        start_date,
+        end_date,
+        rooms: int = 1,
+        available_only: bool = True
+        ) -> Dict[int, int]:
+    """
+    Return the total price of the stay per hotel ID for the hotels
+    that have rates (and, by default, the rooms available).
+    """
+    first, last = ordinal_range(start_date, end_date)
+    quotes = {}
+    for hotel in hotels:
+        if hotel.rates is None:
+            continue
+        if available_only and not hotel.available_rooms_for_dates(
+                first, last, rooms):
+            continue
+        quotes[hotel.hotel_id] = hotel.rates.quote(first, last, rooms)
+    return quotes
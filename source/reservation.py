@@ -8,11 +8,15 @@ functions to persist reservations in JSON files.
 # pylint: disable=duplicate-code
 
 
-import json
-from typing import List
+from typing import Dict, List, Optional
 
+from source.dates import ordinal_range, to_iso, to_ordinal
+from source.inventory import validate_room_counts
+from source.metrics import instrument
+from source.storage import read_records, write_records
 
-class Reservation:
+
+class Reservation:  # pylint: disable=too-many-instance-attributes
     """Represents a reservation entity."""
 
     # pylint: disable=too-many-arguments, too-many-positional-arguments
@@ -24,25 +28,41 @@ class Reservation:
         start_date: str,
         end_date: str,
         rooms_reserved: int,
+        room_counts: Optional[Dict[str, int]] = None,
     ):
-        """Initialize a reservation."""
+        """
+        Initialize a reservation. The dates are validated here and
+        also kept as day ordinals in start_ordinal and end_ordinal.
+        At hotels with room types, room_counts holds the rooms per
+        type, which must add up to rooms_reserved.
+        """
         if rooms_reserved <= 0:
             raise ValueError("Rooms reserved must be at least 1.")
         if not start_date or not end_date:
             raise ValueError("Start and end dates are required.")
+        first, last = ordinal_range(start_date, end_date)
+        if room_counts is not None:
+            validate_room_counts(room_counts)
+            if sum(room_counts.values()) != rooms_reserved:
+                raise ValueError(
+                    "Rooms per type must add up to rooms reserved."
+                    )
 
         self.reservation_id = reservation_id
         self.hotel_id = hotel_id
         self.customer_id = customer_id
-        self.start_date = start_date
-        self.end_date = end_date
+        self.start_date = to_iso(first)
+        self.end_date = to_iso(last)
         self.rooms_reserved = rooms_reserved
+        self.room_counts = None if room_counts is None else dict(room_counts)
+        self.start_ordinal = first
+        self.end_ordinal = last
 
     def to_dict(self) -> dict:
         """
         Return a JSON-serializable representation of the reservation.
         """
-        return {
+        data = {
             "reservation_id": self.reservation_id,
             "hotel_id": self.hotel_id,
             "customer_id": self.customer_id,
@@ -50,6 +70,9 @@ class Reservation:
             "end_date": self.end_date,
             "rooms_reserved": self.rooms_reserved,
         }
+        if self.room_counts is not None:
+            data["room_counts"] = dict(self.room_counts)
+        return data
 
     @classmethod
     def from_dict(cls, data: dict) -> "Reservation":
@@ -61,27 +84,65 @@ class Reservation:
             start_date=str(data["start_date"]),
             end_date=str(data["end_date"]),
             rooms_reserved=int(data["rooms_reserved"]),
+            room_counts=None if data.get("room_counts") is None else {
+                str(room_type): int(count)
+                for room_type, count in data["room_counts"].items()
+            },
         )
 
+    @classmethod
+    def from_trusted_dict(cls, data: dict) -> "Reservation":
+        """
+        Create a Reservation from a dictionary read from a verified
+        snapshot, skipping conversions and constructor validation.
+        """
+        reservation = cls.__new__(cls)
+        # Snapshot keys are the instance attributes, except for the
+        # ordinals, which come from the memoized date mapping, and
+        # room_counts, which is only written for typed bookings.
+        reservation.__dict__ = data
+        data["start_ordinal"] = to_ordinal(data["start_date"])
+        data["end_ordinal"] = to_ordinal(data["end_date"])
+        data.setdefault("room_counts", None)
+        return reservation
 
+
+@instrument("reservation.save_reservations_to_file")
 def save_reservations_to_file(
         reservations: List[Reservation],
-        file_path: str
+        file_path: str,
+        compression: Optional[str] = None
         ) -> None:
-    """Save a list of reservations to a JSON file."""
-    data = [r.to_dict() for r in reservations]
-    with open(file_path, "w", encoding="utf-8") as file:
-        json.dump(data, file, indent=2)
+    """
+    Atomically save a list of reservations to a checksummed snapshot
+    file, optionally gzip or lzma compressed.
+    """
+    write_records(
+        file_path, "reservations", (r.to_dict() for r in reservations),
+        compression,
+    )
 
 
-def load_reservations_from_file(file_path: str) -> List[Reservation]:
+@instrument("reservation.load_reservations_from_file")
+def load_reservations_from_file(
+        file_path: str,
+        trusted: bool = False
+        ) -> List[Reservation]:
     """
-    Load reservations from a JSON file.
-    Returns an empty list if the file is missing.
+    Load reservations from a snapshot or JSON file.
+    Returns an empty list if the file is missing and raises
+    CorruptSnapshotError if it cannot be read back intact.
+
+    With trusted=True the file must be a snapshot that matches its
+    checksum, and reservations are built without per-field validation.
     """
     try:
-        with open(file_path, "r", encoding="utf-8") as file:
-            data = json.load(file)
+        data, verified = read_records(file_path, "reservations")
     except FileNotFoundError:
         return []
+
+    if trusted:
+        if not verified:
+            raise ValueError("Trusted load requires a checksummed snapshot.")
+        return [Reservation.from_trusted_dict(item) for item in data]
     return [Reservation.from_dict(item) for item in data]
@@ -0,0 +1,192 @@
+"""
+Rollups module.
+
+Materialized occupancy tables per location and date bucket (day or
+month). The tables are kept up to date from the hotel calendar
+and information listeners (so a relocated hotel's room-nights move
+with it), so dashboard queries read precomputed totals instead of
+scanning every hotel calendar.
+"""
+
+# pylint: disable=duplicate-code
+
+
+from datetime import date
+from typing import Dict, List, Optional, Tuple
+
+from source.hotel import (
+    Hotel,
+    add_calendar_listener,
+    add_info_listener,
+    remove_calendar_listener,
+    remove_info_listener,
+)
+
+GRANULARITIES = ("day", "month")
+
+
+def day_from_key(key: str) -> date:
+    """Return the date of a YYYY-DOY calendar key."""
+    year, doy = key.split("-")
+    return date.fromordinal(date(int(year), 1, 1).toordinal() + int(doy) - 1)
+
+
+def _next_month(day: date) -> date:
+    """Return the first day of the month after `day`."""
+    if day.month == 12:
+        return date(day.year + 1, 1, 1)
+    return date(day.year, day.month + 1, 1)
+
+
+class OccupancyRollup:
+    """Rooms sold and occupancy rate per location and date bucket."""
+
+    def __init__(self, hotels: List[Hotel], granularity: str = "month"):
+        """Build the tables from the hotels and start listening."""
+        if granularity not in GRANULARITIES:
+            raise ValueError("Granularity must be 'day' or 'month'.")
+        self.granularity = granularity
+        self._hotels: Dict[int, Tuple[Hotel, str, int]] = {}
+        self._sold: Dict[Tuple[str, str], int] = {}
+        self._capacity: Dict[str, int] = {}
+        self._buckets: Dict[str, str] = {}
+        self.rebuild(hotels)
+        add_calendar_listener(self._on_calendar_change)
+        add_info_listener(self._on_info_change)
+
+    def close(self) -> None:
+        """Stop listening to calendar and information changes."""
+        remove_calendar_listener(self._on_calendar_change)
+        remove_info_listener(self._on_info_change)
+
+    def add(self, hotel: Hotel) -> None:
+        """Start tracking a new hotel."""
+        if hotel.hotel_id in self._hotels:
+            raise ValueError("Hotel ID already exists.")
+        self._track(hotel)
+
+    def remove(self, hotel_id: int) -> None:
+        """Stop tracking a hotel and drop its room-nights."""
+        tracked = self._hotels.pop(hotel_id, None)
+        if tracked is None:
+            raise ValueError("Hotel not found.")
+        self._contribute(*tracked, sign=-1)
+
+    def rebuild(self, hotels: Optional[List[Hotel]] = None) -> None:
+        """
+        Recompute every table from the hotel calendars in one pass;
+        without arguments the currently tracked hotels are used.
+        """
+        if hotels is None:
+            hotels = [tracked[0] for tracked in self._hotels.values()]
+        self._hotels = {}
+        self._capacity = {}
+        self._sold = {}
+        for hotel in hotels:
+            self._track(hotel)
+
+    def rooms_sold(self, location: str, bucket: str) -> int:
+        """Return the room-nights sold in a location and bucket."""
+        return self._sold.get((location, bucket), 0)
+
+    def occupancy_rate(self, location: str, bucket: str) -> float:
+        """
+        Return sold room-nights divided by available room-nights
+        for a location and a YYYY-MM-DD or YYYY-MM bucket.
+        """
+        capacity = self._capacity.get(location, 0)
+        if capacity == 0:
+            return 0.0
+        if self.granularity == "day":
+            days = 1
+        else:
+            first = date.fromisoformat(bucket + "-01")
+            days = (_next_month(first) - first).days
+        return self.rooms_sold(location, bucket) / (capacity * days)
+
+    def table(self, location: Optional[str] = None) -> List[dict]:
+        """Return the rollup rows, optionally for a single location."""
+        return [
+            {
+                "location": cell[0],
+                "bucket": cell[1],
+                "rooms_sold": sold,
+                "occupancy_rate": self.occupancy_rate(cell[0], cell[1]),
+            }
+            for cell, sold in sorted(self._sold.items())
+            if sold and (location is None or cell[0] == location)
+        ]
+
+    def _track(self, hotel: Hotel) -> None:
+        """Record a hotel's location and capacity and add its days."""
+        tracked = (hotel, hotel.location, hotel.total_rooms)
+        self._hotels[hotel.hotel_id] = tracked
+        self._contribute(*tracked, sign=1)
+
+    def _contribute(
+            self,
+            hotel: Hotel,
+            location: str,
+            capacity: int,
+            sign: int
+            ) -> None:
+        """Add (sign 1) or remove (sign -1) a hotel from the tables."""
+        total = self._capacity.get(location, 0) + sign * capacity
+        if total:
+            self._capacity[location] = total
+        else:
+            self._capacity.pop(location, None)
+
+        for key, rooms in hotel.calendar().items():
+            bucket = self._buckets.get(key)
+            if bucket is None:
+                bucket = self._buckets[key] = \
+                    self._bucket(day_from_key(key))
+            cell = (location, bucket)
+            self._sold[cell] = self._sold.get(cell, 0) + sign * rooms
+
+    def _bucket(self, day: date) -> str:
+        """Return the bucket label of a day."""
+        if self.granularity == "day":
+            return day.isoformat()
+        return day.strftime("%Y-%m")
+
+    def _on_calendar_change(
+            self,
+            hotel: Hotel,
+            first: Optional[int],
+            last: Optional[int],
+            delta: int
+            ) -> None:
+        """Add a calendar change to the buckets it overlaps."""
+        tracked = self._hotels.get(hotel.hotel_id)
+        if tracked is None or tracked[0] is not hotel:
+            return
+        if first is None:
+            self.rebuild()
+            return
+
+        location = tracked[1]
+        start = date.fromordinal(first)
+        end = date.fromordinal(last)
+        while start <= end:
+            if self.granularity == "day":
+                bucket_end = start
+            else:
+                bucket_end = min(
+                    end, date.fromordinal(_next_month(start).toordinal() - 1)
+                )
+            cell = (location, self._bucket(start))
+            days = (bucket_end - start).days + 1
+            self._sold[cell] = self._sold.get(cell, 0) + delta * days
+            start = date.fromordinal(bucket_end.toordinal() + 1)
+
+    def _on_info_change(self, hotel: Hotel) -> None:
+        """Move a tracked hotel's room-nights to its new location."""
+        tracked = self._hotels.get(hotel.hotel_id)
+        if tracked is None or tracked[0] is not hotel:
+            return
+        if (hotel.location, hotel.total_rooms) == tracked[1:]:
+            return
+        self._contribute(*tracked, sign=-1)
+        self._track(hotel)
@@ -0,0 +1,149 @@
+"""
+Search module.
+
+Inverted index over hotel names and locations. Text is split into
+lowercase word tokens; every query token must match the start of a
+token of the hotel, so "mon" finds "Monterrey". The index follows
+hotel renames through the hotel information listener, and searches
+can be narrowed to hotels with rooms available for a date range.
+"""
+
+# pylint: disable=duplicate-code
+
+
+import re
+from bisect import bisect_left, insort
+from typing import Dict, List, Optional, Set
+
+from source.hotel import Hotel, add_info_listener, remove_info_listener
+
+_TOKEN_RE = re.compile(r"\w+")
+
+
+def tokenize(text: str) -> List[str]:
+    """Return the lowercase word tokens of a text."""
+    return _TOKEN_RE.findall(text.casefold())
+
+
+class HotelSearchIndex:
+    """Token index with prefix matching over hotel name and location."""
+
+    def __init__(self, hotels: Optional[List[Hotel]] = None):
+        """Index the hotels and start following hotel renames."""
+        self._hotels: Dict[int, Hotel] = {}
+        self._tokens_of: Dict[int, Set[str]] = {}
+        self._postings: Dict[str, Set[int]] = {}
+        self._sorted_tokens: List[str] = []
+        for hotel in hotels or []:
+            self.add(hotel)
+        add_info_listener(self._on_info_change)
+
+    def close(self) -> None:
+        """Stop following hotel renames."""
+        remove_info_listener(self._on_info_change)
+
+    def __enter__(self) -> "HotelSearchIndex":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        return len(self._hotels)
+
+    def add(self, hotel: Hotel) -> None:
+        """Index a new hotel."""
+        if hotel.hotel_id in self._hotels:
+            raise ValueError("Hotel ID already exists.")
+        self._hotels[hotel.hotel_id] = hotel
+        self._index_tokens(hotel)
+
+    def remove(self, hotel_id: int) -> None:
+        """Drop a hotel from the index."""
+        if self._hotels.pop(hotel_id, None) is None:
+            raise ValueError("Hotel not found.")
+        self._unindex_tokens(hotel_id)
+
+    def search(self, query: str) -> List[Hotel]:
+        """
+        Return the hotels, ordered by ID, where every token of the
+        query is a prefix of a token of the name or location. An
+        empty query matches every hotel.
+        """
+        matches: Optional[Set[int]] = None
+        for token in tokenize(query):
+            ids = self._prefix_ids(token)
+            matches = ids if matches is None else matches & ids
+            if not matches:
+                return []
+        if matches is None:
+            matches = set(self._hotels)
+        return [self._hotels[hotel_id] for hotel_id in sorted(matches)]
+
+    def search_available(
+            self,
+            query: str,
+            start_date: str,
+            end_date: str,
+            rooms_requested: int = 1,
+            availability=None
+            ) -> List[Hotel]:
+        """
+        Return the hotels matching the query that can take the rooms
+        for the date range. `availability` may be an AvailabilityCache;
+        without it each hotel calendar is checked directly.
+        """
+        result = []
+        for hotel in self.search(query):
+            if availability is None:
+                available = hotel.available_rooms_for_dates(
+                    start_date, end_date, rooms_requested
+                )
+            else:
+                available = availability.available_rooms_for_dates(
+                    hotel, start_date, end_date, rooms_requested
+                )
+            if available:
+                result.append(hotel)
+        return result
+
+    def _prefix_ids(self, prefix: str) -> Set[int]:
+        """Return the IDs of hotels with a token starting with prefix."""
+        ids: Set[int] = set()
+        position = bisect_left(self._sorted_tokens, prefix)
+        while position < len(self._sorted_tokens):
+            token = self._sorted_tokens[position]
+            if not token.startswith(prefix):
+                break
+            ids |= self._postings[token]
+            position += 1
+        return ids
+
+    def _index_tokens(self, hotel: Hotel) -> None:
+        """Add the postings of a hotel's current name and location."""
+        tokens = set(tokenize(hotel.name)) | set(tokenize(hotel.location))
+        self._tokens_of[hotel.hotel_id] = tokens
+        for token in tokens:
+            posting = self._postings.get(token)
+            if posting is None:
+                posting = self._postings[token] = set()
+                insort(self._sorted_tokens, token)
+            posting.add(hotel.hotel_id)
+
+    def _unindex_tokens(self, hotel_id: int) -> None:
+        """Remove the postings recorded for a hotel."""
+        for token in self._tokens_of.pop(hotel_id, ()):
+            posting = self._postings[token]
+            posting.discard(hotel_id)
+            if not posting:
+                del self._postings[token]
+                del self._sorted_tokens[
+                    bisect_left(self._sorted_tokens, token)
+                ]
+
+    def _on_info_change(self, hotel: Hotel) -> None:
+        """Reindex a tracked hotel after its name or location changed."""
+        if self._hotels.get(hotel.hotel_id) is not hotel:
+            return
+        self._unindex_tokens(hotel.hotel_id)
+        self._index_tokens(hotel)
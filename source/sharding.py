@@ -0,0 +1,380 @@
+"""
+Sharding module.
+
+Runs bookings in several worker processes, each owning a disjoint
+set of hotels (chosen by hotel ID) with their calendars and
+reservations. A ShardedRuntime routes create, cancel and search
+requests to the owning worker over a pipe, in batches, and merges
+the answers of cross-hotel searches. Hotels are independent, so
+workers apply bookings in parallel while requests for one hotel
+keep their order.
+
+Workers are started with the "spawn" method so they do not inherit
+the event publisher, metrics or listeners of the router process.
+While a runtime is open the workers own the state; collect() brings
+hotels and reservations back, e.g. to save them.
+
+Benchmark: python -m source.sharding --operations 50000 --shards 1 2 4
+"""
+
+# pylint: disable=duplicate-code
+
+
+import argparse
+import json
+import multiprocessing
+import time
+from typing import Dict, List, Optional, Tuple
+
+from source.customer import Customer
+from source.dates import ordinal_range
+from source.hotel import Hotel
+from source.menu import book_reservation, find_hotel, release_reservation
+from source.reservation import Reservation
+from source.workload import (
+    WorkloadProfile,
+    check_consistency,
+    generate_trace,
+)
+
+Result = Tuple[bool, object]
+
+REQUEST_FIELDS = {
+    "create": ("reservation_id", "hotel_id", "customer_id", "start_date",
+               "end_date", "rooms"),
+    "cancel": ("reservation_id",),
+    "search": ("hotel_id", "start_date", "end_date", "rooms"),
+    "search_all": ("start_date", "end_date", "rooms"),
+}
+
+
+def shard_of(hotel_id: int, shards: int) -> int:
+    """Return the shard that owns a hotel."""
+    return hotel_id % shards
+
+
+def _handle(
+        request: dict,
+        hotels: List[Hotel],
+        customers: List[Customer],
+        reservations: List[Reservation]
+        ) -> object:
+    """Apply one request to a worker's state and return its value."""
+    name = request["op"]
+    if name == "create":
+        book_reservation(hotels, customers, reservations, Reservation(
+            reservation_id=request["reservation_id"],
+            hotel_id=request["hotel_id"],
+            customer_id=request["customer_id"],
+            start_date=request["start_date"],
+            end_date=request["end_date"],
+            rooms_reserved=request["rooms"],
+        ))
+        return request["reservation_id"]
+    if name == "cancel":
+        release_reservation(hotels, reservations, request["reservation_id"])
+        return request["reservation_id"]
+    if name == "search":
+        hotel = find_hotel(hotels, request["hotel_id"])
+        if hotel is None:
+            raise ValueError("Hotel not found.")
+        return hotel.available_rooms_for_dates(
+            request["start_date"], request["end_date"], request["rooms"]
+        )
+    if name == "search_all":
+        # Validate even without hotels, so every shard answers alike.
+        first, last = ordinal_range(request["start_date"], request["end_date"])
+        if request["rooms"] <= 0:
+            raise ValueError("Rooms requested must be at least 1.")
+        return [
+            hotel.hotel_id for hotel in hotels
+            if hotel.available_rooms_for_dates(first, last, request["rooms"])
+        ]
+    if name == "collect":
+        return {
+            "hotels": [hotel.to_dict() for hotel in hotels],
+            "reservations": [item.to_dict() for item in reservations],
+        }
+    raise ValueError(f"Unknown operation: {name}.")
+
+
+def _serve(connection, hotel_data: List[dict], customer_data: List[dict]):
+    """Worker loop: answer request batches until None is received."""
+    hotels = [Hotel.from_dict(item) for item in hotel_data]
+    customers = [Customer.from_dict(item) for item in customer_data]
+    reservations: List[Reservation] = []
+
+    while True:
+        batch = connection.recv()
+        if batch is None:
+            break
+        results: List[Result] = []
+        for request in batch:
+            try:
+                results.append(
+                    (True, _handle(request, hotels, customers, reservations))
+                )
+            # A bad request must not kill the worker and its shard.
+            except Exception as exc:  # pylint: disable=broad-exception-caught
+                results.append((False, str(exc)))
+        connection.send(results)
+    connection.close()
+
+
+class ShardedRuntime:
+    """Routes booking requests to hotel-partitioned worker processes."""
+
+    def __init__(
+            self,
+            hotels: List[Hotel],
+            customers: List[Customer],
+            shards: Optional[int] = None,
+            batch_size: int = 256
+            ):
+        """Partition the hotels and start one worker per shard."""
+        if batch_size <= 0:
+            raise ValueError("Batch size must be at least 1.")
+        self.shards = shards or multiprocessing.cpu_count()
+        if self.shards <= 0:
+            raise ValueError("Shards must be at least 1.")
+        self.batch_size = batch_size
+        self._hotel_shard = {
+            hotel.hotel_id: shard_of(hotel.hotel_id, self.shards)
+            for hotel in hotels
+        }
+        self._reservation_shard: Dict[int, int] = {}
+
+        context = multiprocessing.get_context("spawn")
+        customer_data = [customer.to_dict() for customer in customers]
+        self._connections = []
+        self._processes = []
+        for shard in range(self.shards):
+            parent, child = context.Pipe()
+            process = context.Process(
+                target=_serve,
+                args=(child, [
+                    hotel.to_dict() for hotel in hotels
+                    if self._hotel_shard[hotel.hotel_id] == shard
+                ], customer_data),
+                daemon=True,
+            )
+            process.start()
+            child.close()
+            self._connections.append(parent)
+            self._processes.append(process)
+
+    def __enter__(self) -> "ShardedRuntime":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Stop the workers, including any that already died."""
+        for connection in self._connections:
+            try:
+                connection.send(None)
+            except OSError:
+                pass
+            connection.close()
+        for process in self._processes:
+            process.join()
+        self._connections = []
+        self._processes = []
+
+    def execute(self, requests: List[dict]) -> List[Result]:
+        """
+        Run requests shaped like workload trace operations (create,
+        cancel, search, plus search_all for every hotel) and return an
+        (ok, value) pair per request, where value is the error message
+        of a rejected request. search_all returns sorted hotel IDs.
+        """
+        results: List[Optional[Result]] = [None] * len(requests)
+        queues: List[List[Tuple[int, dict]]] = [[] for _ in self._connections]
+        pending: Dict[int, int] = {}
+        for position, request in enumerate(requests):
+            try:
+                targets = self._route(request, pending)
+                if targets is None:
+                    # Ownership of the ID depends on queued outcomes.
+                    self._drain(queues, results, requests)
+                    pending.clear()
+                    targets = self._route(request, pending) or []
+            except (ValueError, TypeError) as exc:
+                results[position] = (False, str(exc))
+                continue
+            for shard in targets:
+                queues[shard].append((position, request))
+
+        self._drain(queues, results, requests)
+        return results
+
+    def collect(self) -> Tuple[List[Hotel], List[Reservation]]:
+        """Return copies of every worker's hotels and reservations."""
+        hotels: List[Hotel] = []
+        reservations: List[Reservation] = []
+        for connection in self._connections:
+            connection.send([{"op": "collect"}])
+        for connection in self._connections:
+            state = connection.recv()[0][1]
+            hotels.extend(Hotel.from_dict(item) for item in state["hotels"])
+            reservations.extend(
+                Reservation.from_dict(item) for item in state["reservations"]
+            )
+        hotels.sort(key=lambda hotel: hotel.hotel_id)
+        return hotels, reservations
+
+    def _route(
+            self,
+            request: dict,
+            pending: Dict[int, int]
+            ) -> Optional[List[int]]:
+        """
+        Return the shards a request goes to, or None if that depends
+        on the outcome of queued requests. `pending` maps the IDs of
+        queued creates and cancels to the shard they were sent to.
+        """
+        name = request.get("op")
+        if name not in REQUEST_FIELDS:
+            raise ValueError(f"Unknown operation: {name}.")
+        for field in REQUEST_FIELDS[name]:
+            if field not in request:
+                raise ValueError(f"Missing request field: {field}.")
+        if name == "search_all":
+            return list(range(self.shards))
+        if name == "cancel":
+            reservation_id = request["reservation_id"]
+            shard = pending.get(
+                reservation_id, self._reservation_shard.get(reservation_id)
+            )
+            if shard is None:
+                raise ValueError("Reservation not found.")
+            pending[reservation_id] = shard
+            return [shard]
+
+        shard = self._hotel_shard.get(request["hotel_id"])
+        if shard is None:
+            raise ValueError("Hotel not found.")
+        if name == "create":
+            reservation_id = request["reservation_id"]
+            if pending.get(reservation_id, shard) != shard:
+                return None
+            owner = self._reservation_shard.get(reservation_id, shard)
+            if owner != shard:
+                raise ValueError("Reservation ID already exists.")
+            pending[reservation_id] = shard
+        return [shard]
+
+    def _drain(
+            self,
+            queues: List[List[Tuple[int, dict]]],
+            results: List[Optional[Result]],
+            requests: List[dict]
+            ) -> None:
+        """
+        Run the queued requests, empty the queues and record which
+        shard holds each reservation they created or cancelled.
+        """
+        positions = sorted(
+            {position for queue in queues for position, _ in queue}
+        )
+        self._run_batches(queues, results)
+        for queue in queues:
+            queue.clear()
+        for position in positions:
+            request, (ok, value) = requests[position], results[position]
+            if not ok:
+                continue
+            if request["op"] == "search_all":
+                value.sort()
+            elif request["op"] == "create":
+                self._reservation_shard[request["reservation_id"]] = \
+                    self._hotel_shard[request["hotel_id"]]
+            elif request["op"] == "cancel":
+                self._reservation_shard.pop(request["reservation_id"], None)
+
+    def _run_batches(
+            self,
+            queues: List[List[Tuple[int, dict]]],
+            results: List[Optional[Result]]
+            ) -> None:
+        """
+        Send every shard its next batch, then gather the answers, until
+        all queues are drained. Shards work on their batches in parallel.
+        """
+        offset = 0
+        while any(len(queue) > offset for queue in queues):
+            sent = []
+            for shard, queue in enumerate(queues):
+                batch = queue[offset:offset + self.batch_size]
+                if batch:
+                    self._connections[shard].send(
+                        [request for _, request in batch]
+                    )
+                    sent.append((shard, batch))
+            for shard, batch in sent:
+                answers = self._connections[shard].recv()
+                for (position, request), answer in zip(batch, answers):
+                    if request["op"] == "search_all" and answer[0] \
+                            and results[position] is not None:
+                        results[position][1].extend(answer[1])
+                    else:
+                        results[position] = answer
+            offset += self.batch_size
+
+
+def benchmark(
+        trace: dict,
+        shard_counts: List[int],
+        batch_size: int = 256
+        ) -> dict:
+    """
+    Replay the operations of a workload trace through runtimes with
+    each shard count and report throughput and outcome counts.
+    """
+    hotels = [Hotel.from_dict(item) for item in trace["hotels"]]
+    customers = [Customer.from_dict(item) for item in trace["customers"]]
+    operations = trace["operations"]
+
+    runs = []
+    for shards in shard_counts:
+        with ShardedRuntime(hotels, customers, shards, batch_size) as runtime:
+            started = time.perf_counter()
+            results = runtime.execute(operations)
+            elapsed = time.perf_counter() - started
+            final_hotels, reservations = runtime.collect()
+        runs.append({
+            "shards": shards,
+            "elapsed_s": elapsed,
+            "throughput_ops_s": len(operations) / elapsed if elapsed else 0.0,
+            "ok": sum(1 for ok, _ in results if ok),
+            "rejected": sum(1 for ok, _ in results if not ok),
+            "consistency": check_consistency(final_hotels, reservations),
+        })
+    return {
+        "operations": len(operations),
+        "cpu_count": multiprocessing.cpu_count(),
+        "runs": runs,
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """Command line entry point: benchmark shard counts on a trace."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--operations", type=int, default=50000)
+    parser.add_argument("--hotels", type=int, default=64)
+    parser.add_argument("--shards", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument("--batch-size", type=int, default=256)
+    args = parser.parse_args(argv)
+
+    trace = generate_trace(
+        args.seed, args.operations, WorkloadProfile(hotels=args.hotels)
+    )
+    print(json.dumps(
+        benchmark(trace, args.shards, args.batch_size), indent=2
+    ))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,354 @@
+"""
+Shared occupancy module.
+
+Publishes the booked rooms of every hotel over a window of days as
+a hotels x days matrix in a multiprocessing.shared_memory block, so
+search worker processes can scan availability without loading their
+own copy of hotels.json. A single OccupancyWriter, living in the
+process that applies calendar changes, keeps the matrix up to date
+through the hotel calendar batch listener. Readers attach by block
+name, from any process.
+
+Consistency uses a seqlock: the writer makes the sequence number
+odd before touching the matrix and even again afterwards, and a
+reader retries whenever the sequence was odd or changed while it
+was reading. All segments of one calendar change are written under
+one sequence bump, so readers never see a change half-applied.
+
+Block layout: a header (sequence, first day ordinal, hotel count,
+day count), the hotel IDs, the hotel capacities and the matrix,
+one row of 32-bit counts per hotel.
+"""
+
+# pylint: disable=duplicate-code
+
+
+import multiprocessing
+import struct
+import time
+from array import array
+from multiprocessing import resource_tracker
+from multiprocessing.shared_memory import SharedMemory
+from typing import Dict, List, Optional, Tuple
+
+from source.dates import as_ordinal, calendar_key_for, ordinal_range
+from source.hotel import (
+    DateLike,
+    Hotel,
+    add_calendar_batch_listener,
+    remove_calendar_batch_listener,
+)
+
+_HEADER = struct.Struct("<QqII")
+_SEQUENCE = struct.Struct("<Q")
+
+
+def _padded(size: int) -> int:
+    """Round a byte size up to a multiple of 8."""
+    return (size + 7) // 8 * 8
+
+
+def block_size(hotels: int, days: int) -> int:
+    """Return the bytes needed for a matrix of hotels x days."""
+    return (
+        _HEADER.size + 8 * hotels + _padded(4 * hotels) + 4 * hotels * days
+    )
+
+
+class _OccupancyBlock:  # pylint: disable=too-many-instance-attributes
+    """Typed views over a shared occupancy block."""
+
+    def __init__(self, shm: SharedMemory):
+        """Map the views of an initialized block."""
+        self._shm = shm
+        _, self.first_day, self.hotels, self.days = \
+            _HEADER.unpack_from(shm.buf)
+        offset = _HEADER.size
+        self._ids = shm.buf[offset:offset + 8 * self.hotels].cast("q")
+        offset += 8 * self.hotels
+        self._capacity = shm.buf[offset:offset + 4 * self.hotels].cast("i")
+        offset += _padded(4 * self.hotels)
+        self._cells = shm.buf[
+            offset:offset + 4 * self.hotels * self.days
+        ].cast("i")
+        self._rows: Dict[int, int] = {
+            hotel_id: row for row, hotel_id in enumerate(self._ids)
+        }
+
+    @property
+    def name(self) -> str:
+        """Name other processes use to attach to the block."""
+        return self._shm.name
+
+    @property
+    def last_day(self) -> int:
+        """Ordinal of the last day covered by the matrix."""
+        return self.first_day + self.days - 1
+
+    def sequence(self) -> int:
+        """Return the current seqlock sequence number."""
+        return _SEQUENCE.unpack_from(self._shm.buf)[0]
+
+    def hotel_ids(self) -> List[int]:
+        """Return the hotel IDs in matrix row order."""
+        return self._ids.tolist()
+
+    def _window(self, start_date: DateLike, end_date: DateLike) -> tuple:
+        """Return the column span of a date range inside the window."""
+        first, last = ordinal_range(start_date, end_date)
+        if first < self.first_day or last > self.last_day:
+            raise ValueError("Date range is outside the shared window.")
+        return first - self.first_day, last - self.first_day + 1
+
+    def _release(self) -> None:
+        """Release the views so the block can be closed."""
+        for view in (self._ids, self._capacity, self._cells):
+            view.release()
+        self._shm.close()
+
+
+class OccupancyWriter(_OccupancyBlock):
+    """
+    Creates the shared block for a list of hotels and a window of
+    days, and mirrors every calendar change of those hotels into it.
+    There must be a single writer per block.
+    """
+
+    def __init__(
+            self,
+            hotels: List[Hotel],
+            start_date: DateLike,
+            days: int,
+            name: Optional[str] = None
+            ):
+        """Create and fill the block, then start listening."""
+        if days <= 0:
+            raise ValueError("Days must be at least 1.")
+        if len({hotel.hotel_id for hotel in hotels}) != len(hotels):
+            raise ValueError("Hotel IDs must be unique.")
+
+        shm = SharedMemory(
+            name=name, create=True, size=max(block_size(len(hotels), days), 1)
+        )
+        _HEADER.pack_into(shm.buf, 0, 0, as_ordinal(start_date),
+                          len(hotels), days)
+        super().__init__(shm)
+        self._rows = {}
+        for row, hotel in enumerate(hotels):
+            self._ids[row] = hotel.hotel_id
+            self._capacity[row] = hotel.total_rooms
+            self._rows[hotel.hotel_id] = row
+        self._hotels: Dict[int, Hotel] = {
+            hotel.hotel_id: hotel for hotel in hotels
+        }
+        for hotel in hotels:
+            self.refresh(hotel)
+        add_calendar_batch_listener(self._on_calendar_change)
+
+    def __enter__(self) -> "OccupancyWriter":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Stop listening, then close and remove the block."""
+        remove_calendar_batch_listener(self._on_calendar_change)
+        self._release()
+        # A reader sharing this process's resource tracker may have
+        # unregistered the block (see OccupancyReader); register it
+        # again so unlink's unregister finds it.
+        # pylint: disable-next=protected-access
+        resource_tracker.register(self._shm._name, "shared_memory")
+        self._shm.unlink()
+
+    def refresh(self, hotel: Hotel) -> None:
+        """Rewrite the row of a hotel from its calendar."""
+        calendar = hotel.calendar()
+        start = self._rows[hotel.hotel_id] * self.days
+        values = array("i", (
+            calendar.get(calendar_key_for(self.first_day + offset), 0)
+            for offset in range(self.days)
+        ))
+        self._begin_write()
+        try:
+            self._cells[start:start + self.days] = values
+        finally:
+            self._end_write()
+
+    def _begin_write(self) -> None:
+        """Make the sequence odd: readers will retry."""
+        _SEQUENCE.pack_into(self._shm.buf, 0, self.sequence() + 1)
+
+    def _end_write(self) -> None:
+        """Make the sequence even again: the matrix is consistent."""
+        _SEQUENCE.pack_into(self._shm.buf, 0, self.sequence() + 1)
+
+    def _on_calendar_change(self, hotel: Hotel, segments: list) -> None:
+        """
+        Apply the segments of one calendar change of a tracked hotel
+        to its row, inside a single seqlock write.
+        """
+        if self._hotels.get(hotel.hotel_id) is not hotel:
+            return
+        if any(first is None for first, _, _ in segments):
+            self.refresh(hotel)
+            return
+
+        row = self._rows[hotel.hotel_id] * self.days
+        spans = []
+        for first, last, delta in segments:
+            start = max(first, self.first_day) - self.first_day
+            stop = min(last, self.last_day) - self.first_day + 1
+            if start < stop:
+                spans.append((row + start, row + stop, delta))
+        if not spans:
+            return
+        self._begin_write()
+        try:
+            for start, stop, delta in spans:
+                for column in range(start, stop):
+                    self._cells[column] += delta
+        finally:
+            self._end_write()
+
+
+class OccupancyReader(_OccupancyBlock):
+    """Read-only, zero-copy view of a block created by a writer."""
+
+    def __init__(self, name: str, spin_sleep: float = 0.0):
+        """Attach to the block with the given name."""
+        try:
+            shm = SharedMemory(  # pylint: disable=unexpected-keyword-arg
+                name=name, track=False
+            )
+        except TypeError:
+            # Python < 3.13 has no track flag and registers the block
+            # with this process's resource tracker, which would unlink
+            # it when this process exits. Only the writer owns it.
+            shm = SharedMemory(name=name)
+            # pylint: disable-next=protected-access
+            resource_tracker.unregister(shm._name, "shared_memory")
+        super().__init__(shm)
+        self.spin_sleep = spin_sleep
+        self.retries = 0
+
+    def __enter__(self) -> "OccupancyReader":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Detach from the block."""
+        self._release()
+
+    def available(
+            self,
+            hotel_id: int,
+            start_date: DateLike,
+            end_date: DateLike,
+            rooms_requested: int = 1
+            ) -> bool:
+        """Return True if the hotel has the rooms on every day."""
+        row = self._rows.get(hotel_id)
+        if row is None:
+            raise ValueError("Hotel not found.")
+        return bool(self.search(
+            start_date, end_date, rooms_requested, (row, row + 1)
+        ))
+
+    def search(
+            self,
+            start_date: DateLike,
+            end_date: DateLike,
+            rooms_requested: int = 1,
+            rows: Optional[Tuple[int, int]] = None
+            ) -> List[int]:
+        """
+        Return the IDs of the hotels, in row order, that have the rooms
+        on every day of the range. `rows` limits the scan to a
+        (start, stop) slice of matrix rows.
+        """
+        if rooms_requested <= 0:
+            raise ValueError("Rooms requested must be at least 1.")
+        start, stop = self._window(start_date, end_date)
+        first_row, last_row = rows if rows is not None else (0, self.hotels)
+
+        while True:
+            before = self.sequence()
+            if before % 2 == 0:
+                found = [
+                    self._ids[row] for row in range(first_row, last_row)
+                    if max(self._cells[row * self.days + start:
+                                       row * self.days + stop])
+                    + rooms_requested <= self._capacity[row]
+                ]
+                if self.sequence() == before:
+                    return found
+            self.retries += 1
+            time.sleep(self.spin_sleep)
+
+
+_WORKER: Dict[str, OccupancyReader] = {}
+
+
+def _attach_worker(name: str) -> None:
+    """Pool initializer: attach the worker process to the block."""
+    _WORKER["reader"] = OccupancyReader(name)
+
+
+def _search_rows(task: tuple) -> List[int]:
+    """Run a search over a slice of rows in a worker process."""
+    start_date, end_date, rooms_requested, rows = task
+    return _WORKER["reader"].search(
+        start_date, end_date, rooms_requested, rows
+    )
+
+
+class SearchPool:
+    """Pool of read-only worker processes scanning a shared block."""
+
+    def __init__(self, name: str, processes: Optional[int] = None):
+        """Start the workers and attach each one to the block."""
+        with OccupancyReader(name) as reader:
+            self.hotels = reader.hotels
+        self.processes = processes or multiprocessing.cpu_count()
+        # The pool lives until close(), like the block itself.
+        # pylint: disable-next=consider-using-with
+        self._pool = multiprocessing.Pool(
+            self.processes, _attach_worker, (name,)
+        )
+
+    def __enter__(self) -> "SearchPool":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Stop the workers."""
+        self._pool.close()
+        self._pool.join()
+
+    def search(
+            self,
+            start_date: DateLike,
+            end_date: DateLike,
+            rooms_requested: int = 1
+            ) -> List[int]:
+        """
+        Return the IDs of the hotels with the rooms available on every
+        day, splitting the rows evenly across the workers.
+        """
+        step = max(-(-self.hotels // self.processes), 1)
+        tasks = [
+            (start_date, end_date, rooms_requested,
+             (row, min(row + step, self.hotels)))
+            for row in range(0, self.hotels, step)
+        ]
+        return [
+            hotel_id
+            for found in self._pool.map(_search_rows, tasks)
+            for hotel_id in found
+        ]
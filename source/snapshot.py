@@ -0,0 +1,105 @@
+"""
+Snapshot module.
+
+Point-in-time views of hotel calendars and reservations for
+long-running reports. Calendars are shared copy-on-write with the
+live hotels, so taking a snapshot copies no calendar data and
+bookings made afterwards do not change what the report reads.
+"""
+
+# pylint: disable=duplicate-code
+
+
+import time
+from typing import Dict, List, Mapping, Optional, Tuple
+
+from source.hotel import Hotel
+from source.reservation import Reservation
+
+
+class HotelSnapshot:  # pylint: disable=too-few-public-methods
+    """Frozen hotel attributes and calendar at snapshot time."""
+
+    def __init__(self, hotel: Hotel):
+        """Capture the hotel attributes and share its calendar."""
+        self.hotel_id = hotel.hotel_id
+        self.name = hotel.name
+        self.location = hotel.location
+        self.total_rooms = hotel.total_rooms
+        self.version = hotel.calendar_version
+        self.calendar: Mapping[str, int] = hotel.freeze_calendar()
+
+    def to_dict(self) -> dict:
+        """Return a JSON-serializable representation of the snapshot."""
+        return {
+            "hotel_id": self.hotel_id,
+            "name": self.name,
+            "location": self.location,
+            "total_rooms": self.total_rooms,
+            "calendar": dict(self.calendar),
+        }
+
+
+class SystemSnapshot:
+    """
+    Consistent view of every hotel calendar and the reservation set.
+
+    Reservations are kept by reference; the system replaces
+    Reservation objects instead of mutating them, so the tuple
+    stays valid for the lifetime of the snapshot.
+    """
+
+    def __init__(
+            self,
+            hotels: List[Hotel],
+            reservations: List[Reservation]
+            ):
+        """Capture the hotels and reservations."""
+        self.taken_at = time.time()
+        self.hotels: Dict[int, HotelSnapshot] = {
+            hotel.hotel_id: HotelSnapshot(hotel) for hotel in hotels
+        }
+        self.reservations: Tuple[Reservation, ...] = tuple(reservations)
+
+    def versions(self) -> Dict[int, int]:
+        """Return the calendar version of each hotel at snapshot time."""
+        return {
+            hotel_id: hotel.version for hotel_id, hotel in self.hotels.items()
+        }
+
+    def booked_rooms(self, hotel_id: int, day_key: str) -> int:
+        """Return the rooms booked on a YYYY-DOY day at snapshot time."""
+        hotel = self.hotels.get(hotel_id)
+        if hotel is None:
+            raise ValueError("Hotel not found.")
+        return hotel.calendar.get(day_key, 0)
+
+    def reservations_for(
+            self,
+            hotel_id: Optional[int] = None
+            ) -> List[Reservation]:
+        """Return the snapshot reservations, optionally of one hotel."""
+        if hotel_id is None:
+            return list(self.reservations)
+        return [
+            reservation for reservation in self.reservations
+            if reservation.hotel_id == hotel_id
+        ]
+
+    def to_dict(self) -> dict:
+        """Return a JSON-serializable representation of the snapshot."""
+        return {
+            "taken_at": self.taken_at,
+            "hotels": [hotel.to_dict() for hotel in self.hotels.values()],
+            "reservations": [
+                reservation.to_dict() for reservation in self.reservations
+            ],
+        }
+
+
+def take_snapshot(
+        hotels: List[Hotel],
+        reservations: List[Reservation]
+        ) -> SystemSnapshot:
+    """Return a point-in-time snapshot of hotels and reservations."""
+    return SystemSnapshot(hotels, reservations)
@@ -0,0 +1,196 @@
+"""
+Storage module.
+
+Versioned, checksummed snapshot format shared by the hotel, customer
+and reservation files. A snapshot has three lines: a header with the
+format, schema version and record kind, the records as one compact
+JSON array, and a trailer with the record count and the SHA-256 of
+the array. Snapshots may be gzip or lzma compressed and are written
+to a temporary file that is fsynced and renamed over the target, so
+a crash never leaves a half-written file behind. Files holding a
+plain JSON array (the original format) are still readable, but carry
+no checksum.
+"""
+
+# pylint: disable=duplicate-code
+
+
+import gzip
+import hashlib
+import json
+import lzma
+import os
+import tempfile
+from typing import Iterable, List, Optional, Tuple
+
+SNAPSHOT_FORMAT = "a62-snapshot"
+SCHEMA_VERSION = 1
+COMPRESSION_ENV = "A62_SNAPSHOT_COMPRESSION"
+COMPRESSIONS = (None, "gzip", "lzma")
+
+_CHUNK_RECORDS = 1000
+_GZIP_MAGIC = b"\x1f\x8b"
+_LZMA_MAGIC = b"\xfd7zXZ\x00"
+
+
+class CorruptSnapshotError(ValueError):
+    """Raised when a data file cannot be read back intact."""
+
+
+def default_compression() -> Optional[str]:
+    """Return the compression named by A62_SNAPSHOT_COMPRESSION."""
+    value = os.environ.get(COMPRESSION_ENV, "").strip().lower()
+    return value if value in ("gzip", "lzma") else None
+
+
+def _open_compressed(file_obj, compression: Optional[str]):
+    """Wrap a binary file object in the requested compressor."""
+    if compression == "gzip":
+        return gzip.GzipFile(fileobj=file_obj, mode="wb")
+    if compression == "lzma":
+        return lzma.LZMAFile(file_obj, mode="wb")
+    return file_obj
+
+
+def _fsync_directory(directory: str) -> None:
+    """Persist a rename on platforms that allow opening directories."""
+    if not hasattr(os, "O_DIRECTORY"):
+        return
+    fd = os.open(directory, os.O_RDONLY | os.O_DIRECTORY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+def _write_stream(
+        stream,
+        kind: str,
+        records: Iterable[dict]
+        ) -> str:
+    """Stream a snapshot into a binary stream; return the checksum."""
+    header = {
+        "format": SNAPSHOT_FORMAT,
+        "schema_version": SCHEMA_VERSION,
+        "kind": kind,
+    }
+    stream.write(json.dumps(header).encode("utf-8") + b"\n")
+
+    digest = hashlib.sha256()
+    count = 0
+    chunk: List[str] = []
+    separator = ""
+    stream.write(b"[")
+    digest.update(b"[")
+    for record in records:
+        chunk.append(separator + json.dumps(record, separators=(",", ":")))
+        separator = ","
+        count += 1
+        if len(chunk) >= _CHUNK_RECORDS:
+            data = "".join(chunk).encode("utf-8")
+            stream.write(data)
+            digest.update(data)
+            chunk = []
+    data = ("".join(chunk) + "]").encode("utf-8")
+    stream.write(data + b"\n")
+    digest.update(data)
+
+    checksum = digest.hexdigest()
+    trailer = {"count": count, "sha256": checksum}
+    stream.write(json.dumps(trailer).encode("utf-8") + b"\n")
+    return checksum
+
+
+def write_records(
+        file_path: str,
+        kind: str,
+        records: Iterable[dict],
+        compression: Optional[str] = None
+        ) -> str:
+    """
+    Atomically write records as a snapshot file and return their
+    checksum. `compression` may be None, "gzip" or "lzma"; when it is
+    None the A62_SNAPSHOT_COMPRESSION environment variable is used.
+    """
+    compression = compression or default_compression()
+    if compression not in COMPRESSIONS:
+        raise ValueError(f"Unknown compression: {compression}.")
+
+    directory = os.path.dirname(os.path.abspath(file_path))
+    fd, temp_path = tempfile.mkstemp(
+        dir=directory, prefix=f".{os.path.basename(file_path)}.",
+        suffix=".tmp",
+    )
+    try:
+        with os.fdopen(fd, "wb") as file:
+            stream = _open_compressed(file, compression)
+            checksum = _write_stream(stream, kind, records)
+            if stream is not file:
+                stream.close()
+            file.flush()
+            os.fsync(file.fileno())
+        os.replace(temp_path, file_path)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+    _fsync_directory(directory)
+    return checksum
+
+
+def _decompress(data: bytes) -> bytes:
+    """Return the uncompressed content of a data file."""
+    try:
+        if data.startswith(_GZIP_MAGIC):
+            return gzip.decompress(data)
+        if data.startswith(_LZMA_MAGIC):
+            return lzma.decompress(data)
+    except (OSError, EOFError, lzma.LZMAError) as exc:
+        raise CorruptSnapshotError(
+            "Compressed snapshot is truncated or corrupted."
+        ) from exc
+    return data
+
+
+def read_records(file_path: str, kind: str) -> Tuple[List[dict], bool]:
+    """
+    Read the records of a snapshot or legacy JSON array file.
+
+    Returns the records and whether they were verified against a
+    checksum (True for snapshots, False for legacy files). Raises
+    CorruptSnapshotError if the file is not valid JSON, is truncated,
+    has the wrong kind or an unknown schema version, or does not match
+    its checksum. FileNotFoundError is left to the caller.
+    """
+    with open(file_path, "rb") as file:
+        data = _decompress(file.read())
+
+    try:
+        if data.lstrip()[:1] != b"{":
+            return json.loads(data), False
+
+        header_line, _, rest = data.partition(b"\n")
+        body, _, trailer_line = rest.rstrip(b"\n").rpartition(b"\n")
+        header = json.loads(header_line)
+        trailer = json.loads(trailer_line) if body else {}
+    except (json.JSONDecodeError, UnicodeDecodeError) as exc:
+        raise CorruptSnapshotError(
+            f"Cannot parse {file_path}: {exc}."
+        ) from exc
+
+    if header.get("format") != SNAPSHOT_FORMAT or header.get("kind") != kind:
+        raise CorruptSnapshotError(f"Not a {kind} snapshot file.")
+    if header.get("schema_version") != SCHEMA_VERSION:
+        raise CorruptSnapshotError(
+            f"Unsupported schema version: {header.get('schema_version')}."
+        )
+    if not isinstance(trailer, dict) \
+            or hashlib.sha256(body).hexdigest() != trailer.get("sha256"):
+        raise CorruptSnapshotError(
+            "Snapshot checksum mismatch; file is truncated or corrupted."
+        )
+
+    records = json.loads(body)
+    if len(records) != trailer.get("count"):
+        raise CorruptSnapshotError("Snapshot record count mismatch.")
+    return records, True
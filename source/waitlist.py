@@ -0,0 +1,170 @@
+"""
+Waitlist module.
+
+Holds reservation requests that did not fit when they were made.
+Requests are indexed by hotel and by week buckets of their date
+range, so a cancellation only looks at the requests that overlap
+the days it freed. Candidates are returned oldest first.
+"""
+
+# pylint: disable=duplicate-code
+
+
+from typing import Dict, List, Optional, Set
+
+from source.metrics import instrument
+from source.reservation import Reservation
+from source.storage import read_records, write_records
+
+BUCKET_DAYS = 7
+
+
+class WaitlistEntry:  # pylint: disable=too-few-public-methods
+    """A reservation request waiting for capacity."""
+
+    def __init__(self, sequence: int, reservation: Reservation):
+        """Initialize an entry; the sequence number sets its priority."""
+        self.sequence = sequence
+        self.reservation = reservation
+        self.first = reservation.start_ordinal
+        self.last = reservation.end_ordinal
+
+    def to_dict(self) -> dict:
+        """Return a JSON-serializable representation of the entry."""
+        return {"sequence": self.sequence, **self.reservation.to_dict()}
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "WaitlistEntry":
+        """Create a WaitlistEntry instance from a dictionary."""
+        return cls(int(data["sequence"]), Reservation.from_dict(data))
+
+
+class Waitlist:
+    """Waiting reservation requests indexed by hotel and date interval."""
+
+    def __init__(self):
+        """Initialize an empty waitlist."""
+        self._entries: Dict[int, WaitlistEntry] = {}
+        self._by_reservation: Dict[int, int] = {}
+        self._index: Dict[int, Dict[int, Set[int]]] = {}
+        self._next_sequence = 1
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def add(self, reservation: Reservation) -> WaitlistEntry:
+        """Queue a reservation request at the end of the waitlist."""
+        return self.insert(WaitlistEntry(self._next_sequence, reservation))
+
+    def remove(self, reservation_id: int) -> Reservation:
+        """Remove a waiting request by reservation ID and return it."""
+        sequence = self._by_reservation.pop(reservation_id, None)
+        if sequence is None:
+            raise ValueError("Reservation not found in waitlist.")
+
+        entry = self._entries.pop(sequence)
+        buckets = self._index[entry.reservation.hotel_id]
+        for bucket in range(entry.first // BUCKET_DAYS,
+                            entry.last // BUCKET_DAYS + 1):
+            buckets[bucket].discard(sequence)
+            if not buckets[bucket]:
+                del buckets[bucket]
+        return entry.reservation
+
+    def purge(
+            self,
+            hotel_id: Optional[int] = None,
+            customer_id: Optional[int] = None
+            ) -> List[Reservation]:
+        """
+        Remove and return the waiting requests of a hotel and/or a
+        customer, e.g. when either is deleted.
+        """
+        purged = [
+            entry.reservation for entry in self.entries()
+            if (hotel_id is None or entry.reservation.hotel_id == hotel_id)
+            and (customer_id is None
+                 or entry.reservation.customer_id == customer_id)
+        ]
+        for reservation in purged:
+            self.remove(reservation.reservation_id)
+        return purged
+
+    def contains(self, reservation_id: int) -> bool:
+        """Return True if a request with this reservation ID is waiting."""
+        return reservation_id in self._by_reservation
+
+    def entries(self) -> List[WaitlistEntry]:
+        """Return every waiting entry, oldest first."""
+        return [self._entries[seq] for seq in sorted(self._entries)]
+
+    def candidates(
+            self,
+            hotel_id: int,
+            first: int,
+            last: int
+            ) -> List[Reservation]:
+        """
+        Return the waiting requests of a hotel whose range overlaps
+        the ordinal days first..last, oldest first.
+        """
+        buckets = self._index.get(hotel_id)
+        if not buckets:
+            return []
+        sequences: Set[int] = set()
+        for bucket in range(first // BUCKET_DAYS, last // BUCKET_DAYS + 1):
+            sequences.update(buckets.get(bucket, ()))
+        return [
+            self._entries[seq].reservation
+            for seq in sorted(sequences)
+            if self._entries[seq].first <= last
+            and self._entries[seq].last >= first
+        ]
+
+    def insert(self, entry: WaitlistEntry) -> WaitlistEntry:
+        """Add an entry, keeping its sequence number, to the indexes."""
+        reservation_id = entry.reservation.reservation_id
+        if reservation_id in self._by_reservation:
+            raise ValueError("Reservation ID already in waitlist.")
+
+        self._entries[entry.sequence] = entry
+        self._by_reservation[reservation_id] = entry.sequence
+        buckets = self._index.setdefault(entry.reservation.hotel_id, {})
+        for bucket in range(entry.first // BUCKET_DAYS,
+                            entry.last // BUCKET_DAYS + 1):
+            buckets.setdefault(bucket, set()).add(entry.sequence)
+        self._next_sequence = max(self._next_sequence, entry.sequence + 1)
+        return entry
+
+
+@instrument("waitlist.save_waitlist_to_file")
+def save_waitlist_to_file(
+        waitlist: Waitlist,
+        file_path: str,
+        compression: Optional[str] = None
+        ) -> None:
+    """
+    Atomically save a waitlist to a checksummed snapshot file,
+    optionally gzip or lzma compressed.
+    """
+    write_records(
+        file_path, "waitlist",
+        (entry.to_dict() for entry in waitlist.entries()), compression,
+    )
+
+
+@instrument("waitlist.load_waitlist_from_file")
+def load_waitlist_from_file(file_path: str) -> Waitlist:
+    """
+    Load a waitlist from a snapshot or JSON file.
+    Returns an empty waitlist if the file is missing and raises
+    CorruptSnapshotError if it cannot be read back intact.
+    """
+    waitlist = Waitlist()
+    try:
+        data, _ = read_records(file_path, "waitlist")
+    except FileNotFoundError:
+        return waitlist
+    for item in data:
+        waitlist.insert(WaitlistEntry.from_dict(item))
+    return waitlist
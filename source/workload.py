@@ -0,0 +1,316 @@
+"""
+Workload module.
+
+Generates reproducible booking traces (create, cancel and search
+operations) and replays them against the reservation system to
+measure throughput, latency percentiles and calendar consistency.
+"""
+
+# pylint: disable=duplicate-code
+
+
+import argparse
+import json
+import random
+import time
+from datetime import date, timedelta
+from typing import Dict, List, Optional
+
+from source.customer import Customer
+from source.hotel import Hotel
+from source.integrity import verify_calendars
+from source.menu import book_reservation, find_hotel, release_reservation
+from source.reservation import Reservation
+
+
+class WorkloadProfile:  # pylint: disable=too-few-public-methods
+    """Describes the shape of the traffic a trace should reproduce."""
+
+    hotels = 20
+    customers = 200
+    rooms_per_hotel = 40
+    year = 2026
+    search_ratio = 0.55
+    cancel_ratio = 0.10
+    group_ratio = 0.05
+    hot_fraction = 0.2
+    hot_weight = 0.6
+    max_stay = 14
+
+    def __init__(self, **overrides):
+        """Initialize a profile, overriding any of the defaults."""
+        for key, value in overrides.items():
+            if not hasattr(WorkloadProfile, key):
+                raise ValueError(f"Unknown workload setting: {key}.")
+            setattr(self, key, value)
+        if self.search_ratio + self.cancel_ratio > 1:
+            raise ValueError("Search and cancel ratios exceed 1.")
+
+    def to_dict(self) -> dict:
+        """Return a JSON-serializable representation of the profile."""
+        return {
+            key: getattr(self, key)
+            for key in vars(WorkloadProfile)
+            if not key.startswith("_") and not callable(getattr(self, key))
+        }
+
+
+def _season_weights(year: int) -> List[float]:
+    """
+    Return one weight per day of the year with summer
+    and end-of-year peaks over a flat baseline.
+    """
+    weights = []
+    day = date(year, 1, 1)
+    while day.year == year:
+        weight = 1.0
+        if day.month in (7, 8):
+            weight = 3.0
+        elif day.month == 12 and day.day >= 15:
+            weight = 4.0
+        elif day.month in (3, 4):
+            weight = 1.8
+        if day.weekday() >= 4:
+            weight *= 1.3
+        weights.append(weight)
+        day += timedelta(days=1)
+    return weights
+
+
+def generate_trace(  # pylint: disable=too-many-locals
+        seed: int = 0,
+        operations: int = 1000,
+        profile: Optional[WorkloadProfile] = None
+        ) -> dict:
+    """
+    Generate a reproducible trace for the given seed.
+
+    The trace holds the initial hotels and customers and
+    the ordered list of create/cancel/search operations.
+    """
+    profile = profile or WorkloadProfile()
+    rng = random.Random(seed)
+
+    hotels = [
+        Hotel(
+            hotel_id, f"Hotel {hotel_id}", f"City {hotel_id % 5}",
+            profile.rooms_per_hotel
+        ).to_dict()
+        for hotel_id in range(1, profile.hotels + 1)
+    ]
+    customers = [
+        Customer(
+            customer_id, f"Guest {customer_id}",
+            f"guest{customer_id}@example.com"
+        ).to_dict()
+        for customer_id in range(1, profile.customers + 1)
+    ]
+
+    hot_count = max(1, int(profile.hotels * profile.hot_fraction))
+    hotel_weights = [
+        profile.hot_weight / hot_count if idx < hot_count
+        else (1 - profile.hot_weight) / max(1, profile.hotels - hot_count)
+        for idx in range(profile.hotels)
+    ]
+    hotel_ids = rng.sample(range(1, profile.hotels + 1), profile.hotels)
+    days = _season_weights(profile.year)
+    first_day = date(profile.year, 1, 1)
+    stays = list(range(1, profile.max_stay + 1))
+    stay_weights = [1.0 / stay for stay in stays]
+
+    def pick_range() -> tuple:
+        offset = rng.choices(range(len(days)), weights=days)[0]
+        stay = rng.choices(stays, weights=stay_weights)[0]
+        start = first_day + timedelta(days=offset)
+        end = start + timedelta(days=stay - 1)
+        return start.isoformat(), end.isoformat()
+
+    def pick_rooms() -> int:
+        if rng.random() < profile.group_ratio:
+            return rng.randint(5, 15)
+        return rng.choices((1, 2, 3), weights=(6, 3, 1))[0]
+
+    ops = []
+    created: List[int] = []
+    next_id = 1
+    for _ in range(operations):
+        roll = rng.random()
+        if roll < profile.cancel_ratio and created:
+            victim = created.pop(rng.randrange(len(created)))
+            ops.append({"op": "cancel", "reservation_id": victim})
+            continue
+
+        hotel_id = rng.choices(hotel_ids, weights=hotel_weights)[0]
+        start_date, end_date = pick_range()
+        entry = {
+            "hotel_id": hotel_id,
+            "start_date": start_date,
+            "end_date": end_date,
+            "rooms": pick_rooms(),
+        }
+        if roll < profile.cancel_ratio + profile.search_ratio:
+            entry["op"] = "search"
+        else:
+            entry["op"] = "create"
+            entry["reservation_id"] = next_id
+            entry["customer_id"] = rng.randint(1, profile.customers)
+            created.append(next_id)
+            next_id += 1
+        ops.append(entry)
+
+    return {
+        "seed": seed,
+        "profile": profile.to_dict(),
+        "hotels": hotels,
+        "customers": customers,
+        "operations": ops,
+    }
+
+
+def save_trace(trace: dict, file_path: str) -> None:
+    """
+    Save a trace as JSON Lines: a header line with the seed, profile,
+    hotels and customers followed by one line per operation.
+    """
+    header = {key: value for key, value in trace.items()
+              if key != "operations"}
+    with open(file_path, "w", encoding="utf-8") as file:
+        file.write(json.dumps(header) + "\n")
+        for operation in trace["operations"]:
+            file.write(json.dumps(operation) + "\n")
+
+
+def load_trace(file_path: str) -> dict:
+    """Load a trace written by save_trace."""
+    with open(file_path, "r", encoding="utf-8") as file:
+        trace = json.loads(file.readline())
+        trace["operations"] = [json.loads(line) for line in file
+                               if line.strip()]
+    return trace
+
+
+def percentile(samples: List[float], pct: float) -> float:
+    """Return the nearest-rank percentile of already sorted samples."""
+    if not samples:
+        return 0.0
+    rank = max(0, min(len(samples) - 1,
+                      int(round(pct / 100 * len(samples))) - 1))
+    return samples[rank]
+
+
+def check_consistency(
+        hotels: List[Hotel],
+        reservations: List[Reservation]
+        ) -> dict:
+    """
+    Compare each hotel calendar with the occupancy implied by
+    the reservations and report mismatching or overbooked hotels.
+    """
+    report = verify_calendars(hotels, reservations)
+    return {
+        "consistent": report["consistent"],
+        "mismatched_hotels": sorted(report["drift"]),
+        "overbooked_hotels": sorted(report["overbooked"]),
+    }
+
+
+def replay_trace(trace: dict) -> dict:
+    """
+    Replay a trace through the menu-level booking functions and
+    the Hotel API and return throughput and latency statistics.
+    """
+    hotels = [Hotel.from_dict(item) for item in trace["hotels"]]
+    customers = [Customer.from_dict(item) for item in trace["customers"]]
+    reservations: List[Reservation] = []
+
+    latencies: Dict[str, List[float]] = {
+        "create": [], "cancel": [], "search": []
+    }
+    outcomes: Dict[str, Dict[str, int]] = {
+        name: {"ok": 0, "rejected": 0} for name in latencies
+    }
+
+    started = time.perf_counter()
+    for operation in trace["operations"]:
+        name = operation["op"]
+        op_start = time.perf_counter()
+        try:
+            if name == "create":
+                book_reservation(
+                    hotels, customers, reservations,
+                    Reservation(
+                        reservation_id=operation["reservation_id"],
+                        hotel_id=operation["hotel_id"],
+                        customer_id=operation["customer_id"],
+                        start_date=operation["start_date"],
+                        end_date=operation["end_date"],
+                        rooms_reserved=operation["rooms"],
+                    ),
+                )
+            elif name == "cancel":
+                release_reservation(
+                    hotels, reservations, operation["reservation_id"]
+                )
+            elif name == "search":
+                hotel = find_hotel(hotels, operation["hotel_id"])
+                if hotel is None:
+                    raise ValueError("Hotel not found.")
+                hotel.available_rooms_for_dates(
+                    operation["start_date"],
+                    operation["end_date"],
+                    operation["rooms"],
+                )
+            else:
+                raise ValueError(f"Unknown operation: {name}.")
+            outcomes[name]["ok"] += 1
+        except ValueError:
+            outcomes[name]["rejected"] += 1
+        latencies[name].append(time.perf_counter() - op_start)
+    elapsed = time.perf_counter() - started
+
+    summary = {}
+    for name, samples in latencies.items():
+        samples.sort()
+        summary[name] = {
+            "count": len(samples),
+            "ok": outcomes[name]["ok"],
+            "rejected": outcomes[name]["rejected"],
+            "p50_ms": percentile(samples, 50) * 1000,
+            "p95_ms": percentile(samples, 95) * 1000,
+            "p99_ms": percentile(samples, 99) * 1000,
+            "max_ms": (samples[-1] if samples else 0.0) * 1000,
+        }
+
+    total = len(trace["operations"])
+    return {
+        "operations": total,
+        "elapsed_s": elapsed,
+        "throughput_ops_s": total / elapsed if elapsed else 0.0,
+        "latency": summary,
+        "consistency": check_consistency(hotels, reservations),
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """Command line entry point: generate and/or replay a trace."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--operations", type=int, default=10000)
+    parser.add_argument("--hotels", type=int, default=20)
+    parser.add_argument("--save", help="Write the generated trace here.")
+    parser.add_argument("--replay", help="Replay a saved trace file.")
+    args = parser.parse_args(argv)
+
+    if args.replay:
+        trace = load_trace(args.replay)
+    else:
+        trace = generate_trace(
+            args.seed, args.operations, WorkloadProfile(hotels=args.hotels)
+        )
+    if args.save:
+        save_trace(trace, args.save)
+    print(json.dumps(replay_trace(trace), indent=2))
+
+
+if __name__ == "__main__":
+    main()
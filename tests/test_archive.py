@@ -0,0 +1,85 @@
+import os
+import tempfile
+import unittest
+
+from source.archive import (
+    archive_past_stays,
+    archived_months,
+    load_archived_reservations,
+)
+from source.hotel import Hotel
+from source.reservation import Reservation
+
+
+class TestArchive(unittest.TestCase):
+
+    def setUp(self):
+        self.hotel = Hotel(1, "Test", "MTY", 5)
+        self.reservations = [
+            Reservation(1, 1, 1, "2026-01-01", "2026-01-03", 1),
+            Reservation(2, 1, 2, "2026-02-10", "2026-02-12", 2),
+            Reservation(3, 1, 1, "2026-02-27", "2026-03-05", 1),
+            Reservation(4, 1, 2, "2026-04-01", "2026-04-02", 1),
+        ]
+        for reservation in self.reservations:
+            self.hotel.apply_calendar_change(
+                reservation.start_date, reservation.end_date,
+                reservation.rooms_reserved, 1,
+            )
+
+    def test_archive_moves_past_stays_and_prunes(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            summary = archive_past_stays(
+                [self.hotel], self.reservations, "2026-03-01", tmpdir
+            )
+            self.assertEqual(summary["archived"], 2)
+            self.assertEqual(
+                [r.reservation_id for r in self.reservations], [3, 4]
+            )
+            self.assertEqual(archived_months(tmpdir), ["2026-01", "2026-02"])
+            self.assertTrue(os.path.exists(summary["segments"][0]))
+
+            calendar = self.hotel.calendar()
+            self.assertNotIn("2026-001", calendar)
+            self.assertNotIn("2026-041", calendar)
+            # Reservation 3 straddles the cutoff and keeps its days.
+            self.assertEqual(calendar["2026-058"], 1)
+            self.assertEqual(summary["pruned_days"], 6)
+
+    def test_history_queries(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            archive_past_stays(
+                [self.hotel], self.reservations, "2026-03-01", tmpdir
+            )
+            archive_past_stays(
+                [self.hotel], self.reservations, "2026-12-31", tmpdir
+            )
+            history = load_archived_reservations(tmpdir)
+            self.assertEqual(len(history), 4)
+            self.assertEqual(self.hotel.calendar(), {})
+
+            by_customer = load_archived_reservations(tmpdir, customer_id=2)
+            self.assertEqual([r.reservation_id for r in by_customer], [2, 4])
+            by_month = load_archived_reservations(
+                tmpdir, months=("2026-02", "2026-03")
+            )
+            self.assertEqual([r.reservation_id for r in by_month], [2, 3])
+
+    def test_rerun_after_crash_does_not_duplicate(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            # The live list was not rewritten after the first run.
+            archive_past_stays(
+                [self.hotel], list(self.reservations), "2026-03-01", tmpdir
+            )
+            archive_past_stays(
+                [self.hotel], self.reservations, "2026-03-01", tmpdir
+            )
+            history = load_archived_reservations(tmpdir)
+            self.assertEqual([r.reservation_id for r in history], [1, 2])
+
+    def test_missing_archive_is_empty(self):
+        self.assertEqual(load_archived_reservations("no_archive_here"), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,73 @@
+import unittest
+
+from source.availability_cache import AvailabilityCache
+from source.hotel import Hotel
+
+
+class TestAvailabilityCache(unittest.TestCase):
+
+    def setUp(self):
+        self.cache = AvailabilityCache(max_entries=2)
+        self.hotel = Hotel(1, "Test", "MTY", 3)
+
+    def tearDown(self):
+        self.cache.close()
+
+    def test_hit_after_miss(self):
+        self.assertTrue(self.cache.available_rooms_for_dates(
+            self.hotel, "2026-01-01", "2026-01-05", 3))
+        self.assertTrue(self.cache.available_rooms_for_dates(
+            self.hotel, "2026-01-01", "2026-01-05", 1))
+        stats = self.cache.stats()
+        self.assertEqual(stats["hits"], 1)
+        self.assertEqual(stats["misses"], 1)
+
+    def test_overlapping_change_invalidates(self):
+        self.cache.peak_occupancy(self.hotel, "2026-01-01", "2026-01-05")
+        self.cache.peak_occupancy(self.hotel, "2026-02-01", "2026-02-05")
+        self.hotel.apply_calendar_change("2026-01-05", "2026-01-06", 3, 1)
+
+        self.assertEqual(self.cache.stats()["invalidations"], 1)
+        self.assertEqual(len(self.cache), 1)
+        self.assertFalse(self.cache.available_rooms_for_dates(
+            self.hotel, "2026-01-01", "2026-01-05", 1))
+        self.assertEqual(
+            self.cache.peak_occupancy(self.hotel, "2026-02-01", "2026-02-05"),
+            0,
+        )
+        self.assertEqual(self.cache.stats()["hits"], 1)
+
+    def test_lru_eviction(self):
+        self.cache.peak_occupancy(self.hotel, "2026-01-01", "2026-01-01")
+        self.cache.peak_occupancy(self.hotel, "2026-01-02", "2026-01-02")
+        self.cache.peak_occupancy(self.hotel, "2026-01-01", "2026-01-01")
+        self.cache.peak_occupancy(self.hotel, "2026-01-03", "2026-01-03")
+        self.assertEqual(self.cache.stats()["evictions"], 1)
+        self.cache.peak_occupancy(self.hotel, "2026-01-01", "2026-01-01")
+        self.assertEqual(self.cache.stats()["hits"], 2)
+
+    def test_other_hotel_with_same_id_is_not_served(self):
+        saved = Hotel(1, "Test", "MTY", 3)
+        saved.apply_calendar_change("2026-01-02", "2026-01-02", 3, 1)
+        data = saved.to_dict()
+        self.cache.peak_occupancy(self.hotel, "2026-01-01", "2026-01-05")
+
+        # Loading fires no calendar listener.
+        reloaded = Hotel.from_dict(data)
+        self.assertFalse(self.cache.available_rooms_for_dates(
+            reloaded, "2026-01-01", "2026-01-05", 1))
+        self.assertEqual(self.cache.stats()["hits"], 0)
+
+    def test_invalid_inputs_raise(self):
+        with self.assertRaises(ValueError):
+            self.cache.available_rooms_for_dates(
+                self.hotel, "2026-01-05", "2026-01-01", 1)
+        with self.assertRaises(ValueError):
+            self.cache.available_rooms_for_dates(
+                self.hotel, "2026-01-01", "2026-01-05", 0)
+        with self.assertRaises(ValueError):
+            AvailabilityCache(max_entries=0)
+
+
+if __name__ == "__main__":
+    unittest.main()
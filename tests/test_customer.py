@@ -4,6 +4,7 @@ import unittest
 
 from source.customer import (
     Customer,
+    CustomerIndex,
     load_customers_from_file,
     save_customers_to_file,
 )
@@ -59,5 +60,73 @@ class TestCustomer(unittest.TestCase):
             self.assertEqual(customers_out[1].email, "luis@test.com")
 
 
+class TestCustomerIndex(unittest.TestCase):
+
+    def setUp(self):
+        self.customers = [
+            Customer(1, "Alice", "Alice@Example.com"),
+            Customer(2, "alfred", "alfred@example.com"),
+            Customer(3, "Bob", "bob@example.com"),
+        ]
+        self.index = CustomerIndex(self.customers)
+
+    def test_find_by_email_is_normalized(self):
+        found = self.index.find_by_email("  alice@EXAMPLE.com ")
+        self.assertIs(found, self.customers[0])
+        self.assertIsNone(self.index.find_by_email("nobody@example.com"))
+
+    def test_duplicate_email_rejected(self):
+        with self.assertRaises(ValueError):
+            self.index.add(Customer(4, "Other", "BOB@example.com"))
+        self.assertEqual(len(self.index), 3)
+
+    def test_search_name_prefix(self):
+        names = [c.name for c in self.index.search_name("al")]
+        self.assertEqual(names, ["alfred", "Alice"])
+        self.assertEqual(self.index.search_name("al", limit=1)[0].name,
+                         "alfred")
+        self.assertEqual(self.index.search_name("z"), [])
+
+    def test_update_reindexes(self):
+        bob = self.customers[2]
+        self.index.update(bob, name="Alan", email="alan@example.com")
+        self.assertIsNone(self.index.find_by_email("bob@example.com"))
+        self.assertIs(self.index.find_by_email("alan@example.com"), bob)
+        self.assertEqual(
+            [c.name for c in self.index.search_name("a")],
+            ["Alan", "alfred", "Alice"],
+        )
+
+    def test_update_rejected_keeps_customer(self):
+        bob = self.customers[2]
+        with self.assertRaises(ValueError):
+            self.index.update(bob, email="alfred@example.com")
+        self.assertEqual(bob.email, "bob@example.com")
+        self.assertIs(self.index.find_by_email("bob@example.com"), bob)
+
+    def test_remove(self):
+        self.index.remove(self.customers[0])
+        self.assertIsNone(self.index.find_by_email("alice@example.com"))
+        self.assertEqual([c.name for c in self.index.search_name("al")],
+                         ["alfred"])
+        self.index.add(Customer(5, "Alice B", "alice@example.com"))
+
+    def test_legacy_duplicate_emails_load(self):
+        twin = Customer(4, "Bobby", "BOB@example.com")
+        index = CustomerIndex(self.customers + [twin])
+        self.assertEqual(index.duplicates, {"bob@example.com": [4]})
+        self.assertIs(index.find_by_email("bob@example.com"),
+                      self.customers[2])
+        with self.assertRaises(ValueError):
+            index.add(Customer(5, "Bo", "bob@EXAMPLE.com"))
+
+        index.update(twin, name="Robert")
+        self.assertEqual([c.name for c in index.search_name("rob")],
+                         ["Robert"])
+        index.remove(self.customers[2])
+        self.assertIs(index.find_by_email("bob@example.com"), twin)
+        self.assertEqual(index.duplicates, {})
+
+
 if __name__ == "__main__":
     unittest.main()
\ No newline at end of file
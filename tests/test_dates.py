@@ -0,0 +1,52 @@
+import unittest
+from datetime import date
+
+from source.dates import (
+    as_ordinal,
+    calendar_key_for,
+    ordinal_range,
+    to_iso,
+    to_ordinal,
+)
+from source.hotel import calendar_key
+
+
+class TestDates(unittest.TestCase):
+
+    def test_round_trip(self):
+        ordinal = to_ordinal("2028-02-29")
+        self.assertEqual(ordinal, date(2028, 2, 29).toordinal())
+        self.assertEqual(to_iso(ordinal), "2028-02-29")
+
+    def test_unpadded_dates_still_parse(self):
+        self.assertEqual(to_ordinal("2026-1-5"), to_ordinal("2026-01-05"))
+
+    def test_invalid_dates(self):
+        for value in ("2026-13-01", "2027-02-29", "01/02/2026", "", None):
+            with self.assertRaises(ValueError):
+                to_ordinal(value)
+
+    def test_as_ordinal_accepts_strings_dates_and_ordinals(self):
+        ordinal = date(2026, 3, 1).toordinal()
+        self.assertEqual(as_ordinal("2026-03-01"), ordinal)
+        self.assertEqual(as_ordinal(date(2026, 3, 1)), ordinal)
+        self.assertEqual(as_ordinal(ordinal), ordinal)
+
+    def test_ordinal_range(self):
+        first, last = ordinal_range("2026-12-31", "2027-01-01")
+        self.assertEqual(last - first, 1)
+        with self.assertRaises(ValueError):
+            ordinal_range("2027-01-01", "2026-12-31")
+
+    def test_calendar_key_matches_hotel_keys(self):
+        for day in (date(2026, 1, 1), date(2028, 12, 31), date(2027, 3, 9)):
+            self.assertEqual(calendar_key_for(day.toordinal()),
+                             calendar_key(day))
+            self.assertEqual(
+                calendar_key(day),
+                f"{day.year}-{day.timetuple().tm_yday:03d}",
+            )
+
+
+if __name__ == "__main__":
+    unittest.main()
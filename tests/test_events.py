@@ -0,0 +1,140 @@
+import os
+import socket
+import tempfile
+import threading
+import unittest
+
+from source.customer import Customer
+from source.dates import to_ordinal
+from source.events import (
+    EventPublisher,
+    FileSink,
+    QueueSink,
+    UnixSocketSink,
+    read_events,
+    set_publisher,
+)
+from source.hotel import Hotel
+from source.menu import book_reservation, release_reservation
+from source.reservation import Reservation
+
+
+class TestEvents(unittest.TestCase):
+
+    def tearDown(self):
+        set_publisher(None)
+
+    def test_batches_and_sequence_numbers(self):
+        sink = QueueSink()
+        publisher = EventPublisher(sink, batch_size=2)
+        publisher.publish("hotel.deleted", {"hotel_id": 1})
+        self.assertTrue(sink.queue.empty())
+        publisher.publish("hotel.deleted", {"hotel_id": 2})
+        publisher.publish("hotel.deleted", {"hotel_id": 3})
+        publisher.flush()
+        batches = [sink.queue.get_nowait(), sink.queue.get_nowait()]
+        self.assertEqual(
+            [[e.sequence for e in batch] for batch in batches], [[1, 2], [3]]
+        )
+        with self.assertRaises(ValueError):
+            publisher.publish("hotel.unknown", {})
+
+    def test_bounded_queue_applies_back_pressure(self):
+        sink = QueueSink(maxsize=1, timeout=0.01)
+        publisher = EventPublisher(sink, batch_size=1)
+        publisher.publish("hotel.deleted", {"hotel_id": 1})
+        publisher.publish("hotel.deleted", {"hotel_id": 2})
+        publisher.publish("hotel.deleted", {"hotel_id": 3})
+        self.assertEqual(publisher.backlog, 2)
+        self.assertIsInstance(publisher.last_error, ValueError)
+        self.assertFalse(publisher.flush())
+
+        self.assertEqual([e.sequence for e in sink.queue.get_nowait()], [1])
+        self.assertTrue(publisher.flush())
+        self.assertEqual(publisher.backlog, 0)
+        self.assertIsNone(publisher.last_error)
+        self.assertEqual(
+            [e.sequence for e in sink.queue.get_nowait()], [2, 3]
+        )
+
+    def test_full_sink_does_not_fail_bookings(self):
+        sink = QueueSink(maxsize=1, timeout=0.01)
+        publisher = EventPublisher(sink, batch_size=1)
+        set_publisher(publisher)
+        hotels = [Hotel(1, "Test", "MTY", 3)]
+        customers = [Customer(1, "Ana", "ana@test.com")]
+        reservations = []
+        for reservation_id in (1, 2):
+            book_reservation(
+                hotels, customers, reservations,
+                Reservation(reservation_id, 1, 1,
+                            "2026-01-01", "2026-01-02", 1),
+            )
+        self.assertEqual([r.reservation_id for r in reservations], [1, 2])
+        self.assertEqual(hotels[0].booked_on(to_ordinal("2026-01-01")), 2)
+        self.assertEqual(publisher.backlog, 3)
+
+    def test_file_sink_resume(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, "events.jsonl")
+            publisher = EventPublisher(FileSink(path), batch_size=10)
+            for hotel_id in range(3):
+                publisher.publish("hotel.deleted", {"hotel_id": hotel_id})
+            publisher.close()
+
+            resumed = EventPublisher(FileSink(path))
+            self.assertEqual(resumed.sequence, 3)
+            resumed.publish("customer.deleted", {"customer_id": 9})
+            resumed.close()
+
+            events = read_events(path, after_sequence=2)
+            self.assertEqual([e.sequence for e in events], [3, 4])
+            self.assertEqual(events[-1].event_type, "customer.deleted")
+
+    def test_unix_socket_sink(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, "events.sock")
+            server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            server.bind(path)
+            server.listen(1)
+            received = []
+
+            def consume():
+                conn, _ = server.accept()
+                with conn, conn.makefile("r", encoding="utf-8") as lines:
+                    received.extend(lines)
+
+            reader = threading.Thread(target=consume)
+            reader.start()
+            publisher = EventPublisher(UnixSocketSink(path), batch_size=5)
+            publisher.publish("hotel.deleted", {"hotel_id": 1})
+            publisher.close()
+            reader.join(timeout=5)
+            server.close()
+            self.assertEqual(len(received), 1)
+            self.assertIn('"sequence": 1', received[0])
+
+    def test_booking_mutations_are_published(self):
+        sink = QueueSink()
+        set_publisher(EventPublisher(sink, batch_size=100))
+        hotels = [Hotel(1, "Test", "MTY", 3)]
+        reservations = []
+        book_reservation(
+            hotels, [Customer(1, "Ana", "ana@test.com")], reservations,
+            Reservation(1, 1, 1, "2026-01-01", "2026-01-02", 1),
+        )
+        release_reservation(hotels, reservations, 1)
+        set_publisher(None)
+
+        events = sink.queue.get_nowait()
+        self.assertEqual(
+            [event.event_type for event in events],
+            ["calendar.changed", "reservation.created",
+             "calendar.changed", "reservation.cancelled"],
+        )
+        self.assertEqual(events[0].payload["start_date"], "2026-01-01")
+        self.assertEqual(events[2].payload["delta"], -1)
+
+
+if __name__ == "__main__":
+    unittest.main()
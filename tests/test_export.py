@@ -0,0 +1,98 @@
+import json
+import os
+import tempfile
+import unittest
+
+from source.export import MANIFEST_FILE, export_analytics, read_table
+from source.hotel import Hotel
+from source.reservation import Reservation
+
+
+class TestExport(unittest.TestCase):
+
+    def setUp(self):
+        self.hotels = [Hotel(1, "Test", "MTY", 5), Hotel(2, "Other", "GDL", 3)]
+        self.reservations = [
+            Reservation(1, 1, 1, "2026-01-30", "2026-02-02", 2),
+            Reservation(2, 2, 1, "2026-01-05", "2026-01-05", 1),
+            Reservation(3, 1, 2, "2026-01-10", "2026-01-11", 1),
+            Reservation(4, 1, 2, "2026-02-10", "2026-02-10", 1),
+        ]
+        for reservation in self.reservations:
+            hotel = self.hotels[reservation.hotel_id - 1]
+            hotel.apply_calendar_change(
+                reservation.start_date, reservation.end_date,
+                reservation.rooms_reserved, 1,
+            )
+
+    def test_partitions_and_manifest(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            manifest = export_analytics(
+                self.hotels, self.reservations, tmpdir, chunk_rows=2
+            )
+            with open(os.path.join(tmpdir, MANIFEST_FILE),
+                      encoding="utf-8") as file:
+                self.assertEqual(json.load(file), manifest)
+
+            booked = manifest["tables"]["reservations"]
+            self.assertEqual(booked["rows"], 4)
+            self.assertEqual(
+                [(item["month"], item["rows"])
+                 for item in booked["partitions"]],
+                [("2026-01", 2), ("2026-01", 1), ("2026-02", 1)],
+            )
+            occupancy = manifest["tables"]["occupancy"]
+            self.assertEqual(occupancy["partition_by"], ["month", "hotel_id"])
+            self.assertEqual(occupancy["rows"], 4 + 2 + 1 + 1)
+            for item in occupancy["partitions"]:
+                self.assertTrue(
+                    os.path.exists(os.path.join(tmpdir, item["path"]))
+                )
+
+    def test_read_selected_partitions_and_columns(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            export_analytics(self.hotels, self.reservations, tmpdir)
+            january = read_table(
+                tmpdir, "occupancy", ["date", "booked"],
+                months=("2026-01", "2026-01"), hotel_id=1,
+            )
+            self.assertEqual(january, {
+                "date": ["2026-01-10", "2026-01-11", "2026-01-30",
+                         "2026-01-31"],
+                "booked": [1, 1, 2, 2],
+            })
+            stays = read_table(tmpdir, "reservations", ["days"])
+            self.assertEqual(sorted(stays["days"]), [1, 1, 2, 4])
+            with self.assertRaises(ValueError):
+                read_table(tmpdir, "reservations", ["price"])
+
+    def test_reexport_replaces_previous_files(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            first = export_analytics(self.hotels, self.reservations, tmpdir)
+            export_analytics(self.hotels, self.reservations[1:2], tmpdir)
+            stays = read_table(tmpdir, "reservations")
+            self.assertEqual(stays["reservation_id"], [2])
+            for table in first["tables"].values():
+                for item in table["partitions"]:
+                    self.assertFalse(
+                        os.path.exists(os.path.join(tmpdir, item["path"]))
+                    )
+            with self.assertRaises(ValueError):
+                export_analytics([], [], tmpdir, chunk_rows=0)
+
+    def test_failed_reexport_keeps_previous_export(self):
+        def failing():
+            yield self.reservations[0]
+            raise ValueError("Source failed.")
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            export_analytics(self.hotels, self.reservations, tmpdir,
+                             chunk_rows=1)
+            with self.assertRaises(ValueError):
+                export_analytics(self.hotels, failing(), tmpdir, chunk_rows=1)
+            stays = read_table(tmpdir, "reservations")
+            self.assertEqual(sorted(stays["reservation_id"]), [1, 2, 3, 4])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,66 @@
+import random
+import unittest
+from unittest import mock
+
+from source.dates import ordinal_range
+from source.fuzz import (
+    RateEngine,
+    ReferenceEngine,
+    first_mismatch,
+    generate_sequence,
+    run_fuzz,
+    shrink,
+)
+from source.rates import RateCalendar
+
+
+class LastDayBlindEngine(ReferenceEngine):
+    """Reference engine with an off-by-one availability check."""
+
+    def available(self, start, end, rooms):
+        first, last = ordinal_range(start, end)
+        return self.hotel.available_rooms_for_dates(
+            first, max(first, last - 1), rooms
+        )
+
+
+class TestFuzz(unittest.TestCase):
+
+    def test_sequences_are_reproducible(self):
+        self.assertEqual(generate_sequence(random.Random(7), 50),
+                         generate_sequence(random.Random(7), 50))
+
+    def test_engines_agree_with_reference(self):
+        report = run_fuzz(seed=1, operations=2000, length=100)
+        self.assertEqual(report["operations"], 2000)
+        for name, result in report["engines"].items():
+            self.assertEqual(result["failures"], 0, name)
+            self.assertGreater(result["speedup"], 0)
+
+    def test_mismatch_is_shrunk(self):
+        report = run_fuzz(seed=3, operations=1000, length=100,
+                          engines={"buggy": LastDayBlindEngine})
+        result = report["engines"]["buggy"]
+        self.assertGreater(result["failures"], 0)
+        reproducer = result["reproducer"]
+        self.assertLessEqual(len(reproducer["operations"]), 3)
+        self.assertIsNotNone(first_mismatch(LastDayBlindEngine, reproducer))
+
+    def test_rate_calendar_is_checked_independently(self):
+        # A pricing bug inside RateCalendar must not hide in the oracle.
+        with mock.patch.object(RateCalendar, "_price_of",
+                               lambda self, rate, booked: rate):
+            report = run_fuzz(seed=2, operations=2000, length=100,
+                              engines={"rates": RateEngine})
+        self.assertGreater(report["engines"]["rates"]["failures"], 0)
+
+    def test_shrink_requires_failure(self):
+        sequence = generate_sequence(random.Random(0), 20)
+        with self.assertRaises(ValueError):
+            shrink(ReferenceEngine, sequence)
+        with self.assertRaises(ValueError):
+            run_fuzz(seed=0, operations=0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -3,6 +3,7 @@ import tempfile
 import unittest
 
 from source.hotel import Hotel, load_hotels_from_file, save_hotels_to_file
+from source.storage import CorruptSnapshotError
 
 
 class TestHotel(unittest.TestCase):
@@ -67,14 +68,14 @@ class TestHotel(unittest.TestCase):
         hotel.cancel_reservation()
         self.assertEqual(hotel.available_rooms, 2)
 
-    def test_load_hotels_invalid_json_returns_empty(self):
+    def test_load_hotels_invalid_json_raises(self):
         with tempfile.TemporaryDirectory() as tmpdir:
             path = os.path.join(tmpdir, "hotels.json")
             with open(path, "w", encoding="utf-8") as file:
                 file.write("{invalid json")
 
-            hotels = load_hotels_from_file(path)
-            self.assertEqual(hotels, [])
+            with self.assertRaises(CorruptSnapshotError):
+                load_hotels_from_file(path)
 
     def test_apply_calendar_change_valid_reserve_and_cancel(self):
         hotel = Hotel(1, "Test", "MTY", 5)
@@ -112,6 +113,56 @@ class TestHotel(unittest.TestCase):
         """Try to request 1 room, should return False."""
         self.assertFalse(hotel.available_rooms_for_dates("2026-01-01", "2026-01-01", 1))
 
+    def test_cancel_exceeding_booked_leaves_calendar_untouched(self):
+        hotel = Hotel(1, "Test", "MTY", 5)
+        hotel.apply_calendar_change("2026-01-01", "2026-01-01", 2, 1)
+        with self.assertRaises(ValueError):
+            hotel.apply_calendar_change("2026-01-01", "2026-01-02", 1, -1)
+        self.assertEqual(hotel.calendar(), {"2026-001": 2})
+
+    def test_change_calendar_range_moves_only_delta(self):
+        hotel = Hotel(1, "Test", "MTY", 3)
+        hotel.apply_calendar_change("2026-01-01", "2026-01-04", 2, 1)
+        hotel.change_calendar_range(
+            ("2026-01-01", "2026-01-04"), 2, ("2026-01-03", "2026-01-05"), 3
+        )
+        self.assertEqual(
+            hotel.calendar(),
+            {"2026-003": 3, "2026-004": 3, "2026-005": 3},
+        )
+
+    def test_change_calendar_range_without_capacity_is_atomic(self):
+        hotel = Hotel(1, "Test", "MTY", 3)
+        hotel.apply_calendar_change("2026-01-01", "2026-01-02", 1, 1)
+        hotel.apply_calendar_change("2026-01-05", "2026-01-05", 3, 1)
+        before = hotel.calendar()
+        with self.assertRaises(ValueError):
+            hotel.change_calendar_range(
+                ("2026-01-01", "2026-01-02"), 1,
+                ("2026-01-02", "2026-01-05"), 1,
+            )
+        self.assertEqual(hotel.calendar(), before)
+
+    def test_change_calendar_range_invalid_inputs(self):
+        hotel = Hotel(1, "Test", "MTY", 3)
+        with self.assertRaises(ValueError):
+            hotel.change_calendar_range(
+                ("2026-01-01", "2026-01-02"), 1,
+                ("2026-01-05", "2026-01-02"), 1,
+            )
+        with self.assertRaises(ValueError):
+            hotel.change_calendar_range(
+                ("2026-01-01", "2026-01-02"), 1,
+                ("2026-01-01", "2026-01-02"), 0,
+            )
+
+    def test_peak_occupancy(self):
+        hotel = Hotel(1, "Test", "MTY", 5)
+        hotel.apply_calendar_change("2026-01-02", "2026-01-03", 2, 1)
+        hotel.apply_calendar_change("2026-01-03", "2026-01-04", 1, 1)
+        self.assertEqual(hotel.peak_occupancy("2026-01-01", "2026-01-05"), 3)
+        self.assertEqual(hotel.peak_occupancy("2026-01-05", "2026-01-05"), 0)
+
     def test_reserve_room_no_availability(self):
         hotel = Hotel(1, "Test", "MTY", 1)
         hotel.reserve_room()
@@ -0,0 +1,90 @@
+import unittest
+
+from source.dates import to_ordinal
+from source.hotel import Hotel
+from source.integrity import rebuild_calendars, verify_calendars
+from source.reservation import Reservation
+
+
+class TestIntegrity(unittest.TestCase):
+
+    def setUp(self):
+        self.hotel = Hotel(1, "Test", "MTY", 3)
+        self.reservations = [
+            Reservation(1, 1, 1, "2026-12-30", "2027-01-02", 2),
+            Reservation(2, 1, 1, "2027-01-01", "2027-01-01", 1),
+        ]
+        for reservation in self.reservations:
+            self.hotel.apply_calendar_change(
+                reservation.start_date,
+                reservation.end_date,
+                reservation.rooms_reserved,
+                1,
+            )
+
+    def test_rebuild_matches_replayed_calendar(self):
+        rebuilt = rebuild_calendars([self.hotel], self.reservations)
+        self.assertEqual(rebuilt[1], self.hotel.calendar())
+        self.assertEqual(rebuilt[1]["2027-001"], 3)
+        self.assertEqual(rebuilt[1]["2026-365"], 2)
+
+    def test_verify_consistent(self):
+        report = verify_calendars([self.hotel], self.reservations)
+        self.assertTrue(report["consistent"])
+        self.assertEqual(report["drift"], {})
+
+    def test_verify_detects_drift_and_repairs(self):
+        self.hotel.apply_calendar_change("2027-01-02", "2027-01-02", 2, -1)
+        report = verify_calendars(
+            [self.hotel], self.reservations, repair=True
+        )
+        self.assertFalse(report["consistent"])
+        self.assertEqual(
+            report["drift"][1],
+            [{"day": "2027-002", "stored": 0, "expected": 2}],
+        )
+        self.assertTrue(report["repaired"])
+        self.assertTrue(
+            verify_calendars([self.hotel], self.reservations)["consistent"]
+        )
+
+    def test_verify_reports_overbooking_and_orphans(self):
+        reservations = self.reservations + [
+            Reservation(3, 1, 1, "2027-01-01", "2027-01-01", 1),
+            Reservation(4, 99, 1, "2027-01-01", "2027-01-01", 1),
+        ]
+        report = verify_calendars([self.hotel], reservations)
+        self.assertEqual(report["overbooked"][1], ["2027-001"])
+        self.assertEqual(report["orphan_reservations"], [4])
+
+    def test_room_type_matrix_is_verified_and_repaired(self):
+        hotel = Hotel(2, "Typed", "MTY", 3, room_types={"s": 2, "d": 1})
+        hotel.apply_room_mix_change("2026-01-01", "2026-01-02", {"s": 2}, 1)
+        booked = Reservation(5, 2, 1, "2026-01-01", "2026-01-01", 1,
+                             room_counts={"d": 1})
+        unknown = Reservation(6, 2, 1, "2026-01-01", "2026-01-01", 1,
+                              room_counts={"suite": 1})
+        overbooked = Reservation(7, 2, 1, "2026-01-05", "2026-01-05", 2,
+                                 room_counts={"d": 2})
+        report = verify_calendars(
+            [hotel], [booked, unknown, overbooked], repair=True
+        )
+
+        self.assertEqual(sorted(report["room_type_drift"][2]), ["d", "s"])
+        self.assertEqual(report["room_type_drift"][2]["s"][0],
+                         {"day": "2026-001", "stored": 2, "expected": 0})
+        self.assertEqual(report["room_type_overbooked"][2],
+                         {"d": ["2026-005"]})
+        self.assertEqual(report["invalid_room_counts"], [6])
+        first = to_ordinal("2026-01-01")
+        self.assertEqual(hotel.inventory.booked("s", first, first + 1),
+                         [0, 0])
+        self.assertTrue(
+            hotel.available_room_mix("2026-01-02", "2026-01-02", {"s": 2})
+        )
+        report = verify_calendars([hotel], [booked, overbooked])
+        self.assertEqual(report["room_type_drift"], {})
+
+
+if __name__ == "__main__":
+    unittest.main()
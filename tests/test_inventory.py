@@ -0,0 +1,117 @@
+import unittest
+
+from source.dates import to_ordinal
+from source.hotel import Hotel
+from source.inventory import RoomInventory, parse_room_counts
+
+
+class TestRoomInventory(unittest.TestCase):
+
+    def setUp(self):
+        self.inventory = RoomInventory({"single": 2, "double": 1})
+        self.first = to_ordinal("2026-01-01")
+
+    def test_parse_room_counts(self):
+        self.assertEqual(parse_room_counts("single=2, double=1"),
+                         {"single": 2, "double": 1})
+        with self.assertRaises(ValueError):
+            parse_room_counts("single")
+
+    def test_mixed_availability(self):
+        self.inventory.apply([(self.first, self.first + 2, "single", 2)])
+        self.assertTrue(self.inventory.available(
+            self.first + 3, self.first + 5, {"single": 2, "double": 1}))
+        self.assertFalse(self.inventory.available(
+            self.first + 2, self.first + 3, {"single": 1, "double": 1}))
+        self.assertTrue(self.inventory.available(
+            self.first - 10, self.first - 1, {"single": 2}))
+        with self.assertRaises(ValueError):
+            self.inventory.available(self.first, self.first, {"suite": 1})
+
+    def test_window_grows_in_both_directions(self):
+        self.inventory.apply([(self.first, self.first, "double", 1)])
+        self.inventory.apply([(self.first - 3, self.first - 2, "single", 1)])
+        self.assertEqual(self.inventory.base, self.first - 3)
+        self.assertEqual(self.inventory.days, 4)
+        self.assertEqual(
+            self.inventory.booked("double", self.first - 3, self.first + 1),
+            [0, 0, 0, 1, 0],
+        )
+
+    def test_failed_change_writes_nothing(self):
+        self.inventory.apply([(self.first, self.first + 1, "single", 1)])
+        with self.assertRaises(ValueError):
+            self.inventory.apply([
+                (self.first, self.first + 1, "single", 1),
+                (self.first + 1, self.first + 1, "single", 1),
+            ], check_capacity=True)
+        with self.assertRaises(ValueError):
+            self.inventory.apply([(self.first, self.first + 2, "single", -1)])
+        self.assertEqual(
+            self.inventory.booked("single", self.first, self.first + 2),
+            [1, 1, 0],
+        )
+
+    def test_round_trip_and_trim(self):
+        self.inventory.apply([(self.first, self.first + 4, "single", 1)])
+        self.inventory.trim_before(self.first + 3)
+        copy = RoomInventory.from_dict(self.inventory.to_dict())
+        self.assertEqual(copy.base, self.first + 3)
+        self.assertEqual(copy.booked("single", self.first, self.first + 5),
+                         [0, 0, 0, 1, 1, 0])
+
+
+class TestHotelRoomTypes(unittest.TestCase):
+
+    def setUp(self):
+        self.hotel = Hotel(1, "Test", "MTY", 3, {"single": 2, "double": 1})
+
+    def test_capacities_must_match_total(self):
+        with self.assertRaises(ValueError):
+            Hotel(2, "Test", "MTY", 4, {"single": 2, "double": 1})
+
+    def test_room_mix_updates_matrix_and_calendar(self):
+        self.hotel.apply_room_mix_change(
+            "2026-01-01", "2026-01-02", {"single": 1, "double": 1}, 1)
+        self.assertEqual(self.hotel.calendar()["2026-001"], 2)
+        self.assertFalse(self.hotel.available_room_mix(
+            "2026-01-02", "2026-01-03", {"double": 1}))
+        self.assertTrue(self.hotel.available_room_mix(
+            "2026-01-02", "2026-01-03", {"single": 1}))
+
+    def test_change_room_mix_is_atomic(self):
+        self.hotel.apply_room_mix_change(
+            "2026-01-01", "2026-01-01", {"single": 2}, 1)
+        with self.assertRaises(ValueError):
+            self.hotel.change_room_mix(
+                ("2026-01-01", "2026-01-01"), {"single": 2},
+                ("2026-01-01", "2026-01-02"), {"single": 1, "double": 2},
+            )
+        self.assertEqual(self.hotel.calendar(), {"2026-001": 2})
+        self.hotel.change_room_mix(
+            ("2026-01-01", "2026-01-01"), {"single": 2},
+            ("2026-01-01", "2026-01-02"), {"single": 1, "double": 1},
+        )
+        self.assertEqual(self.hotel.calendar(),
+                         {"2026-001": 2, "2026-002": 2})
+
+    def test_untyped_hotel_rejects_room_mix(self):
+        with self.assertRaises(ValueError):
+            Hotel(2, "Test", "MTY", 3).available_room_mix(
+                "2026-01-01", "2026-01-01", {"single": 1})
+
+    def test_round_trip(self):
+        self.hotel.apply_room_mix_change(
+            "2026-01-01", "2026-01-01", {"double": 1}, 1)
+        copy = Hotel.from_dict(self.hotel.to_dict())
+        self.assertEqual(copy.room_types, {"single": 2, "double": 1})
+        self.assertFalse(copy.available_room_mix(
+            "2026-01-01", "2026-01-01", {"double": 1}))
+        trusted = Hotel.from_trusted_dict(self.hotel.to_dict())
+        self.assertEqual(trusted.inventory.booked(
+            "double", to_ordinal("2026-01-01"), to_ordinal("2026-01-01")),
+            [1])
+
+
+if __name__ == "__main__":
+    unittest.main()
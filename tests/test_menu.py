@@ -0,0 +1,150 @@
+import unittest
+from unittest import mock
+
+from source.customer import Customer
+from source.hotel import Hotel
+from source.menu import (
+    CancelOperation,
+    NoAvailability,
+    book_reservation,
+    change_reservation,
+    create_hotel,
+    release_reservation,
+    set_hotel_rates,
+)
+from source.reservation import Reservation
+
+
+class TestMenuBooking(unittest.TestCase):
+
+    def setUp(self):
+        self.hotels = [Hotel(1, "Test", "MTY", 3)]
+        self.customers = [Customer(1, "Ana", "ana@test.com")]
+        self.reservations = []
+        book_reservation(
+            self.hotels, self.customers, self.reservations,
+            Reservation(1, 1, 1, "2026-01-01", "2026-01-03", 2),
+        )
+
+    def test_book_and_release(self):
+        self.assertEqual(self.hotels[0].calendar()["2026-002"], 2)
+        with self.assertRaises(ValueError):
+            book_reservation(
+                self.hotels, self.customers, self.reservations,
+                Reservation(2, 1, 1, "2026-01-03", "2026-01-03", 2),
+            )
+        released = release_reservation(self.hotels, self.reservations, 1)
+        self.assertEqual(released.reservation_id, 1)
+        self.assertEqual(self.hotels[0].calendar(), {})
+        self.assertEqual(self.reservations, [])
+
+    def test_change_reservation_keeps_id(self):
+        modified = change_reservation(
+            self.hotels, self.reservations, 1,
+            {"end_date": "2026-01-05", "rooms_reserved": 3},
+        )
+        self.assertEqual(modified.reservation_id, 1)
+        self.assertEqual(self.reservations, [modified])
+        self.assertEqual(modified.start_date, "2026-01-01")
+        self.assertEqual(self.hotels[0].calendar()["2026-005"], 3)
+
+    def test_change_reservation_rejected_keeps_booking(self):
+        book_reservation(
+            self.hotels, self.customers, self.reservations,
+            Reservation(2, 1, 1, "2026-01-05", "2026-01-05", 3),
+        )
+        with self.assertRaises(ValueError):
+            change_reservation(
+                self.hotels, self.reservations, 1,
+                {"end_date": "2026-01-05"},
+            )
+        self.assertEqual(self.reservations[0].end_date, "2026-01-03")
+        self.assertNotIn("2026-004", self.hotels[0].calendar())
+
+    def test_change_unknown_reservation(self):
+        with self.assertRaises(ValueError):
+            change_reservation(self.hotels, self.reservations, 99, {})
+
+
+class TestMenuRoomTypes(unittest.TestCase):
+
+    def setUp(self):
+        self.hotels = [Hotel(1, "Test", "MTY", 3, {"single": 2, "double": 1})]
+        self.customers = [Customer(1, "Ana", "ana@test.com")]
+        self.reservations = []
+        book_reservation(
+            self.hotels, self.customers, self.reservations,
+            Reservation(1, 1, 1, "2026-01-01", "2026-01-02", 2,
+                        {"single": 1, "double": 1}),
+        )
+
+    def test_untyped_booking_rejected(self):
+        with self.assertRaises(ValueError):
+            book_reservation(
+                self.hotels, self.customers, self.reservations,
+                Reservation(2, 1, 1, "2026-01-05", "2026-01-05", 1),
+            )
+
+    def test_type_full(self):
+        with self.assertRaises(NoAvailability):
+            book_reservation(
+                self.hotels, self.customers, self.reservations,
+                Reservation(2, 1, 1, "2026-01-02", "2026-01-02", 1,
+                            {"double": 1}),
+            )
+
+    def test_change_and_release(self):
+        change_reservation(self.hotels, self.reservations, 1,
+                           {"room_counts": {"single": 2}})
+        self.assertEqual(self.reservations[0].rooms_reserved, 2)
+        self.assertTrue(self.hotels[0].available_room_mix(
+            "2026-01-01", "2026-01-02", {"double": 1}))
+
+        release_reservation(self.hotels, self.reservations, 1)
+        self.assertEqual(self.hotels[0].calendar(), {})
+        self.assertTrue(self.hotels[0].available_room_mix(
+            "2026-01-01", "2026-01-02", {"single": 2, "double": 1}))
+
+    def test_change_cannot_switch_shape(self):
+        with self.assertRaises(ValueError):
+            change_reservation(self.hotels, self.reservations, 1,
+                               {"room_counts": None, "rooms_reserved": 2})
+        with self.assertRaises(ValueError):
+            change_reservation(self.hotels, self.reservations, 1,
+                               {"rooms_reserved": 3})
+
+        plain = Hotel(2, "Plain", "MTY", 3)
+        self.hotels.append(plain)
+        book_reservation(self.hotels, self.customers, self.reservations,
+                         Reservation(2, 2, 1, "2026-01-01", "2026-01-01", 1))
+        with self.assertRaises(ValueError):
+            change_reservation(self.hotels, self.reservations, 2,
+                               {"room_counts": {"single": 1}})
+        self.assertIsNone(self.reservations[1].room_counts)
+        release_reservation(self.hotels, self.reservations, 2)
+        self.assertEqual(plain.calendar(), {})
+
+
+class TestMenuPrompts(unittest.TestCase):
+
+    def test_cancel_at_room_types_prompt(self):
+        hotels = []
+        answers = ["1", "Test", "MTY", "3", "cancel"]
+        with mock.patch("builtins.input", side_effect=answers), \
+                mock.patch("builtins.print"):
+            with self.assertRaises(CancelOperation):
+                create_hotel(hotels)
+        self.assertEqual(hotels, [])
+
+    def test_range_rate_does_not_become_default(self):
+        hotels = [Hotel(1, "Test", "MTY", 3)]
+        answers = ["1", "2026-12-24", "2026-12-25", "20000", "10000"]
+        with mock.patch("builtins.input", side_effect=answers), \
+                mock.patch("builtins.print"):
+            set_hotel_rates(hotels)
+        self.assertEqual(hotels[0].quote("2026-06-01", "2026-06-01"), 10000)
+        self.assertEqual(hotels[0].quote("2026-12-24", "2026-12-24"), 20000)
+
+
+if __name__ == "__main__":
+    unittest.main()
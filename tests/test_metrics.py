@@ -0,0 +1,75 @@
+import json
+import os
+import tempfile
+import unittest
+
+from source.hotel import Hotel
+from source.metrics import REGISTRY, MetricsRegistry, instrument
+
+
+class TestMetrics(unittest.TestCase):
+
+    def setUp(self):
+        self.was_enabled = REGISTRY.enabled
+        REGISTRY.enabled = True
+        REGISTRY.reset()
+
+    def tearDown(self):
+        REGISTRY.enabled = self.was_enabled
+        REGISTRY.reset()
+
+    def test_records_counts_and_errors(self):
+        hotel = Hotel(1, "Test", "MTY", 5)
+        hotel.available_rooms_for_dates("2026-01-01", "2026-01-03", 1)
+        with self.assertRaises(ValueError):
+            hotel.available_rooms_for_dates("2026-01-05", "2026-01-01", 1)
+
+        stats = REGISTRY.snapshot()["operations"]
+        entry = stats["hotel.available_rooms_for_dates"]
+        self.assertEqual(entry["count"], 2)
+        self.assertEqual(entry["errors"], 1)
+        self.assertEqual(sum(entry["buckets"].values()), 2)
+
+    def test_disabled_registry_records_nothing(self):
+        REGISTRY.enabled = False
+        Hotel(1, "Test", "MTY", 5).apply_calendar_change(
+            "2026-01-01", "2026-01-02", 1, 1
+        )
+        self.assertEqual(REGISTRY.snapshot()["operations"], {})
+
+    def test_prometheus_format(self):
+        registry = MetricsRegistry(enabled=True)
+        registry.record("demo", 0.002, failed=False)
+        text = registry.to_prometheus()
+        self.assertIn('a62_operation_total{operation="demo"} 1', text)
+        self.assertIn(
+            'a62_operation_duration_seconds_bucket{operation="demo",'
+            'le="+Inf"} 1',
+            text,
+        )
+        self.assertIn(
+            'a62_operation_duration_seconds_bucket{operation="demo",'
+            'le="0.001"} 0',
+            text,
+        )
+
+    def test_export_json_and_text(self):
+        @instrument("demo.call")
+        def call():
+            return 42
+
+        self.assertEqual(call(), 42)
+        with tempfile.TemporaryDirectory() as tmpdir:
+            json_path = os.path.join(tmpdir, "metrics.json")
+            prom_path = os.path.join(tmpdir, "metrics.prom")
+            REGISTRY.export(json_path)
+            REGISTRY.export(prom_path)
+            with open(json_path, "r", encoding="utf-8") as file:
+                data = json.load(file)
+            self.assertEqual(data["operations"]["demo.call"]["count"], 1)
+            with open(prom_path, "r", encoding="utf-8") as file:
+                self.assertIn("demo.call", file.read())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,57 @@
+import os
+import tempfile
+import unittest
+
+from source import profiling
+from source.hotel import Hotel
+from source.profiling import ProfilerConfig, enable_profiling, profiled
+
+
+class TestProfiling(unittest.TestCase):
+
+    def setUp(self):
+        self.saved = vars(profiling.CONFIG).copy()
+
+    def tearDown(self):
+        vars(profiling.CONFIG).update(self.saved)
+
+    def test_disabled_profiling_writes_nothing(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            profiling.CONFIG.enabled = False
+            profiling.CONFIG.output_dir = tmpdir
+            hotel = Hotel(1, "Test", "MTY", 5)
+            hotel.apply_calendar_change("2026-01-01", "2026-01-02", 1, 1)
+            self.assertEqual(os.listdir(tmpdir), [])
+
+    def test_slow_operation_writes_profile_and_report(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            enable_profiling(tmpdir, latency_ms=0, memory_kb=10 ** 6)
+            hotel = Hotel(1, "Test", "MTY", 5)
+            hotel.apply_calendar_change("2026-01-01", "2026-03-01", 1, 1)
+
+            files = sorted(os.listdir(tmpdir))
+            self.assertEqual(len(files), 2)
+            self.assertTrue(files[0].endswith(".prof"))
+            report = os.path.join(tmpdir, files[1])
+            with open(report, "r", encoding="utf-8") as file:
+                content = file.read()
+            self.assertIn("hotel.apply_calendar_change", content)
+            self.assertIn("allocations", content)
+
+    def test_fast_operation_below_threshold_is_skipped(self):
+        @profiled("demo")
+        def fast():
+            return 1
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            enable_profiling(tmpdir, latency_ms=10 ** 6, memory_kb=10 ** 6)
+            self.assertEqual(fast(), 1)
+            self.assertEqual(os.listdir(tmpdir), [])
+
+    def test_negative_threshold_raises(self):
+        with self.assertRaises(ValueError):
+            ProfilerConfig(latency_ms=-1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,92 @@
+import unittest
+
+from source.dates import to_ordinal
+from source.hotel import Hotel
+from source.rates import RateCalendar, quote_hotels
+
+
+class TestRateCalendar(unittest.TestCase):
+
+    def setUp(self):
+        self.rates = RateCalendar(10000)
+        self.first = to_ordinal("2026-01-01")
+
+    def test_quote_uses_default_outside_window(self):
+        self.assertEqual(self.rates.quote("2026-01-01", "2026-01-03"), 30000)
+        self.rates.set_rate("2026-01-02", "2026-01-02", 15000)
+        self.assertEqual(self.rates.quote("2025-12-31", "2026-01-03", 2),
+                         2 * (3 * 10000 + 15000))
+        with self.assertRaises(ValueError):
+            self.rates.quote("2026-01-03", "2026-01-01")
+        with self.assertRaises(ValueError):
+            self.rates.quote("2026-01-01", "2026-01-03", 0)
+        with self.assertRaises(ValueError):
+            self.rates.set_rate("2026-01-01", "2026-01-01", -1)
+
+    def test_window_grows_in_both_directions(self):
+        self.rates.set_rate(self.first, self.first + 1, 12000)
+        self.rates.set_rate(self.first - 2, self.first - 2, 8000)
+        self.rates.set_rate(self.first + 4, self.first + 4, 9000)
+        self.assertEqual(self.rates.base, self.first - 2)
+        self.assertEqual(self.rates.days, 7)
+        self.assertEqual(
+            [self.rates.rate(day)
+             for day in range(self.first - 3, self.first + 6)],
+            [10000, 8000, 10000, 12000, 12000, 10000, 10000, 9000, 10000],
+        )
+        self.assertEqual(
+            self.rates.quote(self.first - 3, self.first + 5),
+            sum(self.rates.price(day)
+                for day in range(self.first - 3, self.first + 6)),
+        )
+
+    def test_default_rate_applies_to_unset_days(self):
+        self.rates.set_rate(self.first, self.first + 2, 12000)
+        self.rates.set_rate(self.first + 1, self.first + 1, None)
+        self.rates.set_default_rate(5000)
+        self.assertEqual(self.rates.quote(self.first, self.first + 3),
+                         12000 + 5000 + 12000 + 5000)
+
+    def test_tiers(self):
+        with self.assertRaises(ValueError):
+            RateCalendar(10000, [(1.5, 120)])
+        hotel = Hotel(1, "Hotel", "City", 4)
+        hotel.set_rates(RateCalendar(10000, [(0.5, 120), (1.0, 150)]))
+        hotel.apply_calendar_change("2026-01-01", "2026-01-01", 2, 1)
+        hotel.apply_calendar_change("2026-01-02", "2026-01-02", 4, 1)
+        self.assertEqual(hotel.quote("2026-01-01", "2026-01-03"),
+                         12000 + 15000 + 10000)
+        hotel.apply_calendar_change("2026-01-02", "2026-01-02", 3, -1)
+        self.assertEqual(hotel.quote("2026-01-01", "2026-01-03"),
+                         12000 + 10000 + 10000)
+
+    def test_hotel_round_trip(self):
+        hotel = Hotel(1, "Hotel", "City", 4)
+        with self.assertRaises(ValueError):
+            hotel.quote("2026-01-01", "2026-01-01")
+        hotel.set_rates(RateCalendar(10000, [(0.5, 120)]))
+        hotel.rates.set_rate("2026-01-01", "2026-01-02", 20000)
+        hotel.apply_calendar_change("2026-01-02", "2026-01-03", 2, 1)
+        copy = Hotel.from_dict(hotel.to_dict())
+        self.assertEqual(copy.quote("2026-01-01", "2026-01-04"),
+                         hotel.quote("2026-01-01", "2026-01-04"))
+        self.assertEqual(copy.quote("2026-01-01", "2026-01-04"),
+                         20000 + 24000 + 12000 + 10000)
+
+    def test_quote_hotels(self):
+        hotels = [Hotel(hotel_id, "Hotel", "City", 2)
+                  for hotel_id in (1, 2, 3)]
+        hotels[0].set_rates(RateCalendar(10000))
+        hotels[1].set_rates(RateCalendar(7000))
+        hotels[1].apply_calendar_change("2026-01-01", "2026-01-01", 2, 1)
+        self.assertEqual(quote_hotels(hotels, "2026-01-01", "2026-01-02"),
+                         {1: 20000})
+        self.assertEqual(
+            quote_hotels(hotels, "2026-01-01", "2026-01-02",
+                         available_only=False),
+            {1: 20000, 2: 14000},
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
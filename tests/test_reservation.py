@@ -45,6 +45,30 @@ class TestReservation(unittest.TestCase):
                 rooms_reserved=1,
             )
 
+    def test_create_reservation_end_before_start(self):
+        with self.assertRaises(ValueError):
+            Reservation(1, 10, 20, "2026-01-03", "2026-01-01", 1)
+
+    def test_create_reservation_invalid_date(self):
+        with self.assertRaises(ValueError):
+            Reservation(1, 10, 20, "2026-02-30", "2026-03-01", 1)
+
+    def test_dates_stored_as_ordinals(self):
+        r = Reservation(1, 10, 20, "2026-1-5", "2026-01-06", 1)
+        self.assertEqual(r.start_date, "2026-01-05")
+        self.assertEqual(r.end_ordinal - r.start_ordinal, 1)
+        self.assertEqual(r.to_dict()["start_date"], "2026-01-05")
+        self.assertNotIn("start_ordinal", r.to_dict())
+
+    def test_room_counts(self):
+        r = Reservation(1, 10, 20, "2026-01-01", "2026-01-02", 3,
+                        {"single": 1, "double": 2})
+        copy = Reservation.from_dict(r.to_dict())
+        self.assertEqual(copy.room_counts, {"single": 1, "double": 2})
+        with self.assertRaises(ValueError):
+            Reservation(1, 10, 20, "2026-01-01", "2026-01-02", 2,
+                        {"single": 1, "double": 2})
+
     def test_to_dict_and_from_dict(self):
         r1 = Reservation(
             reservation_id=5,
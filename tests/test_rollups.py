@@ -0,0 +1,82 @@
+import unittest
+
+from source.hotel import Hotel
+from source.rollups import OccupancyRollup
+
+
+class TestRollups(unittest.TestCase):
+
+    def setUp(self):
+        self.hotels = [
+            Hotel(1, "A", "MTY", 10),
+            Hotel(2, "B", "MTY", 10),
+            Hotel(3, "C", "CDMX", 5),
+        ]
+        self.hotels[0].apply_calendar_change("2026-01-30", "2026-02-02", 2, 1)
+        self.rollup = OccupancyRollup(self.hotels)
+        self.daily = OccupancyRollup(self.hotels, granularity="day")
+
+    def tearDown(self):
+        self.rollup.close()
+        self.daily.close()
+
+    def test_bulk_build(self):
+        self.assertEqual(self.rollup.rooms_sold("MTY", "2026-01"), 4)
+        self.assertEqual(self.rollup.rooms_sold("MTY", "2026-02"), 4)
+        self.assertAlmostEqual(
+            self.rollup.occupancy_rate("MTY", "2026-02"), 4 / (20 * 28)
+        )
+        self.assertEqual(self.daily.rooms_sold("MTY", "2026-01-31"), 2)
+
+    def test_incremental_updates_match_rebuild(self):
+        self.hotels[1].apply_calendar_change("2026-01-31", "2026-03-01", 3, 1)
+        self.hotels[0].apply_calendar_change("2026-02-01", "2026-02-02", 1, -1)
+        self.hotels[2].apply_calendar_change("2026-12-31", "2027-01-01", 5, 1)
+        incremental = self.rollup.table()
+        daily = self.daily.table()
+
+        self.rollup.rebuild()
+        self.daily.rebuild()
+        self.assertEqual(incremental, self.rollup.table())
+        self.assertEqual(daily, self.daily.table())
+        self.assertEqual(self.rollup.rooms_sold("MTY", "2026-02"), 86)
+        self.assertEqual(self.rollup.rooms_sold("CDMX", "2027-01"), 5)
+
+    def test_relocation_and_new_hotels_are_tracked(self):
+        self.hotels[0].modify_information(location="CDMX")
+        self.hotels[0].apply_calendar_change("2026-02-10", "2026-02-10", 1, 1)
+        self.assertEqual(self.rollup.rooms_sold("MTY", "2026-02"), 0)
+        self.assertEqual(self.rollup.rooms_sold("CDMX", "2026-02"), 5)
+        self.assertAlmostEqual(
+            self.rollup.occupancy_rate("CDMX", "2026-02"), 5 / (15 * 28)
+        )
+
+        hotel = Hotel(4, "D", "GDL", 4)
+        hotel.apply_calendar_change("2026-01-01", "2026-01-02", 1, 1)
+        self.rollup.add(hotel)
+        hotel.apply_calendar_change("2026-01-03", "2026-01-03", 1, 1)
+        self.assertEqual(self.rollup.rooms_sold("GDL", "2026-01"), 3)
+        with self.assertRaises(ValueError):
+            self.rollup.add(hotel)
+
+        incremental = self.rollup.table()
+        self.rollup.rebuild()
+        self.assertEqual(incremental, self.rollup.table())
+
+        self.rollup.remove(4)
+        self.assertEqual(self.rollup.table("GDL"), [])
+        self.assertEqual(self.rollup.occupancy_rate("GDL", "2026-01"), 0.0)
+        with self.assertRaises(ValueError):
+            self.rollup.remove(4)
+
+    def test_table_filter_and_invalid_granularity(self):
+        rows = self.rollup.table("MTY")
+        self.assertEqual([row["bucket"] for row in rows],
+                         ["2026-01", "2026-02"])
+        self.assertEqual(self.rollup.occupancy_rate("GDL", "2026-01"), 0.0)
+        with self.assertRaises(ValueError):
+            OccupancyRollup(self.hotels, granularity="year")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,62 @@
+import unittest
+
+from source.availability_cache import AvailabilityCache
+from source.hotel import Hotel
+from source.search import HotelSearchIndex, tokenize
+
+
+class TestHotelSearchIndex(unittest.TestCase):
+
+    def setUp(self):
+        self.hotels = [
+            Hotel(1, "Grand Plaza", "Monterrey", 2),
+            Hotel(2, "Plaza Inn", "Mexico City", 5),
+            Hotel(3, "Sea View", "Monterrey Norte", 1),
+        ]
+        self.index = HotelSearchIndex(self.hotels)
+
+    def tearDown(self):
+        self.index.close()
+
+    def ids(self, hotels):
+        return [hotel.hotel_id for hotel in hotels]
+
+    def test_tokenize(self):
+        self.assertEqual(tokenize("Sea-View, MTY"), ["sea", "view", "mty"])
+
+    def test_prefix_tokens_are_anded(self):
+        self.assertEqual(self.ids(self.index.search("pla")), [1, 2])
+        self.assertEqual(self.ids(self.index.search("plaza mon")), [1])
+        self.assertEqual(self.ids(self.index.search("MONT")), [1, 3])
+        self.assertEqual(self.index.search("plaza norte"), [])
+        self.assertEqual(self.ids(self.index.search("")), [1, 2, 3])
+
+    def test_follows_modify_and_delete(self):
+        self.hotels[2].modify_information(name="Plaza Sur")
+        self.assertEqual(self.ids(self.index.search("plaza")), [1, 2, 3])
+        self.assertEqual(self.index.search("sea"), [])
+
+        self.index.remove(2)
+        self.assertEqual(self.ids(self.index.search("plaza")), [1, 3])
+        self.assertEqual(self.index.search("mexico"), [])
+
+        self.index.add(Hotel(4, "Casa", "Mexico", 1))
+        self.assertEqual(self.ids(self.index.search("mex")), [4])
+
+    def test_search_available(self):
+        self.hotels[0].apply_calendar_change("2026-01-01", "2026-01-02", 2, 1)
+        self.assertEqual(
+            self.ids(self.index.search_available(
+                "mon", "2026-01-02", "2026-01-03")),
+            [3],
+        )
+        with AvailabilityCache() as cache:
+            self.assertEqual(
+                self.ids(self.index.search_available(
+                    "mon", "2026-01-03", "2026-01-04", 1, cache)),
+                [1, 3],
+            )
+
+
+if __name__ == "__main__":
+    unittest.main()
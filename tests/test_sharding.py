@@ -0,0 +1,119 @@
+import unittest
+
+from source.customer import Customer
+from source.hotel import Hotel
+from source.sharding import ShardedRuntime, benchmark, shard_of
+from source.workload import WorkloadProfile, generate_trace, replay_trace
+
+
+class TestShardedRuntime(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.runtime = ShardedRuntime(
+            [Hotel(hotel_id, "H", "MTY", 2) for hotel_id in range(1, 5)],
+            [Customer(1, "Ana", "ana@test.com")],
+            shards=2, batch_size=2,
+        )
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.runtime.close()
+
+    def test_shard_of(self):
+        self.assertEqual({shard_of(hotel_id, 2) for hotel_id in range(4)},
+                         {0, 1})
+
+    def test_requests_are_routed_and_ordered(self):
+        def create(reservation_id, hotel_id):
+            return {"op": "create", "reservation_id": reservation_id,
+                    "hotel_id": hotel_id, "customer_id": 1,
+                    "start_date": "2026-01-01", "end_date": "2026-01-02",
+                    "rooms": 2}
+
+        results = self.runtime.execute([
+            create(1, 1),
+            create(2, 2),
+            create(3, 1),
+            {"op": "search_all", "start_date": "2026-01-02",
+             "end_date": "2026-01-02", "rooms": 1},
+            {"op": "cancel", "reservation_id": 1},
+            {"op": "cancel", "reservation_id": 99},
+            {"op": "search", "hotel_id": 1, "start_date": "2026-01-01",
+             "end_date": "2026-01-01", "rooms": 2},
+            create(4, 9),
+        ])
+        self.assertEqual(results[0], (True, 1))
+        self.assertEqual(results[1], (True, 2))
+        self.assertFalse(results[2][0])
+        self.assertEqual(results[3], (True, [3, 4]))
+        self.assertEqual(results[4], (True, 1))
+        self.assertEqual(results[5], (False, "Reservation not found."))
+        self.assertEqual(results[6], (True, True))
+        self.assertEqual(results[7], (False, "Hotel not found."))
+
+        hotels, reservations = self.runtime.collect()
+        self.assertEqual([hotel.hotel_id for hotel in hotels], [1, 2, 3, 4])
+        self.assertEqual([r.reservation_id for r in reservations], [2])
+        self.runtime.execute([{"op": "cancel", "reservation_id": 2}])
+
+    def test_reservation_ids_follow_outcomes(self):
+        def create(reservation_id, hotel_id, rooms=1):
+            return {"op": "create", "reservation_id": reservation_id,
+                    "hotel_id": hotel_id, "customer_id": 1,
+                    "start_date": "2026-02-01", "end_date": "2026-02-02",
+                    "rooms": rooms}
+
+        results = self.runtime.execute([
+            create(10, 1, rooms=3),
+            create(10, 2),
+            create(11, 1),
+            {"op": "cancel", "reservation_id": 11},
+            create(11, 2),
+            create(11, 1),
+        ])
+        self.assertFalse(results[0][0])
+        self.assertEqual(results[1:5], [(True, 10), (True, 11), (True, 11),
+                                        (True, 11)])
+        self.assertEqual(results[5], (False, "Reservation ID already exists."))
+        self.runtime.execute([{"op": "cancel", "reservation_id": 10},
+                              {"op": "cancel", "reservation_id": 11}])
+
+    def test_malformed_requests_are_rejected(self):
+        results = self.runtime.execute([
+            {"op": "create", "reservation_id": 20, "hotel_id": 1},
+            {"op": "search", "hotel_id": 1, "start_date": "2026-01-01",
+             "end_date": "2026-01-01", "rooms": "1"},
+            {"op": "search", "hotel_id": [1], "start_date": "2026-01-01",
+             "end_date": "2026-01-01", "rooms": 1},
+            {"op": "search", "hotel_id": 1, "start_date": "2026-01-01",
+             "end_date": "2026-01-01", "rooms": 1},
+        ])
+        self.assertEqual(results[0],
+                         (False, "Missing request field: customer_id."))
+        self.assertFalse(results[1][0])
+        self.assertFalse(results[2][0])
+        self.assertEqual(results[3], (True, True))
+
+    def test_close_tolerates_dead_workers(self):
+        runtime = ShardedRuntime([Hotel(1, "H", "MTY", 2)], [], shards=1)
+        runtime._processes[0].kill()
+        runtime._processes[0].join()
+        runtime.close()
+
+    def test_benchmark_matches_single_process_replay(self):
+        trace = generate_trace(
+            seed=5, operations=400,
+            profile=WorkloadProfile(hotels=6, rooms_per_hotel=4),
+        )
+        expected = replay_trace(trace)["latency"]
+        report = benchmark(trace, [1, 3], batch_size=50)
+        for run in report["runs"]:
+            self.assertTrue(run["consistency"]["consistent"])
+            self.assertEqual(
+                run["ok"], sum(item["ok"] for item in expected.values())
+            )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,81 @@
+import os
+import subprocess
+import sys
+import unittest
+
+from source.hotel import Hotel
+from source.shared_occupancy import (
+    OccupancyReader,
+    OccupancyWriter,
+    SearchPool,
+)
+
+
+class TestSharedOccupancy(unittest.TestCase):
+
+    def setUp(self):
+        self.hotels = [Hotel(1, "A", "MTY", 2), Hotel(7, "B", "MTY", 1)]
+        self.hotels[0].apply_calendar_change("2026-01-02", "2026-01-03", 2, 1)
+        self.writer = OccupancyWriter(self.hotels, "2026-01-01", 10)
+        self.reader = OccupancyReader(self.writer.name)
+
+    def tearDown(self):
+        self.reader.close()
+        self.writer.close()
+
+    def test_initial_matrix(self):
+        self.assertEqual(self.reader.hotel_ids(), [1, 7])
+        self.assertEqual(self.reader.search("2026-01-01", "2026-01-05"), [7])
+        self.assertTrue(self.reader.available(1, "2026-01-04", "2026-01-10"))
+        with self.assertRaises(ValueError):
+            self.reader.search("2026-01-05", "2026-01-11")
+
+    def test_calendar_changes_reach_readers(self):
+        before = self.reader.sequence()
+        self.hotels[1].apply_calendar_change("2026-01-05", "2026-01-20", 1, 1)
+        self.hotels[0].apply_calendar_change("2026-01-02", "2026-01-02", 1, -1)
+        self.assertEqual(self.reader.sequence(), before + 4)
+        self.assertEqual(self.reader.search("2026-01-01", "2026-01-02"),
+                         [1, 7])
+        self.assertFalse(self.reader.available(7, "2026-01-10", "2026-01-10"))
+
+        self.hotels[1].replace_calendar({})
+        self.assertTrue(self.reader.available(7, "2026-01-10", "2026-01-10"))
+
+    def test_multi_segment_change_is_one_write(self):
+        before = self.reader.sequence()
+        self.hotels[0].change_calendar_range(
+            ("2026-01-02", "2026-01-03"), 2, ("2026-01-05", "2026-01-06"), 1
+        )
+        self.assertEqual(self.reader.sequence(), before + 2)
+        self.assertEqual(self.reader.search("2026-01-02", "2026-01-03"),
+                         [1, 7])
+        self.assertFalse(self.reader.available(1, "2026-01-05", "2026-01-06",
+                                               2))
+
+    def test_reader_in_another_process_leaves_block(self):
+        root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        script = (
+            "import sys\n"
+            "from source.shared_occupancy import OccupancyReader\n"
+            "with OccupancyReader(sys.argv[1]) as reader:\n"
+            "    print(reader.search('2026-01-01', '2026-01-05'))\n"
+        )
+        result = subprocess.run(
+            [sys.executable, "-c", script, self.writer.name],
+            cwd=root, capture_output=True, text=True, check=True,
+        )
+        self.assertEqual(result.stdout.strip(), "[7]")
+        with OccupancyReader(self.writer.name) as reader:
+            self.assertEqual(reader.hotel_ids(), [1, 7])
+
+    def test_search_pool(self):
+        with SearchPool(self.writer.name, processes=2) as pool:
+            self.assertEqual(pool.search("2026-01-04", "2026-01-05"), [1, 7])
+            self.hotels[1].apply_calendar_change(
+                "2026-01-05", "2026-01-05", 1, 1)
+            self.assertEqual(pool.search("2026-01-04", "2026-01-05"), [1])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,55 @@
+import unittest
+
+from source.customer import Customer
+from source.hotel import Hotel
+from source.menu import book_reservation, change_reservation
+from source.reservation import Reservation
+from source.snapshot import take_snapshot
+
+
+class TestSnapshot(unittest.TestCase):
+
+    def setUp(self):
+        self.hotels = [Hotel(1, "Test", "MTY", 5)]
+        self.customers = [Customer(1, "Ana", "ana@test.com")]
+        self.reservations = []
+        book_reservation(
+            self.hotels, self.customers, self.reservations,
+            Reservation(1, 1, 1, "2026-01-01", "2026-01-02", 2),
+        )
+
+    def test_snapshot_is_stable_while_booking(self):
+        snapshot = take_snapshot(self.hotels, self.reservations)
+        book_reservation(
+            self.hotels, self.customers, self.reservations,
+            Reservation(2, 1, 1, "2026-01-02", "2026-01-03", 1),
+        )
+        change_reservation(
+            self.hotels, self.reservations, 1, {"rooms_reserved": 4}
+        )
+
+        self.assertEqual(snapshot.booked_rooms(1, "2026-002"), 2)
+        self.assertEqual(snapshot.booked_rooms(1, "2026-003"), 0)
+        self.assertEqual(len(snapshot.reservations_for(1)), 1)
+        self.assertEqual(snapshot.reservations[0].rooms_reserved, 2)
+        self.assertEqual(self.hotels[0].calendar()["2026-002"], 5)
+
+    def test_snapshot_shares_calendar_until_write(self):
+        hotel = self.hotels[0]
+        first = take_snapshot(self.hotels, self.reservations)
+        version = first.versions()[1]
+        hotel.apply_calendar_change("2026-01-01", "2026-01-01", 1, 1)
+        self.assertGreater(hotel.calendar_version, version)
+        self.assertEqual(first.booked_rooms(1, "2026-001"), 2)
+
+    def test_snapshot_to_dict_and_unknown_hotel(self):
+        snapshot = take_snapshot(self.hotels, self.reservations)
+        data = snapshot.to_dict()
+        self.assertEqual(data["hotels"][0]["calendar"]["2026-001"], 2)
+        self.assertEqual(data["reservations"][0]["reservation_id"], 1)
+        with self.assertRaises(ValueError):
+            snapshot.booked_rooms(99, "2026-001")
+
+
+if __name__ == "__main__":
+    unittest.main()
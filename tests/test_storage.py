@@ -0,0 +1,119 @@
+import json
+import os
+import tempfile
+import unittest
+
+from source.customer import (
+    Customer,
+    load_customers_from_file,
+    save_customers_to_file,
+)
+from source.hotel import Hotel, load_hotels_from_file, save_hotels_to_file
+from source.reservation import (
+    Reservation,
+    load_reservations_from_file,
+    save_reservations_to_file,
+)
+from source.storage import CorruptSnapshotError, read_records, write_records
+
+
+class TestStorage(unittest.TestCase):
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmpdir.name, "data.json")
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_write_and_read_snapshot(self):
+        write_records(self.path, "hotels", [{"a": 1}, {"b": "x\ny"}])
+        records, verified = read_records(self.path, "hotels")
+        self.assertEqual(records, [{"a": 1}, {"b": "x\ny"}])
+        self.assertTrue(verified)
+
+    def test_legacy_array_is_not_verified(self):
+        with open(self.path, "w", encoding="utf-8") as file:
+            json.dump([{"a": 1}], file, indent=2)
+        self.assertEqual(read_records(self.path, "hotels"),
+                         ([{"a": 1}], False))
+
+    def test_corrupted_snapshot_raises(self):
+        write_records(self.path, "hotels", [{"a": 1}])
+        with open(self.path, "rb") as file:
+            data = file.read()
+        with open(self.path, "wb") as file:
+            file.write(data.replace(b'"a":1', b'"a":2'))
+        with self.assertRaises(ValueError):
+            read_records(self.path, "hotels")
+
+    def test_wrong_kind_raises(self):
+        write_records(self.path, "hotels", [])
+        with self.assertRaises(ValueError):
+            read_records(self.path, "customers")
+
+    def test_compressed_round_trip(self):
+        records = [{"id": i, "name": "x" * 50} for i in range(2500)]
+        sizes = {}
+        for compression in (None, "gzip", "lzma"):
+            checksum = write_records(self.path, "hotels", records, compression)
+            sizes[compression] = os.path.getsize(self.path)
+            self.assertEqual(
+                read_records(self.path, "hotels"), (records, True)
+            )
+            self.assertEqual(len(checksum), 64)
+        self.assertLess(sizes["gzip"], sizes[None])
+        self.assertLess(sizes["lzma"], sizes[None])
+        with self.assertRaises(ValueError):
+            write_records(self.path, "hotels", records, "zip")
+
+    def test_failed_write_keeps_previous_file(self):
+        write_records(self.path, "hotels", [{"a": 1}])
+
+        def broken():
+            yield {"a": 2}
+            raise RuntimeError("crash while writing")
+
+        with self.assertRaises(RuntimeError):
+            write_records(self.path, "hotels", broken())
+        self.assertEqual(read_records(self.path, "hotels")[0], [{"a": 1}])
+        self.assertEqual(os.listdir(self.tmpdir.name), ["data.json"])
+
+    def test_truncated_files_fail_loudly(self):
+        for compression in (None, "gzip"):
+            write_records(self.path, "hotels", [{"a": 1}] * 100, compression)
+            with open(self.path, "rb") as file:
+                data = file.read()
+            with open(self.path, "wb") as file:
+                file.write(data[:len(data) // 2])
+            with self.assertRaises(CorruptSnapshotError):
+                read_records(self.path, "hotels")
+
+    def test_trusted_loads_round_trip(self):
+        hotel = Hotel(1, "Test", "MTY", 5)
+        hotel.apply_calendar_change("2026-01-01", "2026-01-02", 2, 1)
+        save_hotels_to_file([hotel], self.path)
+        loaded = load_hotels_from_file(self.path, trusted=True)[0]
+        self.assertEqual(loaded.to_dict(), hotel.to_dict())
+        self.assertTrue(loaded.available_rooms_for_dates(
+            "2026-01-01", "2026-01-02", 3))
+
+        save_customers_to_file([Customer(1, "Ana", "a@a.com")], self.path)
+        customer = load_customers_from_file(self.path, trusted=True)[0]
+        self.assertEqual(customer.email, "a@a.com")
+
+        reservation = Reservation(1, 1, 1, "2026-01-01", "2026-01-02", 2)
+        save_reservations_to_file([reservation], self.path)
+        loaded = load_reservations_from_file(self.path, trusted=True)[0]
+        self.assertEqual(loaded.to_dict(), reservation.to_dict())
+
+    def test_trusted_load_rejects_legacy_files(self):
+        with open(self.path, "w", encoding="utf-8") as file:
+            json.dump([Customer(1, "Ana", "a@a.com").to_dict()], file)
+        self.assertEqual(len(load_customers_from_file(self.path)), 1)
+        with self.assertRaises(ValueError):
+            load_customers_from_file(self.path, trusted=True)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,148 @@
+import json
+import os
+import tempfile
+import unittest
+
+from source.customer import Customer
+from source.hotel import Hotel
+from source.menu import (
+    book_or_waitlist,
+    promote_waitlist,
+    release_reservation,
+)
+from source.reservation import Reservation
+from source.storage import CorruptSnapshotError
+from source.waitlist import (
+    Waitlist,
+    load_waitlist_from_file,
+    save_waitlist_to_file,
+)
+
+
+class TestWaitlist(unittest.TestCase):
+
+    def setUp(self):
+        self.hotels = [Hotel(1, "Test", "MTY", 2)]
+        self.customers = [Customer(1, "Ana", "ana@test.com")]
+        self.reservations = []
+        self.waitlist = Waitlist()
+
+    def book(self, reservation_id, start, end, rooms):
+        return book_or_waitlist(
+            self.hotels, self.customers, self.reservations, self.waitlist,
+            Reservation(reservation_id, 1, 1, start, end, rooms),
+        )
+
+    def test_full_hotel_queues_request(self):
+        self.assertTrue(self.book(1, "2026-01-01", "2026-01-05", 2))
+        self.assertFalse(self.book(2, "2026-01-03", "2026-01-04", 1))
+        self.assertEqual(len(self.waitlist), 1)
+        with self.assertRaises(ValueError):
+            self.book(2, "2026-01-03", "2026-01-04", 1)
+
+    def test_candidates_only_overlapping_in_order(self):
+        self.book(1, "2026-01-01", "2026-03-01", 2)
+        self.book(2, "2026-02-20", "2026-02-21", 1)
+        self.book(3, "2026-01-02", "2026-01-02", 1)
+        self.book(4, "2026-01-01", "2026-01-03", 1)
+        first = Hotel._parse_date("2026-01-01").toordinal()
+        last = Hotel._parse_date("2026-01-10").toordinal()
+        ids = [r.reservation_id
+               for r in self.waitlist.candidates(1, first, last)]
+        self.assertEqual(ids, [3, 4])
+        self.assertEqual(self.waitlist.candidates(99, first, last), [])
+
+    def test_cancellation_promotes_fair_and_deterministic(self):
+        self.book(1, "2026-01-01", "2026-01-05", 1)
+        self.book(2, "2026-01-01", "2026-01-05", 1)
+        self.book(3, "2026-01-01", "2026-01-02", 2)
+        self.book(4, "2026-01-04", "2026-01-04", 1)
+        self.book(5, "2026-01-04", "2026-01-05", 1)
+
+        freed = release_reservation(self.hotels, self.reservations, 1)
+        promoted = promote_waitlist(
+            self.hotels, self.customers, self.reservations,
+            self.waitlist, freed,
+        )
+        # Request 3 needs two rooms and keeps its place; 4 fits first.
+        self.assertEqual([r.reservation_id for r in promoted], [4])
+        self.assertEqual(
+            [entry.reservation.reservation_id
+             for entry in self.waitlist.entries()],
+            [3, 5],
+        )
+
+    def test_unbookable_requests_are_dropped_on_promotion(self):
+        self.book(1, "2026-01-01", "2026-01-05", 2)
+        self.book(2, "2026-01-02", "2026-01-03", 1)
+        self.book(3, "2026-01-02", "2026-01-03", 1)
+        self.book(4, "2026-01-02", "2026-01-03", 2)
+        # Request 2's ID gets booked elsewhere, request 3's customer leaves.
+        self.reservations.append(
+            Reservation(2, 9, 1, "2026-02-01", "2026-02-02", 1))
+        self.waitlist.entries()[1].reservation.customer_id = 5
+
+        freed = release_reservation(self.hotels, self.reservations, 1)
+        dropped = []
+        promoted = promote_waitlist(
+            self.hotels, self.customers, self.reservations,
+            self.waitlist, freed, dropped,
+        )
+        self.assertEqual([r.reservation_id for r in promoted], [4])
+        self.assertEqual(
+            [(r.reservation_id, reason) for r, reason in dropped],
+            [(2, "Reservation ID already exists."),
+             (3, "Customer not found.")],
+        )
+        self.assertEqual(len(self.waitlist), 0)
+
+    def test_purge_by_hotel_or_customer(self):
+        self.waitlist.add(Reservation(1, 1, 1, "2026-01-01", "2026-01-02", 1))
+        self.waitlist.add(Reservation(2, 2, 1, "2026-01-01", "2026-01-02", 1))
+        self.waitlist.add(Reservation(3, 2, 2, "2026-01-01", "2026-01-02", 1))
+        self.assertEqual(
+            [r.reservation_id for r in self.waitlist.purge(hotel_id=2)],
+            [2, 3],
+        )
+        self.assertEqual(self.waitlist.purge(customer_id=2), [])
+        self.assertEqual(
+            [r.reservation_id for r in self.waitlist.purge(customer_id=1)],
+            [1],
+        )
+        self.assertEqual(len(self.waitlist), 0)
+
+    def test_save_and_load_keeps_order(self):
+        self.waitlist.add(Reservation(7, 1, 1, "2026-01-01", "2026-01-02", 1))
+        self.waitlist.add(Reservation(3, 1, 1, "2026-01-01", "2026-01-02", 1))
+        self.waitlist.remove(7)
+        self.waitlist.add(Reservation(9, 1, 1, "2026-01-01", "2026-01-02", 1))
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, "waitlist.json")
+            save_waitlist_to_file(self.waitlist, path)
+            loaded = load_waitlist_from_file(path)
+        self.assertEqual(
+            [entry.reservation.reservation_id for entry in loaded.entries()],
+            [3, 9],
+        )
+        self.assertEqual(len(load_waitlist_from_file("no_file_123.json")), 0)
+        with self.assertRaises(ValueError):
+            loaded.remove(7)
+
+    def test_corrupt_file_raises_and_legacy_file_loads(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, "waitlist.json")
+            with open(path, "w", encoding="utf-8") as file:
+                file.write('[{"sequence": 1,')
+            with self.assertRaises(CorruptSnapshotError):
+                load_waitlist_from_file(path)
+
+            self.waitlist.add(
+                Reservation(4, 1, 1, "2026-01-01", "2026-01-02", 1))
+            with open(path, "w", encoding="utf-8") as file:
+                json.dump([entry.to_dict()
+                           for entry in self.waitlist.entries()], file)
+            self.assertEqual(len(load_waitlist_from_file(path)), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
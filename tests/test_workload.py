@@ -0,0 +1,58 @@
+import os
+import tempfile
+import unittest
+
+from source.workload import (
+    WorkloadProfile,
+    generate_trace,
+    load_trace,
+    percentile,
+    replay_trace,
+    save_trace,
+)
+
+
+class TestWorkload(unittest.TestCase):
+
+    def test_generate_trace_is_reproducible(self):
+        trace1 = generate_trace(seed=7, operations=300)
+        trace2 = generate_trace(seed=7, operations=300)
+        self.assertEqual(trace1, trace2)
+        self.assertEqual(len(trace1["operations"]), 300)
+
+    def test_generate_trace_mixes_operations(self):
+        trace = generate_trace(seed=1, operations=500)
+        kinds = {op["op"] for op in trace["operations"]}
+        self.assertEqual(kinds, {"create", "cancel", "search"})
+
+    def test_unknown_profile_setting_raises(self):
+        with self.assertRaises(ValueError):
+            WorkloadProfile(bad_setting=1)
+
+    def test_save_and_load_trace(self):
+        trace = generate_trace(seed=3, operations=50)
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, "trace.jsonl")
+            save_trace(trace, path)
+            self.assertEqual(load_trace(path), trace)
+            with open(path, "a", encoding="utf-8") as file:
+                file.write("\n  \n")
+            self.assertEqual(load_trace(path), trace)
+
+    def test_replay_reports_consistent_calendars(self):
+        profile = WorkloadProfile(hotels=3, rooms_per_hotel=5)
+        trace = generate_trace(seed=2, operations=400, profile=profile)
+        report = replay_trace(trace)
+        self.assertEqual(report["operations"], 400)
+        self.assertTrue(report["consistency"]["consistent"])
+        self.assertGreater(report["latency"]["create"]["rejected"], 0)
+
+    def test_percentile(self):
+        samples = [1.0, 2.0, 3.0, 4.0]
+        self.assertEqual(percentile(samples, 50), 2.0)
+        self.assertEqual(percentile(samples, 100), 4.0)
+        self.assertEqual(percentile([], 99), 0.0)
+
+
+if __name__ == "__main__":
+    unittest.main()